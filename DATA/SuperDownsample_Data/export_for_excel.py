@@ -2,38 +2,41 @@
 Converte os CSVs limpos (time,x,y,z) em arquivos compatíveis com Excel
 usando ponto-e-vírgula como separador e vírgula como separador decimal.
 
+A formatação é feita pelo próprio to_csv (decimal=',', float_format) em blocos,
+e as pessoas são convertidas em paralelo.
+
 Saída: DATA/SuperDownsample_Data/excel_csv/acelerometro_<id>_excel.csv
 """
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import pandas as pd
 
 BASE_DIR = Path(__file__).resolve().parent
 CLEAN_DIR = BASE_DIR / "clean"
 OUT_DIR = BASE_DIR / "excel_csv"
-OUT_DIR.mkdir(parents=True, exist_ok=True)
-
 
-def convert_file(in_path: Path, out_path: Path):
-    df = pd.read_csv(in_path)
-    # Garantir colunas na ordem time,x,y,z
-    expected = ['time', 'x', 'y', 'z']
-    cols = df.columns.tolist()
-    # Reordenar / selecionar
-    df = df[[c for c in expected if c in cols]]
+EXPECTED = ['time', 'x', 'y', 'z']
+CHUNK_LINHAS = 100_000               # Linhas lidas/escritas por bloco
+N_WORKERS = min(8, os.cpu_count() or 1)
 
-    # Converter numéricos para string com vírgula decimal
-    for c in ['x', 'y', 'z']:
-        if c in df.columns:
-            # Formatar com 6 casas decimais e trocar '.' por ','
-            df[c] = df[c].map(lambda v: ('{:.6f}'.format(v)).replace('.',','))
 
-    # Garantir que time seja string sem mudança
-    if 'time' in df.columns:
-        df['time'] = df['time'].astype(str)
+def convert_file(in_path: Path, out_path: Path, chunksize=CHUNK_LINHAS):
+    # Garantir colunas na ordem time,x,y,z (time lido como texto, sem mudança)
+    cols = pd.read_csv(in_path, nrows=0).columns
+    usecols = [c for c in EXPECTED if c in cols]
+    leitor = pd.read_csv(in_path, usecols=usecols, dtype={'time': str}, chunksize=chunksize)
 
-    # Salvar com ; como separador
-    df.to_csv(out_path, sep=';', index=False)
-    print(f'[OK] Gerado: {out_path}')
+    primeiro = True
+    for df in leitor:
+        # Salvar com ; como separador, 6 casas decimais e vírgula decimal
+        df[usecols].to_csv(out_path, sep=';', decimal=',', float_format='%.6f',
+                           index=False, header=primeiro, mode='w' if primeiro else 'a')
+        primeiro = False
+    if primeiro:
+        # Arquivo sem linhas: manter só o cabeçalho
+        pd.DataFrame(columns=usecols).to_csv(out_path, sep=';', index=False)
+    return out_path
 
 
 def main():
@@ -41,10 +44,19 @@ def main():
     if not files:
         print('Nenhum arquivo clean/ encontrado.')
         return
-    for f in files:
-        pid = f.stem.split('_')[-1]
-        out = OUT_DIR / f"acelerometro_{pid}_excel.csv"
-        convert_file(f, out)
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=min(N_WORKERS, len(files))) as executor:
+        futuros = {}
+        for f in files:
+            pid = f.stem.split('_')[-1]
+            out = OUT_DIR / f"acelerometro_{pid}_excel.csv"
+            futuros[executor.submit(convert_file, f, out)] = f
+        for futuro, f in futuros.items():
+            try:
+                print(f'[OK] Gerado: {futuro.result()}')
+            except Exception as e:
+                print(f'[ERRO] {f.name}: {e}')
     print('\nConcluído. Arquivos em:')
     print(OUT_DIR)
 
@@ -0,0 +1,154 @@
+"""
+Agregação da atividade (códigos de movimento por janela) em toda a coorte.
+
+A partir das janelas gravadas no armazém (comum/armazem_resultados.py) calcula:
+    - fração de cada código por pessoa
+    - fração de cada código por hora do dia (todas as pessoas e por pessoa)
+    - fração de cada código por noite de cada pessoa (noite = de NOITE_INICIO_H a NOITE_INICIO_H do dia seguinte)
+    - contagem de transições código -> código entre janelas consecutivas de cada pessoa
+
+Tudo sai de bincounts sobre índices inteiros combinados (pessoa, hora, noite, código),
+sem groupby nem ordenação: como as janelas vêm agrupadas por pessoa e em ordem de
+tempo, pessoas e noites viram índices densos pelas mudanças entre linhas vizinhas.
+Milhões de janelas agregam em bem menos de um segundo.
+
+Uso:
+    python scripts/clustering_euclidiano/agregacao_atividade.py                # execução mais recente
+    python scripts/clustering_euclidiano/agregacao_atividade.py --execucao 20260101_120000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from comum.armazem_resultados import DIR_EXECUCOES, ler_metadados, ler_resultados
+from comum.rotulos import chaves_movimento
+
+NOITE_INICIO_H = 12     # A "noite" de um dia vai das 12h desse dia às 12h do dia seguinte
+NS_HORA = 3600 * 10**9
+NS_DIA = 24 * NS_HORA
+
+
+def _fracoes(contagens):
+    """Normaliza cada linha de uma matriz de contagens (linhas vazias ficam NaN)."""
+    total = contagens.sum(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return contagens / total
+
+
+def _tabela(contagens, n_codigos, indice):
+    chaves = chaves_movimento(n_codigos)
+    tabela = pd.DataFrame(_fracoes(contagens), columns=[f'frac_{c}' for c in chaves], index=indice)
+    tabela.insert(0, 'n_janelas', contagens.sum(axis=1))
+    return tabela
+
+
+def _indice_por_trechos(chave):
+    """Índice denso de trechos contíguos com a mesma chave e a posição inicial de cada trecho."""
+    novo = np.ones(len(chave), dtype=bool)
+    novo[1:] = chave[1:] != chave[:-1]
+    return np.cumsum(novo) - 1, np.flatnonzero(novo)
+
+
+def agregar_atividade(pessoa_id, meio, movimento, n_codigos=3):
+    """
+    Agregados de atividade a partir de arrays por janela, agrupados por pessoa e em
+    ordem de tempo dentro de cada pessoa (como `ler_resultados` devolve).
+
+    Args:
+        pessoa_id: ID da pessoa de cada janela
+        meio: Timestamp central (datetime64[ns]) de cada janela
+        movimento: Código de movimento (0..n_codigos-1) de cada janela
+        n_codigos: Número de códigos de movimento
+
+    Returns:
+        dict de DataFrames: 'pessoa', 'hora', 'pessoa_hora', 'noite', 'transicoes'
+    """
+    pessoa_id = np.asarray(pessoa_id)
+    p, inicio_pessoa = _indice_por_trechos(pessoa_id)
+    pessoas = pessoa_id[inicio_pessoa]
+    m = np.asarray(movimento, dtype=np.int64)
+    ns = np.asarray(meio, dtype='datetime64[ns]').view(np.int64)
+    n_p, k = len(pessoas), n_codigos
+
+    hora = (ns // NS_HORA) % 24
+    noite = (ns - NOITE_INICIO_H * NS_HORA) // NS_DIA
+
+    por_pessoa = np.bincount(p * k + m, minlength=n_p * k).reshape(n_p, k)
+    por_pessoa_hora = np.bincount((p * 24 + hora) * k + m, minlength=n_p * 24 * k).reshape(n_p * 24, k)
+    por_hora = por_pessoa_hora.reshape(n_p, 24, k).sum(axis=0)
+
+    # Noites: índice denso só das combinações (pessoa, noite) que existem
+    novo_trecho = np.ones(len(ns), dtype=bool)
+    novo_trecho[1:] = (noite[1:] != noite[:-1]) | (p[1:] != p[:-1])
+    n = np.cumsum(novo_trecho) - 1
+    primeira = np.flatnonzero(novo_trecho)
+    por_noite = np.bincount(n * k + m, minlength=len(primeira) * k).reshape(len(primeira), k)
+
+    # Transições entre janelas consecutivas da mesma pessoa
+    mesma = p[1:] == p[:-1]
+    indice_transicao = (p[1:][mesma] * k + m[:-1][mesma]) * k + m[1:][mesma]
+    transicoes = np.bincount(indice_transicao, minlength=n_p * k * k).reshape(n_p, k, k)
+
+    chaves = chaves_movimento(k)
+    tabela_transicoes = pd.DataFrame(
+        transicoes.reshape(n_p, k * k),
+        columns=[f'{a}->{b}' for a in chaves for b in chaves],
+        index=pd.Index(pessoas, name='pessoa_id'),
+    )
+
+    tabela_noite = _tabela(por_noite, k, pd.MultiIndex.from_arrays([
+        pessoas[p[primeira]],
+        (noite[primeira] * NS_DIA).astype('datetime64[ns]').astype('datetime64[D]'),
+    ], names=['pessoa_id', 'noite']))
+
+    return {
+        'pessoa': _tabela(por_pessoa, k, pd.Index(pessoas, name='pessoa_id')),
+        'hora': _tabela(por_hora, k, pd.Index(np.arange(24), name='hora')),
+        'pessoa_hora': _tabela(por_pessoa_hora, k, pd.MultiIndex.from_product(
+            [pessoas, np.arange(24)], names=['pessoa_id', 'hora'])),
+        'noite': tabela_noite,
+        'transicoes': tabela_transicoes,
+    }
+
+
+def agregar_execucao(execucao=None):
+    """Agregados de uma execução gravada no armazém (None = a mais recente)."""
+    metadados = ler_metadados(execucao)
+    janelas = ler_resultados(metadados['execucao'], colunas=['meio', 'movimento'])
+    return agregar_atividade(janelas['pessoa_id'].to_numpy(), janelas['meio'].to_numpy(),
+                             janelas['movimento'].to_numpy(), metadados['n_clusters'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Agregação da atividade por pessoa, hora e noite')
+    parser.add_argument('--execucao', help='Execução do armazém (padrão: a mais recente)')
+    args = parser.parse_args()
+
+    print("="*60)
+    print("AGREGACAO DA ATIVIDADE")
+    print("="*60)
+
+    inicio = time.perf_counter()
+    agregados = agregar_execucao(args.execucao)
+    print(f"Agregado em {time.perf_counter() - inicio:.3f} s "
+          f"({agregados['pessoa']['n_janelas'].sum()} janelas, {len(agregados['pessoa'])} pessoas)")
+
+    execucao = ler_metadados(args.execucao)['execucao']
+    destino = DIR_EXECUCOES / execucao / 'agregados'
+    destino.mkdir(exist_ok=True)
+    for nome, tabela in agregados.items():
+        tabela.to_csv(destino / f'atividade_{nome}.csv', float_format='%.4f')
+
+    print("\nPor hora do dia (todas as pessoas):")
+    print(agregados['hora'].to_string(float_format=lambda v: f"{v:.3f}"))
+    print(f"\n[OK] Tabelas salvas em: {destino}/")
+
+
+if __name__ == "__main__":
+    main()
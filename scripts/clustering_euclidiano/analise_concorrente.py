@@ -0,0 +1,230 @@
+"""
+Análise de todas as pessoas em pipeline (produtor/consumidor), em vez de
+carregar -> sincronizar -> features -> K-means -> gráfico uma pessoa de cada vez.
+
+    leitores (threads)       leem os CSVs e sincronizam as próximas pessoas
+        | fila_dados (limitada)
+    cálculo (threads)        features, K-means e mapeamento para códigos de movimento
+        | fila_resultados (limitada)
+    thread principal         grava os resultados (GravadorResultados + armazém)
+        | envia
+    renderização (processos) grava os PNGs
+
+As filas limitadas dão contrapressão: se o cálculo atrasar, os leitores param quando
+a fila enche, e a memória fica limitada a poucas pessoas carregadas por vez. O
+pandas, o numpy e o K-means do sklearn liberam o GIL nas partes pesadas, então as
+etapas se sobrepõem e o tempo total tende ao da etapa mais lenta, não à soma delas.
+
+Uso:
+    python scripts/clustering_euclidiano/analise_concorrente.py
+    python scripts/clustering_euclidiano/analise_concorrente.py 11 12 13 --leitores 2 --calculo 2 --sem-graficos
+"""
+
+import argparse
+import contextlib
+import io
+import queue
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from comum.armazem_resultados import ArmazemResultados
+from comum.execucao import N_NUCLEOS, limitar_threads
+from comum.resultados import GravadorResultados
+from comum.timestamps import tolerancia_sincronizacao
+from kmeans_clustering_euclidean import (
+    ALGORITMO_KMEANS, BACKEND_KMEANS, DIR_RESULTADOS, N_CLUSTERS, N_INIT_KMEANS, WINDOW_SIZE,
+    aplicar_kmeans, calcular_features_janela, carregar_dados_pessoa_downsampled, features_ativas,
+    map_clusters_to_movement, plotar_resultados, sincronizar_dados
+)
+from registro_features import indice_feature, limites_janelas
+
+N_LEITORES = 2
+N_CALCULO = max(1, N_NUCLEOS // 2)
+N_RENDER = max(1, N_NUCLEOS // 4)
+TAMANHO_FILA = 4            # Pessoas carregadas esperando cálculo (contrapressão)
+FIM = None                  # Sentinela das filas
+
+
+class Cronometro:
+    """Tempo acumulado por etapa (somado entre threads) para o relatório de throughput."""
+
+    def __init__(self):
+        self.tempos = defaultdict(float)
+        self.trava = threading.Lock()
+
+    @contextlib.contextmanager
+    def medir(self, etapa):
+        inicio = time.perf_counter()
+        yield
+        with self.trava:
+            self.tempos[etapa] += time.perf_counter() - inicio
+
+
+def _renderizar(labels, pessoa_id, timestamps, cluster_map, movimento):
+    """Grava o PNG de uma pessoa (roda num processo do pool); retorna o tempo gasto."""
+    import matplotlib
+    matplotlib.use('Agg')
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        plotar_resultados(labels, pessoa_id, timestamps, cluster_map, movimento)
+    return time.perf_counter() - inicio
+
+
+def _leitor(pendentes, fila_dados, cronometro):
+    while True:
+        try:
+            pessoa_id = pendentes.get_nowait()
+        except queue.Empty:
+            return
+        try:
+            with cronometro.medir('leitura'):
+                df_accel, df_gyro = carregar_dados_pessoa_downsampled(pessoa_id)
+                df = sincronizar_dados(df_accel, df_gyro, tolerancia_sincronizacao(pessoa_id))
+            fila_dados.put((pessoa_id, df, None))
+        except Exception as e:
+            fila_dados.put((pessoa_id, None, e))
+
+
+def _calculo(fila_dados, fila_resultados, n_clusters, cronometro):
+    nomes = features_ativas()
+    while True:
+        item = fila_dados.get()
+        if item is FIM:
+            fila_resultados.put(FIM)
+            return
+        pessoa_id, df, erro = item
+        if erro is not None:
+            fila_resultados.put((pessoa_id, None, erro))
+            continue
+        try:
+            # Sem redirect_stdout aqui: ele troca o sys.stdout de todas as threads
+            with cronometro.medir('calculo'):
+                features, timestamps = calcular_features_janela(df, WINDOW_SIZE)
+                _, labels, _ = aplicar_kmeans(features, n_clusters)
+                cluster_map, movimento = map_clusters_to_movement(labels, features, mostrar=False)
+            inicios, fins = limites_janelas(df, WINDOW_SIZE)
+            fila_resultados.put((pessoa_id, {
+                'features': features, 'timestamps': timestamps, 'labels': labels,
+                'cluster_map': cluster_map, 'movimento': movimento,
+                'std_accel': features[:, indice_feature(nomes, 'std_accel')],
+                'inicios': inicios, 'fins': fins,
+            }, None))
+        except Exception as e:
+            fila_resultados.put((pessoa_id, None, e))
+
+
+def analisar_coorte(pessoas, n_clusters=N_CLUSTERS, n_leitores=N_LEITORES, n_calculo=N_CALCULO,
+                    n_render=N_RENDER, tamanho_fila=TAMANHO_FILA, graficos=True,
+                    diretorio_resultados=DIR_RESULTADOS, execucao=None):
+    """
+    Mesmo resultado de `analisar_todas_pessoas`, com as etapas sobrepostas.
+
+    Returns:
+        tuple: (GravadorResultados, dict com o tempo de parede e o tempo somado por etapa)
+    """
+    armazem = ArmazemResultados(execucao, features_ativas(), {
+        'n_clusters': n_clusters, 'window_size': WINDOW_SIZE, 'backend': BACKEND_KMEANS,
+        'n_init': N_INIT_KMEANS, 'algoritmo': ALGORITMO_KMEANS, 'dados': 'Downsampling_data (2x)',
+    })
+    gravador = GravadorResultados(diretorio_resultados, n_clusters, armazem)
+    cronometro = Cronometro()
+
+    pendentes = queue.Queue()
+    for pessoa_id in pessoas:
+        pendentes.put(pessoa_id)
+    fila_dados = queue.Queue(maxsize=tamanho_fila)
+    fila_resultados = queue.Queue(maxsize=tamanho_fila)
+
+    inicio = time.perf_counter()
+    # Núcleos divididos entre as threads de cálculo (cada K-means não abre uma thread por núcleo)
+    limitar_threads(max(1, N_NUCLEOS // n_calculo))
+    leitores = [threading.Thread(target=_leitor, args=(pendentes, fila_dados, cronometro), daemon=True)
+                for _ in range(n_leitores)]
+    calculos = [threading.Thread(target=_calculo, args=(fila_dados, fila_resultados, n_clusters, cronometro),
+                                 daemon=True) for _ in range(n_calculo)]
+    for thread in leitores + calculos:
+        thread.start()
+
+    def encerrar_leitura():
+        # Quando todos os leitores terminam, uma sentinela por thread de cálculo
+        for thread in leitores:
+            thread.join()
+        for _ in calculos:
+            fila_dados.put(FIM)
+    threading.Thread(target=encerrar_leitura, daemon=True).start()
+
+    renderizador = ProcessPoolExecutor(max_workers=n_render, initializer=limitar_threads,
+                                       initargs=(1,)) if graficos else None
+    graficos_pendentes = []
+    ativos = n_calculo
+    while ativos:
+        item = fila_resultados.get()
+        if item is FIM:
+            ativos -= 1
+            continue
+        pessoa_id, r, erro = item
+        if erro is not None:
+            print(f"[ERRO] Pessoa {pessoa_id}: {erro}")
+            continue
+        with cronometro.medir('gravacao'):
+            gravador.gravar_pessoa(pessoa_id, r['timestamps'], r['labels'], r['movimento'],
+                                   r['std_accel'], r['features'], r['inicios'], r['fins'])
+        if renderizador is not None:
+            graficos_pendentes.append(renderizador.submit(
+                _renderizar, r['labels'], pessoa_id, r['timestamps'], r['cluster_map'], r['movimento']))
+        print(f"[OK] Pessoa {pessoa_id}: {len(r['labels'])} janelas")
+
+    if renderizador is not None:
+        for futuro in graficos_pendentes:
+            try:
+                cronometro.tempos['graficos'] += futuro.result()
+            except Exception as e:
+                print(f"[ERRO] Grafico: {e}")
+        renderizador.shutdown()
+
+    tempos = dict(cronometro.tempos, parede=time.perf_counter() - inicio)
+    return gravador, tempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Clustering de todas as pessoas em pipeline')
+    parser.add_argument('pessoas', type=int, nargs='*', help='IDs das pessoas (padrão: 11 a 38)')
+    parser.add_argument('--leitores', type=int, default=N_LEITORES)
+    parser.add_argument('--calculo', type=int, default=N_CALCULO)
+    parser.add_argument('--render', type=int, default=N_RENDER)
+    parser.add_argument('--fila', type=int, default=TAMANHO_FILA)
+    parser.add_argument('--sem-graficos', action='store_true')
+    args = parser.parse_args()
+
+    pessoas = args.pessoas or list(range(11, 39))
+    print("="*60)
+    print("CLUSTERIZACAO EM PIPELINE (LEITURA | CALCULO | GRAFICOS)")
+    print("="*60)
+    print(f"Pessoas: {len(pessoas)} | Leitores: {args.leitores} | Calculo: {args.calculo} | "
+          f"Graficos: {0 if args.sem_graficos else args.render} | Fila: {args.fila}")
+
+    gravador, tempos = analisar_coorte(pessoas, n_leitores=args.leitores, n_calculo=args.calculo,
+                                       n_render=args.render, tamanho_fila=args.fila,
+                                       graficos=not args.sem_graficos)
+
+    soma = sum(v for k, v in tempos.items() if k != 'parede')
+    print("\nTempo somado por etapa (entre threads):")
+    for etapa, segundos in tempos.items():
+        if etapa != 'parede':
+            print(f"   {etapa}: {segundos:.2f} s")
+    print(f"Tempo de parede: {tempos['parede']:.2f} s (soma das etapas: {soma:.2f} s)")
+    print(f"Pessoas por segundo: {gravador.n_pessoas / tempos['parede']:.2f}")
+    if gravador.n_pessoas:
+        print(f"Distribuicao geral: {np.round(gravador.distribuicao(), 3).tolist()}")
+    print(f"[OK] Resultados em: {gravador.diretorio}/ e {gravador.armazem.diretorio}/")
+
+
+if __name__ == "__main__":
+    main()
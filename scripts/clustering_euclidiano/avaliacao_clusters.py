@@ -0,0 +1,217 @@
+"""
+Avaliação dos clusters contra a marcação manual de sono, com medida de desempenho.
+
+Para cada pessoa e configuração (dataset raw/2x/10x, backend do K-means, tamanho da
+janela) roda o mesmo processamento de `analisar_pessoa`, marca cada janela como
+DORMINDO/ACORDADO pelos períodos manuais (busca vetorizada nos intervalos) e reporta:
+    - matriz de confusão código de movimento x estado manual
+    - acordo/kappa tratando "parado" como previsão de sono
+    - janelas por segundo (features + K-means + mapeamento) e tempo de leitura
+
+A tolerância de sincronização vem do relatório de timestamps por pessoa/dataset
+(separacao_manual/verificar_timestamps_coorte.py); janela 0 usa o tamanho sugerido
+nesse relatório para cada pessoa.
+
+Os pares (pessoa, configuração) rodam em paralelo, com processos e threads do
+K-means dimensionados por `comum.execucao` (--comparar-politica mede o ganho sobre um
+pool sem limite de threads).
+
+Uso:
+    python scripts/clustering_euclidiano/avaliacao_clusters.py
+    python scripts/clustering_euclidiano/avaliacao_clusters.py 11 12 --datasets 2x 10x --backends 1d
+    python scripts/clustering_euclidiano/avaliacao_clusters.py --datasets 2x --janelas 10 0
+    python scripts/clustering_euclidiano/avaliacao_clusters.py --comparar-politica
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from kmeans_clustering_euclidean import (
+    N_CLUSTERS, aplicar_kmeans, calcular_features_janela, map_clusters_to_movement,
+    sincronizar_dados
+)
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from comum.dados import DATASETS, carregar_sensores
+from comum.execucao import N_NUCLEOS, executor_processos, politica_execucao
+from comum.indice_sono import DIR_MANUAL, IndiceSono
+from comum.rotulos import ESTADOS_SONO, chaves_movimento
+from comum.timestamps import janela_sugerida, tolerancia_sincronizacao
+
+# Config
+DIR_AVALIACAO = Path('outputs/avaliacao_clusters')
+BACKENDS = ('sklearn', '1d')
+JANELAS = (10,)
+
+
+def estado_manual(pessoa_id, timestamps, inicio_dados, fim_dados):
+    """
+    Máscara dormindo (True) por janela a partir de periodos_sono<ID>.txt manual.
+
+    Returns:
+        array bool, ou None se a pessoa não tiver marcação manual
+    """
+    indice = IndiceSono.de_arquivos([pessoa_id], DIR_MANUAL, extensao=lambda _: (inicio_dados, fim_dados))
+    if pessoa_id not in indice:
+        return None
+    return indice.estado_em(timestamps, pessoa_id)
+
+
+def matriz_confusao(movimento, dormindo, n_clusters=N_CLUSTERS):
+    """Contagem de janelas (código de movimento x estado manual), via um único bincount."""
+    indices = movimento.astype(np.int64) * 2 + dormindo
+    return np.bincount(indices, minlength=2 * n_clusters).reshape(n_clusters, 2)
+
+
+def metricas_sono(matriz):
+    """Acordo, kappa, sensibilidade e especificidade tratando o código 0 (parado) como sono."""
+    vp = matriz[0, 1]               # parado e dormindo
+    fp = matriz[0, 0]               # parado e acordado
+    fn = matriz[1:, 1].sum()        # em movimento e dormindo
+    vn = matriz[1:, 0].sum()        # em movimento e acordado
+    total = matriz.sum()
+
+    acordo = (vp + vn) / total
+    p_previsto = (vp + fp) / total
+    p_manual = (vp + fn) / total
+    esperado = p_previsto * p_manual + (1 - p_previsto) * (1 - p_manual)
+    return {
+        'acordo': acordo,
+        'kappa': (acordo - esperado) / (1 - esperado) if esperado < 1 else np.nan,
+        'sensibilidade_sono': vp / (vp + fn) if vp + fn else np.nan,
+        'especificidade_sono': vn / (vn + fp) if vn + fp else np.nan,
+    }
+
+
+def avaliar_pessoa(pessoa_id, dataset, backend, window_size, n_clusters=N_CLUSTERS):
+    """
+    Processa uma pessoa em uma configuração e compara com a marcação manual.
+
+    window_size 0 usa a janela sugerida no relatório de timestamps para a pessoa.
+    """
+    resultado = {'pessoa_id': pessoa_id, 'dataset': dataset, 'backend': backend,
+                 'window_size': window_size}
+    janela = window_size or janela_sugerida(pessoa_id, dataset)
+    resultado['janela_amostras'] = janela
+
+    inicio = time.perf_counter()
+    df_accel, df_gyro = carregar_sensores(pessoa_id, dataset)
+    df_combined = sincronizar_dados(df_accel, df_gyro, tolerancia_sincronizacao(pessoa_id, dataset))
+    resultado['t_leitura_s'] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    features, timestamps = calcular_features_janela(df_combined, janela)
+    with contextlib.redirect_stdout(io.StringIO()):   # silencia o [DEBUG] do mapeamento
+        _, labels, _ = aplicar_kmeans(features, n_clusters, backend)
+        _, movimento = map_clusters_to_movement(labels, features)
+    t_processamento = time.perf_counter() - inicio
+
+    resultado['n_janelas'] = len(features)
+    resultado['t_processamento_s'] = t_processamento
+    resultado['janelas_por_s'] = len(features) / t_processamento
+
+    ts = df_combined['timestamp']
+    dormindo = estado_manual(pessoa_id, timestamps, ts.iloc[0], ts.iloc[-1])
+    if dormindo is None:
+        return resultado
+
+    matriz = matriz_confusao(movimento, dormindo, n_clusters)
+    for chave, linha in zip(chaves_movimento(n_clusters), matriz):
+        for estado, contagem in zip(ESTADOS_SONO, linha):
+            resultado[f'n_{chave}_{estado.lower()}'] = int(contagem)
+    resultado.update(metricas_sono(matriz))
+    return resultado
+
+
+def resumir(avaliacao):
+    """Uma linha por configuração: acordo/kappa médios, janelas/s agregado e matriz somada."""
+    chaves = ['dataset', 'backend', 'window_size']
+    colunas_matriz = [c for c in avaliacao.columns if c.startswith('n_') and c != 'n_janelas']
+    grupos = avaliacao.groupby(chaves, sort=False)
+    resumo = grupos[['acordo', 'kappa']].mean()
+    resumo['pessoas'] = grupos.size()
+    resumo['janelas_por_s'] = grupos['n_janelas'].sum() / grupos['t_processamento_s'].sum()
+    resumo['t_leitura_s'] = grupos['t_leitura_s'].sum()
+    resumo[colunas_matriz] = grupos[colunas_matriz].sum()
+    return resumo.reset_index()
+
+
+def rodar(tarefas, executor):
+    """Avalia todos os pares (pessoa, configuração) no executor; retorna (resultados, tempo)."""
+    inicio = time.perf_counter()
+    resultados = []
+    with executor:
+        futuros = {executor.submit(avaliar_pessoa, pid, *config): (pid, config)
+                   for pid, config in tarefas}
+        for futuro, (pessoa_id, config) in futuros.items():
+            try:
+                resultados.append(futuro.result())
+            except Exception as e:
+                print(f"[ERRO] Pessoa {pessoa_id} {config}: {e}")
+    return resultados, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Avaliação dos clusters contra a marcação manual')
+    parser.add_argument('pessoas', type=int, nargs='*', help='IDs das pessoas (padrão: 11 a 38)')
+    parser.add_argument('--datasets', nargs='+', default=list(DATASETS), choices=list(DATASETS))
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument('--janelas', type=int, nargs='+', default=list(JANELAS),
+                        help='Tamanhos de janela (0 = sugerida por pessoa no relatório de timestamps)')
+    parser.add_argument('--comparar-politica', action='store_true',
+                        help='Roda antes com um processo por núcleo sem limite de threads e mostra o speedup')
+    args = parser.parse_args()
+
+    pessoas = args.pessoas or list(range(11, 39))
+    configuracoes = list(product(args.datasets, args.backends, args.janelas))
+
+    print("="*60)
+    print("AVALIACAO DOS CLUSTERS x MARCACAO MANUAL")
+    print("="*60)
+    tarefas = [(pid, config) for config, pid in product(configuracoes, pessoas)]
+    n_processos, n_threads = politica_execucao(len(tarefas))
+    print(f"Pessoas: {len(pessoas)} | Configuracoes: {len(configuracoes)} | "
+          f"Processos: {n_processos} x {n_threads} thread(s) ({N_NUCLEOS} nucleos)")
+
+    if args.comparar_politica:
+        _, tempo_sem_limite = rodar(tarefas, ProcessPoolExecutor(max_workers=N_NUCLEOS))
+    resultados, tempo_total = rodar(tarefas, executor_processos(len(tarefas)))
+    if args.comparar_politica:
+        print(f"\nSem limite de threads: {tempo_sem_limite:.1f} s | com politica: {tempo_total:.1f} s "
+              f"(speedup {tempo_sem_limite / tempo_total:.2f}x)")
+
+    if not resultados:
+        return
+
+    avaliacao = pd.DataFrame(resultados)
+    # Contagens inteiras mesmo com pessoas sem marcação manual (NaN)
+    contagens = [c for c in avaliacao.columns if c.startswith('n_')]
+    avaliacao[contagens] = avaliacao[contagens].astype('Int64')
+    DIR_AVALIACAO.mkdir(parents=True, exist_ok=True)
+    avaliacao.to_csv(DIR_AVALIACAO / 'avaliacao_pessoas.csv', index=False, float_format='%.4f')
+
+    if 'acordo' not in avaliacao:
+        print("\n[AVISO] Nenhuma pessoa com marcação manual em", DIR_MANUAL)
+        return
+
+    resumo = resumir(avaliacao.dropna(subset=['acordo']))
+    resumo.to_csv(DIR_AVALIACAO / 'resumo_configuracoes.csv', index=False, float_format='%.4f')
+
+    print("\n" + resumo[['dataset', 'backend', 'window_size', 'pessoas', 'acordo', 'kappa',
+                         'janelas_por_s', 't_leitura_s']].to_string(
+        index=False, float_format=lambda v: f"{v:.3f}"))
+    print(f"\nTempo total (paralelo): {tempo_total:.1f} s")
+    print(f"[OK] Resultados em: {DIR_AVALIACAO}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Features no domínio da frequência por janela, calculadas em lote.
+
+A matriz de magnitudes (n_janelas, window_size) passa por um único `np.fft.rfft`
+ao longo das janelas; a partir do espectro de potência de todas as janelas saem:
+    - frequência dominante (maior pico, sem a componente contínua)
+    - energia em cada faixa de frequência (BANDAS_HZ, ou N_BANDAS faixas iguais até Nyquist)
+    - entropia espectral normalizada (0 = um único pico, 1 = espectro plano)
+
+Nada roda em loop por janela: somas por faixa são diferenças de soma acumulada nos
+índices das bordas (searchsorted nas frequências do rfft).
+"""
+
+import numpy as np
+import pandas as pd
+
+BANDAS_HZ = None     # Ex.: ((0, 0.5), (0.5, 3), (3, 8)); None divide 0..Nyquist em N_BANDAS
+N_BANDAS = 3
+
+
+def taxa_amostragem(timestamps):
+    """Taxa de amostragem (Hz) pelo intervalo mediano entre timestamps (ignora duplicados)."""
+    ts = pd.to_datetime(pd.Series(timestamps)).to_numpy('datetime64[ns]').view(np.int64)
+    dt = np.diff(ts)
+    dt = dt[dt > 0]
+    return 1e9 / np.median(dt) if len(dt) else 1.0
+
+
+def bandas_padrao(fs, n_bandas=N_BANDAS):
+    """N faixas de mesma largura entre 0 e a frequência de Nyquist."""
+    bordas = np.linspace(0, fs / 2, n_bandas + 1)
+    return tuple(zip(bordas[:-1], bordas[1:]))
+
+
+def espectro_janelas(magnitudes, fs):
+    """
+    Espectro de potência de todas as janelas com um único rfft.
+
+    Args:
+        magnitudes: array (n_janelas, window_size)
+        fs: taxa de amostragem (Hz)
+
+    Returns:
+        tuple: (frequências (n_bins,), potência float32 (n_janelas, n_bins))
+    """
+    # Tirar a média de cada janela: a componente contínua (gravidade) domina o espectro
+    centrado = magnitudes - magnitudes.mean(axis=1, keepdims=True)
+    potencia = np.abs(np.fft.rfft(centrado, axis=1)) ** 2
+    frequencias = np.fft.rfftfreq(magnitudes.shape[1], d=1 / fs)
+    return frequencias, potencia.astype(np.float32)
+
+
+def features_espectrais(frequencias, potencia, bandas, fs):
+    """
+    Frequência dominante, energia por faixa e entropia espectral de cada janela.
+
+    As faixas são [inicio, fim); uma faixa que termina em fs/2 ou acima inclui Nyquist.
+
+    Returns:
+        array float32 (n_janelas, 2 + len(bandas))
+    """
+    sem_dc = potencia[:, 1:]
+    total = sem_dc.sum(axis=1)
+    com_sinal = total > 0
+
+    dominante = np.where(com_sinal, frequencias[1:][sem_dc.argmax(axis=1)], 0.0)
+
+    # Energia por faixa [inicio, fim) via soma acumulada nas colunas do espectro
+    acumulada = np.concatenate([np.zeros((len(potencia), 1)), np.cumsum(potencia, axis=1)], axis=1)
+    inicios = np.searchsorted(frequencias, [a for a, _ in bandas], side='left')
+    fins = np.searchsorted(frequencias, [b for _, b in bandas], side='left')
+    if bandas[-1][1] >= fs / 2:
+        fins[-1] = len(frequencias)      # a última faixa chega a Nyquist: inclui o último bin
+    energia = acumulada[:, fins] - acumulada[:, inicios]
+
+    # Entropia de Shannon da distribuição de potência, normalizada por log(n_bins)
+    p = sem_dc / np.where(com_sinal, total, 1.0)[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        entropia = np.where(p > 0, -p * np.log(p), 0.0).sum(axis=1)
+    n_bins = sem_dc.shape[1]
+    entropia = entropia / np.log(n_bins) if n_bins > 1 else np.zeros(len(potencia))
+
+    return np.column_stack([dominante, energia, entropia]).astype(np.float32)
+
+
+def nomes_features_frequencia(sensores=('accel', 'gyro'), n_bandas=N_BANDAS):
+    """Nomes das colunas espectrais por sensor, na ordem de features_espectrais (os do registro)."""
+    nomes = []
+    for sensor in sensores:
+        nomes.append(f'freq_dom_{sensor}')
+        nomes += [f'energia_b{b}_{sensor}' for b in range(n_bandas)]
+        nomes.append(f'entropia_espectral_{sensor}')
+    return nomes
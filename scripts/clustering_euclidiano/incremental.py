@@ -0,0 +1,444 @@
+"""
+Modo incremental do clustering euclidiano: processa apenas as amostras novas de cada pessoa.
+
+Na primeira execução a pessoa é processada inteira (como em `analisar_pessoa`) e um
+checkpoint é salvo. Nas execuções seguintes só os bytes acrescentados aos CSVs são
+lidos, sincronizados, transformados em janelas e rotulados com os centróides salvos.
+
+Checkpoint por pessoa (outputs/checkpoints_clustering/pessoa_<id>/):
+    estado.json     - último timestamp processado, posição (bytes) já lida de cada arquivo
+                      e impressão (sha256 do início e do trecho antes da posição), tamanho
+                      e sha256 do CSV de janelas, estatísticas acumuladas do scaler
+                      (n, média, M2), centróides, parâmetros do passa-alta das features
+                      dinâmicas e nome do arquivo de caudas
+    caudas_<n>.npz  - acelerômetro ainda sem par no giroscópio, final do giroscópio
+                      (para sincronizar a próxima leitura), janela incompleta e estado
+                      do passa-alta no fim da última janela completa
+    janelas.csv     - rótulos por janela do modo incremental (só este script escreve aqui;
+                      os de analisar_pessoa ficam em outputs/resultados_clustering e os do
+                      pipeline em outputs/pipeline/clustering)
+
+Ordem de gravação (uma queda em qualquer ponto não duplica janelas nem mistura estados):
+as janelas novas são acrescentadas ao CSV, as caudas vão para um arquivo novo e só então
+estado.json é trocado por os.replace. Na retomada o CSV é cortado no tamanho registrado,
+descartando janelas acrescentadas por uma execução que não chegou a gravar o checkpoint;
+se o início do CSV não bate com o sha256 do checkpoint, nada é cortado e a pessoa é recusada.
+
+Se um CSV de entrada ficou menor que a posição salva ou foi reescrito (ex.: estágio
+downsample_2x do pipeline), a pessoa é reprocessada do zero.
+
+Uso:
+    python scripts/clustering_euclidiano/incremental.py            # pessoas 11 a 38
+    python scripts/clustering_euclidiano/incremental.py 11 12
+    python scripts/clustering_euclidiano/incremental.py 11 --reiniciar
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from kmeans_clustering_euclidean import (
+    N_CLUSTERS, aplicar_kmeans, calcular_features_janela, map_clusters_to_movement,
+    sincronizar_dados
+)
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from comum.filtros import FiltroPassaAlta
+from comum.resultados import escrever_janelas
+from comum.rotulos import DTYPE_CODIGO, DTYPE_SENSOR
+from comum.timestamps import TOLERANCIA_PADRAO_S, tolerancia_sincronizacao
+
+# Config
+ARQUIVO_ACCEL = 'DATA/Downsampling_data/ds_acelerometro/ds_acelerometro_{}.csv'
+ARQUIVO_GYRO = 'DATA/Downsampling_data/ds_giroscopio/ds_giroscopio_{}.csv'
+DIR_CHECKPOINTS = Path('outputs/checkpoints_clustering')
+WINDOW_SIZE = 10
+COLUNAS = ['timestamp', 'x', 'y', 'z']
+BYTES_IMPRESSAO = 1 << 16   # Bytes do início e do fim já lido que identificam um CSV de entrada
+
+
+def _sha256(arquivo, inicio=0, fim=None):
+    """sha256 dos bytes [inicio, fim) do arquivo (fim=None = até o final)."""
+    h = hashlib.sha256()
+    with open(arquivo, 'rb') as f:
+        f.seek(inicio)
+        restante = None if fim is None else fim - inicio
+        while restante is None or restante > 0:
+            bloco = f.read(1 << 20 if restante is None else min(1 << 20, restante))
+            if not bloco:
+                break
+            h.update(bloco)
+            if restante is not None:
+                restante -= len(bloco)
+    return h.hexdigest()
+
+
+def impressao_arquivo(arquivo, posicao):
+    """
+    Identifica o conteúdo já lido de um CSV: sha256 do início e dos últimos bytes antes
+    de `posicao`. None se o arquivo tem menos que `posicao` bytes.
+    """
+    if Path(arquivo).stat().st_size < posicao:
+        return None
+    return (_sha256(arquivo, 0, min(BYTES_IMPRESSAO, posicao))
+            + _sha256(arquivo, max(0, posicao - BYTES_IMPRESSAO), posicao))
+
+
+def ler_novas_linhas(arquivo, posicao):
+    """
+    Lê apenas as linhas completas acrescentadas ao CSV depois de `posicao` (em bytes).
+
+    Uma última linha sem '\\n' (arquivo ainda sendo escrito) fica para a próxima leitura.
+    Um arquivo menor que `posicao` foi reescrito: erro em vez de ler do meio de outra linha.
+
+    Returns:
+        tuple: (DataFrame com as linhas novas, nova posição em bytes)
+    """
+    if Path(arquivo).stat().st_size < posicao:
+        raise ValueError(f"{arquivo} tem menos que os {posicao} bytes já lidos (arquivo reescrito)")
+    with open(arquivo, 'rb') as f:
+        f.seek(posicao)
+        dados = f.read()
+
+    fim = dados.rfind(b'\n') + 1
+    dados = dados[:fim]
+    if not dados.strip():
+        vazio = np.zeros((0, 3), dtype=DTYPE_SENSOR)
+        return _tabela(np.zeros(0, dtype='datetime64[ns]'), vazio, COLUNAS[1:]), posicao
+
+    tipos = {c: DTYPE_SENSOR for c in COLUNAS[1:]}
+    if posicao == 0:
+        df = pd.read_csv(io.BytesIO(dados), usecols=COLUNAS, dtype=tipos)
+    else:
+        df = pd.read_csv(io.BytesIO(dados), header=None, names=COLUNAS, dtype=tipos)
+    df['timestamp'] = pd.to_datetime(df['timestamp']).astype('datetime64[ns]')
+    return df[COLUNAS], posicao + fim
+
+
+def _tabela(ts, valores, colunas):
+    """Remonta um DataFrame a partir dos arrays salvos no checkpoint."""
+    df = pd.DataFrame(valores, columns=colunas)
+    df.insert(0, 'timestamp', ts.astype('datetime64[ns]'))
+    return df
+
+
+def acumular_estatisticas(estatisticas, features):
+    """
+    Atualiza (n, média, M2) com um novo lote de features (fórmula de Chan para combinar lotes).
+
+    Equivalente a recalcular média e variância sobre todas as janelas já vistas.
+    """
+    n_b = len(features)
+    if n_b == 0:
+        return estatisticas
+    features = features.astype(np.float64)
+    media_b = features.mean(axis=0)
+    m2_b = ((features - media_b) ** 2).sum(axis=0)
+    if estatisticas is None:
+        return n_b, media_b, m2_b
+
+    n_a, media_a, m2_a = estatisticas
+    n = n_a + n_b
+    delta = media_b - media_a
+    media = media_a + delta * n_b / n
+    m2 = m2_a + m2_b + delta ** 2 * n_a * n_b / n
+    return n, media, m2
+
+
+def normalizar(features, estatisticas):
+    """Normaliza como o StandardScaler (desvio populacional; desvio zero vira 1)."""
+    n, media, m2 = estatisticas
+    desvio = np.sqrt(m2 / n)
+    desvio[desvio == 0] = 1.0
+    return (features - media) / desvio
+
+
+def carregar_checkpoint(pessoa_id):
+    """Carrega o checkpoint de uma pessoa ou retorna None se ela ainda não foi processada."""
+    pasta = DIR_CHECKPOINTS / f'pessoa_{pessoa_id}'
+    if not (pasta / 'estado.json').exists():
+        return None
+
+    with open(pasta / 'estado.json', 'r', encoding='utf-8') as f:
+        estado = json.load(f)
+    with np.load(pasta / estado.get('caudas', 'caudas.npz')) as arquivo:
+        caudas = dict(arquivo)
+
+    estado['estatisticas'] = (
+        estado['estatisticas']['n'],
+        np.array(estado['estatisticas']['media']),
+        np.array(estado['estatisticas']['m2'])
+    )
+    estado['centroides'] = np.array(estado['centroides'])
+    estado['clusters'] = np.array(estado['clusters'], dtype=DTYPE_CODIGO)
+    estado['accel_pendente'] = _tabela(caudas['accel_ts'], caudas['accel'], ['x', 'y', 'z'])
+    estado['gyro_cauda'] = _tabela(caudas['gyro_ts'], caudas['gyro'], ['x', 'y', 'z'])
+    estado['janela_parcial'] = _tabela(
+        caudas['janela_ts'], caudas['janela'], ['x', 'y', 'z', 'gx', 'gy', 'gz']
+    )
+
+    # Passa-alta retomado de onde a última janela completa parou
+    filtros = {}
+    for sensor, parametros in estado.get('filtros', {}).items():
+        filtro = FiltroPassaAlta(parametros['janela'], parametros['metodo'])
+        if f'filtro_{sensor}' in caudas:
+            filtro.estado = caudas[f'filtro_{sensor}']
+        filtros[sensor] = filtro
+    estado['filtros'] = filtros
+    return estado
+
+
+def salvar_checkpoint(pessoa_id, estado):
+    """
+    Grava as caudas num arquivo novo e troca estado.json atomicamente (o checkpoint antigo
+    continua válido até o os.replace); depois remove as caudas que não são mais usadas.
+    """
+    pasta = DIR_CHECKPOINTS / f'pessoa_{pessoa_id}'
+    pasta.mkdir(parents=True, exist_ok=True)
+
+    arquivo_caudas = f"caudas_{estado['versao']}.npz"
+    n, media, m2 = estado['estatisticas']
+    dados_json = {
+        'versao': estado['versao'],
+        'caudas': arquivo_caudas,
+        'ultimo_timestamp': estado['ultimo_timestamp'],
+        'posicao_accel': estado['posicao_accel'],
+        'posicao_gyro': estado['posicao_gyro'],
+        'impressao_accel': estado['impressao_accel'],
+        'impressao_gyro': estado['impressao_gyro'],
+        'bytes_janelas': estado['bytes_janelas'],
+        'sha256_janelas': estado['sha256_janelas'],
+        'window_size': estado['window_size'],
+        'estatisticas': {'n': int(n), 'media': media.tolist(), 'm2': m2.tolist()},
+        'centroides': estado['centroides'].tolist(),
+        'clusters': estado['clusters'].tolist(),
+        'filtros': {sensor: {'janela': filtro.janela, 'metodo': filtro.metodo}
+                    for sensor, filtro in estado['filtros'].items()}
+    }
+
+    accel = estado['accel_pendente']
+    gyro = estado['gyro_cauda']
+    janela = estado['janela_parcial']
+    temporario = pasta / (arquivo_caudas + '.tmp')
+    with open(temporario, 'wb') as f:
+        np.savez(
+            f,
+            accel_ts=accel['timestamp'].to_numpy('datetime64[ns]'),
+            accel=accel[['x', 'y', 'z']].to_numpy(DTYPE_SENSOR),
+            gyro_ts=gyro['timestamp'].to_numpy('datetime64[ns]'),
+            gyro=gyro[['x', 'y', 'z']].to_numpy(DTYPE_SENSOR),
+            janela_ts=janela['timestamp'].to_numpy('datetime64[ns]'),
+            janela=janela[['x', 'y', 'z', 'gx', 'gy', 'gz']].to_numpy(DTYPE_SENSOR),
+            **{f'filtro_{sensor}': filtro.estado for sensor, filtro in estado['filtros'].items()
+               if filtro.estado is not None}
+        )
+    os.replace(temporario, pasta / arquivo_caudas)
+
+    # estado.json passa a apontar para as caudas novas num único os.replace
+    temporario = pasta / 'estado.json.tmp'
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(dados_json, f, indent=2)
+    os.replace(temporario, pasta / 'estado.json')
+
+    for antigo in pasta.glob('caudas*.npz'):
+        if antigo.name != arquivo_caudas:
+            antigo.unlink()
+
+
+def sincronizar_parcial(df_accel, df_gyro, tolerancia=TOLERANCIA_PADRAO_S):
+    """
+    Sincroniza só as amostras do acelerômetro que não podem mais mudar de par.
+
+    Uma amostra do acelerômetro é final quando está a mais de `tolerancia` (s) do último
+    giroscópio lido: nenhuma amostra futura do giroscópio pode ser mais próxima dela.
+    Usa a mesma tolerância por pessoa de `analisar_pessoa` (tolerancia_sincronizacao).
+
+    Returns:
+        tuple: (dados sincronizados, acelerômetro pendente, cauda do giroscópio a guardar)
+    """
+    if df_gyro.empty:
+        return None, df_accel, df_gyro
+
+    margem = pd.Timedelta(seconds=tolerancia)
+    horizonte = df_gyro['timestamp'].max() - margem
+    finais = df_accel['timestamp'] <= horizonte
+    df_sync = sincronizar_dados(df_accel[finais], df_gyro, tolerancia)
+
+    # Giroscópio que ainda pode ser o par mais próximo das próximas amostras do acelerômetro
+    gyro_cauda = df_gyro[df_gyro['timestamp'] >= horizonte - margem]
+    return df_sync, df_accel[~finais], gyro_cauda
+
+
+def rotular(features, estatisticas, centroides):
+    """Atribui cada janela ao centróide mais próximo no espaço normalizado atual."""
+    f_norm = normalizar(features, estatisticas)
+    c_norm = normalizar(centroides, estatisticas)
+    dist = ((f_norm[:, None, :] - c_norm[None, :, :]) ** 2).sum(axis=2)
+    return dist.argmin(axis=1).astype(DTYPE_CODIGO)
+
+
+def entradas_reescritas(estado, arquivo_accel, arquivo_gyro):
+    """True se algum CSV de entrada não começa mais pelo conteúdo já lido no checkpoint."""
+    for arquivo, sensor in ((arquivo_accel, 'accel'), (arquivo_gyro, 'gyro')):
+        impressao = impressao_arquivo(arquivo, estado[f'posicao_{sensor}'])
+        if impressao is None or impressao != estado.get(f'impressao_{sensor}', impressao):
+            return True
+    return False
+
+
+def verificar_janelas(pessoa_id, estado, arquivo_janelas):
+    """
+    Confere que o CSV de janelas é o que o checkpoint gravou e corta o que veio depois
+    (janelas de uma execução interrompida antes do checkpoint).
+    """
+    tamanho = estado.get('bytes_janelas')
+    if tamanho is None:
+        return
+    if not arquivo_janelas.exists() or arquivo_janelas.stat().st_size < tamanho or \
+            _sha256(arquivo_janelas, 0, tamanho) != estado['sha256_janelas']:
+        raise ValueError(f"{arquivo_janelas} não é o CSV gravado pelo checkpoint da pessoa "
+                         f"{pessoa_id}; use --reiniciar")
+    if arquivo_janelas.stat().st_size > tamanho:
+        print(f"   [AVISO] Descartando janelas sem checkpoint em {arquivo_janelas}")
+        os.truncate(arquivo_janelas, tamanho)
+
+
+def processar_incremental(pessoa_id, n_clusters=N_CLUSTERS, window_size=WINDOW_SIZE,
+                          arquivo_accel=None, arquivo_gyro=None, arquivo_janelas=None):
+    """
+    Processa as amostras novas de uma pessoa desde o último checkpoint.
+
+    Sem checkpoint, processa o arquivo inteiro, ajusta o K-means e salva o estado inicial.
+    Com checkpoint, lê só o que foi acrescentado e rotula as janelas novas pelos centróides
+    salvos (ordenados por código de movimento), atualizando as estatísticas do scaler.
+
+    Args:
+        arquivo_janelas: CSV dos rótulos por janela; None usa janelas.csv na pasta do checkpoint
+
+    Returns:
+        int: número de janelas novas rotuladas
+    """
+    arquivo_accel = arquivo_accel or ARQUIVO_ACCEL.format(pessoa_id)
+    arquivo_gyro = arquivo_gyro or ARQUIVO_GYRO.format(pessoa_id)
+    pasta = DIR_CHECKPOINTS / f'pessoa_{pessoa_id}'
+    arquivo_janelas = Path(arquivo_janelas or pasta / 'janelas.csv')
+    arquivo_janelas.parent.mkdir(parents=True, exist_ok=True)
+
+    estado = carregar_checkpoint(pessoa_id)
+    if estado is not None and estado['window_size'] != window_size:
+        raise ValueError(f"Checkpoint da pessoa {pessoa_id} usa janela de "
+                         f"{estado['window_size']} pontos; use --reiniciar")
+    if estado is not None and entradas_reescritas(estado, arquivo_accel, arquivo_gyro):
+        print(f"   [AVISO] CSVs de entrada reescritos desde o checkpoint; reprocessando do zero")
+        estado = None
+    if estado is not None:
+        verificar_janelas(pessoa_id, estado, arquivo_janelas)
+
+    posicao_accel = estado['posicao_accel'] if estado else 0
+    posicao_gyro = estado['posicao_gyro'] if estado else 0
+
+    # 1. Ler apenas o que foi acrescentado aos arquivos
+    novos_accel, posicao_accel = ler_novas_linhas(arquivo_accel, posicao_accel)
+    novos_gyro, posicao_gyro = ler_novas_linhas(arquivo_gyro, posicao_gyro)
+    print(f"   [OK] Novas amostras: acelerometro={len(novos_accel)}, giroscopio={len(novos_gyro)}")
+
+    if estado:
+        novos_accel = pd.concat([estado['accel_pendente'], novos_accel], ignore_index=True)
+        novos_gyro = pd.concat([estado['gyro_cauda'], novos_gyro], ignore_index=True)
+
+    # 2. Sincronizar a parte nova e juntar com a janela incompleta anterior
+    df_sync, accel_pendente, gyro_cauda = sincronizar_parcial(
+        novos_accel, novos_gyro, tolerancia_sincronizacao(pessoa_id))
+    partes = [estado['janela_parcial']] if estado else []
+    if df_sync is not None:
+        partes.append(df_sync)
+    df_novo = pd.concat(partes, ignore_index=True) if partes else pd.DataFrame(
+        columns=['timestamp', 'x', 'y', 'z', 'gx', 'gy', 'gz'])
+
+    # 3. Features das janelas completas; o resto vira a nova janela parcial
+    #    (o passa-alta das features dinâmicas continua do estado salvo)
+    filtros = estado['filtros'] if estado else {}
+    n_completos = (len(df_novo) // window_size) * window_size
+    features, timestamps = calcular_features_janela(df_novo, window_size, filtros=filtros)
+    janela_parcial = df_novo.iloc[n_completos:]
+
+    # 4. Rotular
+    if estado is None:
+        if len(features) < n_clusters:
+            print(f"   [AVISO] Janelas insuficientes para o K-means ({len(features)})")
+            return 0
+        kmeans, labels, _ = aplicar_kmeans(features, n_clusters)
+        cluster_map, movimento = map_clusters_to_movement(labels, features)
+        # Centróides no espaço original, na ordem dos códigos de movimento
+        clusters = np.array(sorted(cluster_map, key=cluster_map.get), dtype=DTYPE_CODIGO)
+        centroides = np.array([features[labels == c].mean(axis=0) for c in clusters])
+        estatisticas = acumular_estatisticas(None, features)
+        escrever_janelas(arquivo_janelas, timestamps, labels, movimento)
+    else:
+        estatisticas = acumular_estatisticas(estado['estatisticas'], features)
+        centroides = estado['centroides']
+        clusters = estado['clusters']
+        movimento = rotular(features, estatisticas, centroides) if len(features) else \
+            np.zeros(0, dtype=DTYPE_CODIGO)
+        escrever_janelas(arquivo_janelas, timestamps, clusters[movimento], movimento, anexar=True)
+
+    # 5. Salvar checkpoint (depois das janelas: o tamanho do CSV faz parte dele)
+    ultimo_timestamp = estado['ultimo_timestamp'] if estado else None
+    if n_completos:
+        ultimo_timestamp = str(df_novo['timestamp'].iloc[n_completos - 1])
+    salvar_checkpoint(pessoa_id, {
+        'versao': estado.get('versao', 0) + 1 if estado else 1,
+        'ultimo_timestamp': ultimo_timestamp,
+        'posicao_accel': posicao_accel,
+        'posicao_gyro': posicao_gyro,
+        'impressao_accel': impressao_arquivo(arquivo_accel, posicao_accel),
+        'impressao_gyro': impressao_arquivo(arquivo_gyro, posicao_gyro),
+        'bytes_janelas': arquivo_janelas.stat().st_size,
+        'sha256_janelas': _sha256(arquivo_janelas),
+        'window_size': window_size,
+        'estatisticas': estatisticas,
+        'centroides': centroides,
+        'clusters': clusters,
+        'accel_pendente': accel_pendente,
+        'gyro_cauda': gyro_cauda,
+        'janela_parcial': janela_parcial,
+        'filtros': filtros
+    })
+
+    print(f"   [OK] {len(features)} janelas novas rotuladas -> {arquivo_janelas}")
+    return len(features)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Clustering incremental (apenas dados novos)')
+    parser.add_argument('pessoas', type=int, nargs='*', help='IDs das pessoas (padrão: 11 a 38)')
+    parser.add_argument('--reiniciar', action='store_true',
+                        help='Apaga o checkpoint e reprocessa o histórico completo')
+    args = parser.parse_args()
+
+    pessoas = args.pessoas or list(range(11, 39))
+
+    print("="*60)
+    print("CLUSTERING INCREMENTAL")
+    print("="*60)
+
+    for pessoa_id in pessoas:
+        print(f"\nPessoa {pessoa_id}:")
+        if args.reiniciar:
+            shutil.rmtree(DIR_CHECKPOINTS / f'pessoa_{pessoa_id}', ignore_errors=True)
+        try:
+            processar_incremental(pessoa_id)
+        except Exception as e:
+            print(f"   [ERRO] Falha ao processar pessoa {pessoa_id}: {e}")
+
+
+if __name__ == "__main__":
+    main()
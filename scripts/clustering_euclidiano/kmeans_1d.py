@@ -0,0 +1,134 @@
+"""
+K-means ótimo em 1 dimensão (programação dinâmica no estilo Ckmeans.1d.dp).
+
+Em uma dimensão os clusters ótimos são intervalos contíguos dos valores ordenados,
+então a partição de menor soma de quadrados pode ser achada exatamente:
+
+    D[m][i] = min_j  D[m-1][j-1] + custo(j, i)
+
+onde custo(j, i) é a soma dos quadrados de x[j..i] em torno da média (O(1) com
+somas acumuladas). O j ótimo é monótono em i, o que permite resolver cada camada
+por divisão e conquista em O(n log n): custo total O(k·n log n), determinístico,
+sem inicializações aleatórias nem n_init.
+
+Cada nível da divisão e conquista é processado de uma vez com numpy (todos os
+pontos médios do nível juntos), então não há um laço Python por amostra.
+"""
+
+import numpy as np
+
+from comum.rotulos import DTYPE_CODIGO
+
+
+class KMeans1DOtimo:
+    """
+    Partição k-means exata de uma única coluna, com a interface básica do KMeans do sklearn.
+
+    Args:
+        n_clusters: Número de clusters
+        coluna: Coluna usada quando X tem várias features (padrão: 0 = std do acelerômetro)
+
+    Atributos após o fit:
+        labels_: Cluster de cada amostra (0 = menores valores, em ordem crescente)
+        cluster_centers_: Média de cada cluster, shape (n_clusters, 1)
+        inertia_: Soma dos quadrados dentro dos clusters (na coluna usada)
+    """
+
+    def __init__(self, n_clusters=3, coluna=0):
+        self.n_clusters = n_clusters
+        self.coluna = coluna
+
+    def _valores(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        return X[:, self.coluna] if X.ndim == 2 else X
+
+    def fit(self, X):
+        x = self._valores(X)
+        n, k = len(x), self.n_clusters
+        if n < k:
+            raise ValueError(f"n_samples={n} deve ser >= n_clusters={k}")
+
+        ordem = np.argsort(x, kind='stable')
+        ordenados = x[ordem]
+        # Centralizar reduz o cancelamento numérico em soma(x²) - soma(x)²/m
+        centro = ordenados.mean()
+        s1 = np.concatenate(([0.0], np.cumsum(ordenados - centro)))
+        s2 = np.concatenate(([0.0], np.cumsum((ordenados - centro) ** 2)))
+
+        def custo(j, i):
+            m = i - j + 1
+            soma = s1[i + 1] - s1[j]
+            return np.maximum(s2[i + 1] - s2[j] - soma * soma / m, 0.0)
+
+        # Camada 1: um cluster cobrindo x[0..i]
+        anterior = custo(np.zeros(n, dtype=np.int64), np.arange(n))
+        inicios = np.zeros((k, n), dtype=np.int64)
+        for m in range(1, k):
+            anterior, inicios[m] = _camada(anterior, custo, m, n)
+
+        # Reconstruir os intervalos do último para o primeiro cluster
+        rotulos_ordenados = np.empty(n, dtype=DTYPE_CODIGO)
+        centros = np.empty(k)
+        fim = n - 1
+        for m in range(k - 1, -1, -1):
+            inicio = inicios[m][fim] if m else 0
+            rotulos_ordenados[inicio:fim + 1] = m
+            centros[m] = ordenados[inicio:fim + 1].mean()
+            fim = inicio - 1
+
+        self.labels_ = np.empty(n, dtype=DTYPE_CODIGO)
+        self.labels_[ordem] = rotulos_ordenados
+        self.cluster_centers_ = centros[:, None]
+        self.inertia_ = float(anterior[n - 1])
+        return self
+
+    def fit_predict(self, X):
+        return self.fit(X).labels_
+
+    def predict(self, X):
+        """Cluster do centro mais próximo (as fronteiras são os pontos médios entre centros)."""
+        centros = self.cluster_centers_[:, 0]
+        fronteiras = (centros[1:] + centros[:-1]) / 2
+        return np.searchsorted(fronteiras, self._valores(X)).astype(DTYPE_CODIGO)
+
+
+def _camada(anterior, custo, m, n):
+    """
+    Uma camada da programação dinâmica (m+1 clusters) por divisão e conquista.
+
+    Returns:
+        tuple: (custo ótimo de x[0..i] com m+1 clusters, início do último cluster)
+    """
+    atual = np.full(n, np.inf)
+    melhor_j = np.zeros(n, dtype=np.int64)
+
+    # Segmentos pendentes: faixa de i [lo, hi] e faixa permitida para o j ótimo
+    lo = np.array([m]); hi = np.array([n - 1])
+    opt_lo = np.array([m]); opt_hi = np.array([n - 1])
+    while len(lo):
+        meio = (lo + hi) // 2
+        j_max = np.minimum(opt_hi, meio)
+        tamanhos = j_max - opt_lo + 1
+        inicio_seg = np.concatenate(([0], np.cumsum(tamanhos)[:-1]))
+
+        # Todos os candidatos (j, meio) deste nível em um único array
+        i_rep = np.repeat(meio, tamanhos)
+        j = np.repeat(opt_lo - inicio_seg, tamanhos) + np.arange(tamanhos.sum())
+        valores = anterior[j - 1] + custo(j, i_rep)
+
+        minimos = np.minimum.reduceat(valores, inicio_seg)
+        empate = np.flatnonzero(valores == np.repeat(minimos, tamanhos))
+        j_otimo = j[empate[np.searchsorted(empate, inicio_seg)]]
+        atual[meio] = minimos
+        melhor_j[meio] = j_otimo
+
+        # Metade esquerda usa j <= j_otimo, metade direita usa j >= j_otimo
+        esq = meio > lo
+        dir_ = meio < hi
+        lo, hi, opt_lo, opt_hi = (
+            np.concatenate((lo[esq], meio[dir_] + 1)),
+            np.concatenate((meio[esq] - 1, hi[dir_])),
+            np.concatenate((opt_lo[esq], j_otimo[dir_])),
+            np.concatenate((j_otimo[esq], opt_hi[dir_])),
+        )
+    return atual, melhor_j
@@ -5,11 +5,40 @@ import matplotlib.dates as mdates
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
 import os
+import sys
 from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from comum.rotulos import (
+    CORES_MOVIMENTO, DTYPE_CODIGO, DTYPE_SENSOR, NOMES_MOVIMENTO,
+    contar_codigos, tabela_movimento
+)
+from comum.armazem_resultados import ArmazemResultados
+from comum.dados import arquivos_sensores, carregar_pessoas, ler_par
+from comum.resultados import GravadorResultados
+from comum.timestamps import TOLERANCIA_PADRAO_S, tolerancia_sincronizacao
+from features_frequencia import nomes_features_frequencia
+from kmeans_1d import KMeans1DOtimo
+from metricas_qualidade import metricas_qualidade
+from registro_features import FEATURES_PADRAO, calcular_features, indice_feature, limites_janelas
 
 # Config
 N_CLUSTERS = 3          # Número de clusters desejados (muito baixo, baixo, alto movimento)
+WINDOW_SIZE = 10        # Pontos por janela (SEM sobreposição)
 PESSOA_INICIAL = 38     # Começar com a pessoa 11 (primeira do downsampling)
+DIR_RESULTADOS = 'outputs/resultados_clustering'  # Rótulos por janela e resumo por pessoa
+BACKEND_KMEANS = 'sklearn'  # 'sklearn' (4 features) ou '1d' (partição ótima exata só na std_accel)
+K_VARREDURA = range(2, 9)   # Valores de k testados em varrer_k
+N_INIT_KMEANS = 10          # Inicializações do K-means do sklearn
+ALGORITMO_KMEANS = 'lloyd'  # 'lloyd' ou 'elkan' (threads OpenMP limitadas por comum.execucao)
+FEATURES = FEATURES_PADRAO  # Features por nome (registro_features.py); std_accel define a ordem dos clusters
+DESCRICAO_ESTATISTICAS = {   # Médias por cluster impressas em analisar_pessoa
+    'std_accel': 'Variacao acelerometro (criterio principal)',
+    'mag_accel': 'Magnitude acelerometro',
+    'std_gyro': 'Variacao giroscopio',
+}
+FEATURES_FREQUENCIA = False # Acrescenta as features espectrais (features_frequencia.py) às de FEATURES
 
 def carregar_dados_pessoa_downsampled(pessoa_id):
     """
@@ -21,27 +50,26 @@ def carregar_dados_pessoa_downsampled(pessoa_id):
     Returns:
         tuple: (DataFrame acelerômetro, DataFrame giroscópio)
     """
-    # Caminhos dos arquivos com downsampling
-    accel_file = f'DATA/Downsampling_data/ds_acelerometro/ds_acelerometro_{pessoa_id}.csv'
-    gyro_file = f'DATA/Downsampling_data/ds_giroscopio/ds_giroscopio_{pessoa_id}.csv'
-    
-    # Carregar acelerômetro (CSV com cabeçalho)
-    df_accel = pd.read_csv(accel_file)
-    df_accel['timestamp'] = pd.to_datetime(df_accel['timestamp'])
-    
-    # Carregar giroscópio (CSV com cabeçalho)
-    df_gyro = pd.read_csv(gyro_file)
-    df_gyro['timestamp'] = pd.to_datetime(df_gyro['timestamp'])
-    
-    return df_accel, df_gyro
+    # Acelerômetro e giroscópio lidos ao mesmo tempo (comum/dados.py)
+    return ler_par(*arquivos_sensores(pessoa_id, '2x'), leitor=ler_sensor_downsampled)
+
+def ler_sensor_downsampled(arquivo):
+    """Lê um CSV com cabeçalho (timestamp, x, y, z) do dataset com downsampling"""
+    # Eixos em float32: metade da memória do float64 e precisão de sobra para o sensor
+    tipos = {'x': DTYPE_SENSOR, 'y': DTYPE_SENSOR, 'z': DTYPE_SENSOR}
+    df = pd.read_csv(arquivo, dtype=tipos)
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    return df
 
-def sincronizar_dados(df_accel, df_gyro):
+def sincronizar_dados(df_accel, df_gyro, tolerancia=TOLERANCIA_PADRAO_S):
     """
     Sincroniza dados de acelerômetro e giroscópio baseado em timestamps
     
     Args:
         df_accel: DataFrame com dados do acelerômetro
         df_gyro: DataFrame com dados do giroscópio
+        tolerancia: Diferença máxima (s) entre amostras combinadas
+                    (por pessoa: comum.timestamps.tolerancia_sincronizacao)
     
     Returns:
         DataFrame: Dados sincronizados
@@ -59,7 +87,7 @@ def sincronizar_dados(df_accel, df_gyro):
         df_gyro, 
         on='timestamp', 
         direction='nearest',
-        tolerance=pd.Timedelta(seconds=0.1)
+        tolerance=pd.Timedelta(seconds=tolerancia)
     )
     
     # Remover linhas com valores NaN
@@ -67,110 +95,117 @@ def sincronizar_dados(df_accel, df_gyro):
     
     return df_combined
 
-def calcular_features_janela(df, window_size=10): #botar janela para 7 
+def calcular_features_janela(df, window_size=10, frequencia=None, bandas=None, nomes=None,
+                             filtros=None): #botar janela para 7 
     """
     Calcula features baseadas em janelas temporais SEM sobreposição.
-    Para cada janela, calcula:
+    Por padrão (FEATURES), para cada janela:
     - Variação (desvio padrão) do acelerômetro (indica mudança de movimento - CHAVE!)
     - Magnitude média do acelerômetro (indica intensidade do movimento)
     - Variação (desvio padrão) do giroscópio (indica mudança de rotação)
     - Magnitude média do giroscópio (indica rotação)
+    Com `frequencia`, acrescenta depois dessas colunas a frequência dominante, a energia
+    por faixa e a entropia espectral de cada sensor (um único rfft sobre todas as janelas).
+    Qualquer outra combinação do registro (registro_features.py) pode ser pedida por nome.
     
     Args:
         df: DataFrame com dados sincronizados (deve ter colunas: x, y, z, gx, gy, gz)
         window_size: Tamanho da janela (número de pontos)
+        frequencia: Incluir as features espectrais; None usa FEATURES_FREQUENCIA
+        bandas: Faixas de frequência (Hz) da energia espectral; None usa o padrão do módulo
+        nomes: Lista de features por nome; None usa features_ativas(frequencia)
+        filtros: Estado do passa-alta das features dinâmicas entre chamadas (incremental.py)
     
     Returns:
-        tuple: (array de features, array de timestamps correspondentes)
+        tuple: (array float32 de features, array datetime64 de timestamps correspondentes)
     """
-    features = []
-    timestamps = []
-    
-    # Janelas SEM sobreposição (cada ponto pertence a apenas uma janela)
-    for i in range(0, len(df) - window_size + 1, window_size):  # Step = window_size (sem overlap)
-        window = df.iloc[i:i+window_size]
-        
-        # Magnitude do acelerômetro em cada ponto da janela
-        accel_mag = np.sqrt(window['x']**2 + window['y']**2 + window['z']**2)
-        
-        # Magnitude do giroscópio em cada ponto da janela
-        gyro_mag = np.sqrt(window['gx']**2 + window['gy']**2 + window['gz']**2)
-        
-        # Features estatísticas da janela (priorizar variação sobre magnitude)
-        feature_vector = [
-            accel_mag.std(),       # 1º: Variação do acelerômetro (MAIS IMPORTANTE!)
-            accel_mag.mean(),      # 2º: Magnitude média do acelerômetro
-            gyro_mag.std(),        # 3º: Variação do giroscópio
-            gyro_mag.mean()        # 4º: Magnitude média do giroscópio
-        ]
-        
-        features.append(feature_vector)
-        
-        # Timestamp médio da janela
-        ts_medio = window['timestamp'].iloc[len(window)//2]
-        timestamps.append(ts_medio)
-    
-    return np.array(features), np.array(timestamps)
+    return calcular_features(df, nomes or features_ativas(frequencia), window_size, bandas, filtros)
+
+def features_ativas(frequencia=None):
+    """Nomes das colunas calculadas com a configuração atual (FEATURES e FEATURES_FREQUENCIA)."""
+    nomes = list(FEATURES)
+    if FEATURES_FREQUENCIA if frequencia is None else frequencia:
+        nomes += nomes_features_frequencia()
+    return nomes
 
-def aplicar_kmeans(features, n_clusters=3):
+def aplicar_kmeans(features, n_clusters=3, backend=None, nomes=None):
     """
     Aplica K-means clustering nas features
     
     Args:
         features: Array de features (distâncias euclidianas)
         n_clusters: Número de clusters
+        backend: 'sklearn' (K-means em todas as features) ou '1d' (K-means ótimo exato só
+                 na std do acelerômetro); None usa BACKEND_KMEANS
+        nomes: Nomes das colunas de `features`; None usa features_ativas()
     
     Returns:
-        tuple: (modelo KMeans treinado, labels dos clusters, features normalizadas)
+        tuple: (modelo KMeans treinado, labels dos clusters, features normalizadas usadas
+                no ajuste: todas no 'sklearn', só a coluna da std do acelerômetro no '1d')
     """
+    backend = backend or BACKEND_KMEANS
+    
     # Normalizar features
     scaler = StandardScaler()
     features_normalized = scaler.fit_transform(features)
     
     # Aplicar K-means
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-    labels = kmeans.fit_predict(features_normalized)
+    if backend == '1d':
+        # Determinístico: dispensa random_state e n_init
+        coluna = indice_feature(nomes or features_ativas(), 'std_accel')
+        kmeans = KMeans1DOtimo(n_clusters=n_clusters, coluna=coluna)
+    elif backend == 'sklearn':
+        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=N_INIT_KMEANS,
+                        algorithm=ALGORITMO_KMEANS)
+    else:
+        raise ValueError(f"Backend de K-means desconhecido: {backend}")
+    labels = kmeans.fit_predict(features_normalized).astype(DTYPE_CODIGO)
+    if backend == '1d':
+        # As métricas de qualidade devem ver o mesmo espaço que o K-means viu
+        features_normalized = features_normalized[:, [coluna]]
     
     return kmeans, labels, features_normalized
 
-def map_clusters_to_movement(labels, features):
+def map_clusters_to_movement(labels, features, nomes=None, mostrar=True):
     """
-    Mapeia cada cluster para um rótulo de movimento baseado na VARIAÇÃO (std) do acelerômetro.
+    Mapeia cada cluster para um código de movimento baseado na VARIAÇÃO (std) do acelerômetro.
     A variação é o melhor indicador: parado tem variação baixa, movimento tem variação alta.
     
-    Retorna um dicionário {cluster_id: movimento_str} e um array de rótulos por ponto.
+    Os códigos são a posição do cluster na ordenação por variação (0 = parado) e os nomes
+    vêm da tabela única em `comum.rotulos`.
+    
+    `nomes` são os nomes das colunas de `features` (None usa features_ativas());
+    `mostrar=False` omite o [DEBUG] do mapeamento.
+    
+    Retorna um dicionário {cluster_id: codigo_movimento} e um array int8 de códigos por ponto.
     """
     unique_clusters = np.unique(labels)
-    cluster_mean_std = {}
     
-    # Usar a PRIMEIRA feature (std do acelerômetro) para ordenar - é o mais importante!
-    for c in unique_clusters:
-        cluster_mean_std[c] = features[labels == c, 0].mean()  # Feature 0 = std accel
+    # Usar a std do acelerômetro para ordenar - é o mais importante!
+    std_accel = features[:, indice_feature(nomes or features_ativas(), 'std_accel')]
+    soma_std = np.bincount(labels, weights=std_accel)
+    contagem = np.bincount(labels)
+    media_std = soma_std[unique_clusters] / contagem[unique_clusters]
     
     # Ordenar clusters por variação média (ascendente: menor variação = mais parado)
-    ordered = sorted(cluster_mean_std.items(), key=lambda x: x[1])
-    ordered_ids = [c for c, _ in ordered]
-    
-    # Rótulos para 3 clusters ordenados por variação (do menor para o maior)
-    movement_names_3 = [
-        'muito baixo movimento (parado)',  # Menor variação = parado/dormindo
-        'baixo movimento',                  # Variação média = movimento leve
-        'alto movimento'                    # Maior variação = movimento intenso
-    ]
-    
-    if len(ordered_ids) == 3:
-        assigned = {cid: movement_names_3[i] for i, cid in enumerate(ordered_ids)}
-    else:
-        # Gerar rótulos genéricos se não houver exatamente 3 clusters
-        assigned = {cid: f'movimento_{i}' for i, cid in enumerate(ordered_ids)}
+    ordem = np.argsort(media_std, kind='stable')
+    ordered_ids = unique_clusters[ordem]
+    
+    # Tabela de consulta cluster_id -> código de movimento
+    lut = np.zeros(int(unique_clusters.max()) + 1, dtype=DTYPE_CODIGO)
+    lut[ordered_ids] = np.arange(len(ordered_ids), dtype=DTYPE_CODIGO)
+    assigned = {int(cid): int(lut[cid]) for cid in ordered_ids}
     
-    labels_movement = np.array([assigned[c] for c in labels])
+    labels_movement = lut[labels]
+    
+    if not mostrar:
+        return assigned, labels_movement
     
     # Debug: mostrar como os clusters foram mapeados
+    nomes = tabela_movimento(len(ordered_ids))
     print("\n   [DEBUG] Mapeamento por variacao (std acelerometro):")
-    for i, (cid, std_val) in enumerate(ordered):
-        label = movement_names_3[i] if len(ordered_ids) == 3 else f'movimento_{i}'
-        print(f"      Cluster {cid} (std media: {std_val:.4f}) -> {label}")
+    for i, (cid, std_val) in enumerate(zip(ordered_ids, media_std[ordem])):
+        print(f"      Cluster {cid} (std media: {std_val:.4f}) -> {nomes[i]}")
     
     return assigned, labels_movement
 
@@ -182,26 +217,26 @@ def plotar_resultados(labels, pessoa_id, timestamps, cluster_name_map, movement_
         labels: Labels preditos pelo K-means
         pessoa_id: ID da pessoa
         timestamps: Array de timestamps
-        cluster_name_map: Dicionário mapeando cluster_id para nome do movimento
-        movement_labels: Array de rótulos de movimento por ponto
+        cluster_name_map: Dicionário mapeando cluster_id para código do movimento
+        movement_labels: Array int8 de códigos de movimento por ponto
     """
     fig = plt.figure(figsize=(16, 6))
     
     # Plot 1: Labels ao longo do tempo (usar timestamps formatados no eixo X)
     ax1 = plt.subplot(1, 2, 1)
     
-    # Definir cores por rótulo de movimento
-    palette = {
-        'muito baixo movimento (parado)': 'gray',
-        'baixo movimento': 'blue',
-        'alto movimento': 'red'
-    }
-    
-    # Fallback para rótulos genéricos
-    default_colors = ['tab:blue', 'tab:orange', 'tab:red', 'gray']
-    colors = [palette.get(m, default_colors[i % len(default_colors)]) for i, m in enumerate(movement_labels)]
+    # Cores e nomes por código de movimento (fallback para rótulos genéricos)
+    n_mov = len(cluster_name_map)
+    nomes = tabela_movimento(n_mov)
+    if n_mov == len(NOMES_MOVIMENTO):
+        palette = CORES_MOVIMENTO
+    else:
+        default_colors = np.array(['tab:blue', 'tab:orange', 'tab:red', 'gray'])
+        palette = default_colors[np.arange(n_mov) % len(default_colors)]
     
-    ax1.scatter(timestamps, movement_labels, c=colors, alpha=0.7, s=40)
+    ax1.scatter(timestamps, movement_labels, c=palette[movement_labels], alpha=0.7, s=40)
+    ax1.set_yticks(np.arange(n_mov))
+    ax1.set_yticklabels(nomes)
     ax1.set_xlabel('Hora (HH:MM:SS)', fontsize=12)
     ax1.set_ylabel('Rotulo de Movimento', fontsize=12)
     ax1.set_title(f'K-means Clustering - Pessoa {pessoa_id}\n(Baseado em variacao - sem sobreposicao de janelas)', fontsize=14)
@@ -213,16 +248,16 @@ def plotar_resultados(labels, pessoa_id, timestamps, cluster_name_map, movement_
     
     # Plot 2: Distribuição por rótulo de movimento
     ax2 = plt.subplot(1, 2, 2)
-    unique_mov, counts = np.unique(movement_labels, return_counts=True)
-    mov_colors = [palette.get(m, 'tab:blue') for m in unique_mov]
-    ax2.bar(unique_mov, counts, color=mov_colors, alpha=0.7)
+    counts = contar_codigos(movement_labels, n_mov)
+    presentes = np.flatnonzero(counts)
+    ax2.bar(nomes[presentes], counts[presentes], color=palette[presentes], alpha=0.7)
     ax2.set_xlabel('Rotulo de Movimento', fontsize=12)
     ax2.set_ylabel('Numero de Janelas', fontsize=12)
     ax2.set_title('Distribuicao por Rotulo de Movimento', fontsize=14)
     ax2.grid(True, alpha=0.3, axis='y')
     
     # Adicionar valores nas barras
-    for i, count in enumerate(counts):
+    for i, count in enumerate(counts[presentes]):
         ax2.text(i, count, str(count), ha='center', va='bottom', fontsize=11, fontweight='bold')
     
     plt.tight_layout()
@@ -232,13 +267,14 @@ def plotar_resultados(labels, pessoa_id, timestamps, cluster_name_map, movement_
     
     print(f"\n   [OK] Grafico salvo como '{output_path}'")
 
-def analisar_pessoa(pessoa_id, n_clusters=3):
+def analisar_pessoa(pessoa_id, n_clusters=3, dados=None):
     """
     Análise completa de clusterização para uma pessoa usando distância euclidiana
     
     Args:
         pessoa_id: ID da pessoa
         n_clusters: Número de clusters
+        dados: (df_accel, df_gyro) já carregados (None lê os CSVs da pessoa)
     """
     print(f"\n{'='*60}")
     print(f"ANALISE - PESSOA {pessoa_id}")
@@ -246,27 +282,37 @@ def analisar_pessoa(pessoa_id, n_clusters=3):
     
     # 1. Carregar dados
     print("\n[1/5] Carregando dados (downsampled)...")
-    df_accel, df_gyro = carregar_dados_pessoa_downsampled(pessoa_id)
+    df_accel, df_gyro = dados if dados is not None else carregar_dados_pessoa_downsampled(pessoa_id)
     print(f"   [OK] Acelerometro: {len(df_accel)} pontos")
     print(f"   [OK] Giroscopio: {len(df_gyro)} pontos")
     
     # 2. Sincronizar dados
     print("\n[2/5] Sincronizando dados de acelerometro e giroscopio...")
-    df_combined = sincronizar_dados(df_accel, df_gyro)
-    print(f"   [OK] Dados sincronizados: {len(df_combined)} pontos")
+    tolerancia = tolerancia_sincronizacao(pessoa_id)
+    df_combined = sincronizar_dados(df_accel, df_gyro, tolerancia)
+    print(f"   [OK] Dados sincronizados: {len(df_combined)} pontos (tolerancia {tolerancia:g} s)")
     
     # 3. Calcular features baseadas em janelas temporais
     print(f"\n[3/5] Calculando features em janelas temporais (SEM sobreposicao)...")
-    features, timestamps = calcular_features_janela(df_combined, window_size=10)
+    features, timestamps = calcular_features_janela(df_combined, window_size=WINDOW_SIZE)
     print(f"   [OK] {len(features)} janelas processadas (cada janela e unica)")
-    print(f"   [OK] Features por janela: 4 (std_accel, mag_accel, std_gyro, mag_gyro)")
-    print(f"   [OK] Variacao acelerometro media: {features[:, 0].mean():.4f} (feature principal)")
+    nomes_features = features_ativas()
+    coluna = {nome: features[:, indice_feature(nomes_features, nome)]
+              for nome in DESCRICAO_ESTATISTICAS if nome in nomes_features}
+    print(f"   [OK] Features por janela: {features.shape[1]} ({', '.join(nomes_features)})")
+    print(f"   [OK] Variacao acelerometro media: {coluna['std_accel'].mean():.4f} (feature principal)")
     
     # 4. Aplicar K-means
     print(f"\n[4/5] Aplicando K-means (k={n_clusters})...")
     kmeans, labels, features_normalized = aplicar_kmeans(features, n_clusters)
     print(f"   [OK] Clustering concluido")
     print(f"   [OK] Inercia: {kmeans.inertia_:.2f}")
+    qualidade = metricas_qualidade(features_normalized, labels)
+    print(f"   [OK] Silhueta ({qualidade['n_replicas']} amostras de {qualidade['n_amostra']}): "
+          f"{qualidade['silhueta']:.3f} "
+          f"[IC95% {qualidade['ic_inf']:.3f} a {qualidade['ic_sup']:.3f}]")
+    print(f"   [OK] Davies-Bouldin: {qualidade['davies_bouldin']:.3f} | "
+          f"Calinski-Harabasz: {qualidade['calinski_harabasz']:.1f}")
     
     # 5. Plotar resultados
     print("\n[5/5] Gerando visualizacao e rotulando clusters por movimento...")
@@ -280,32 +326,67 @@ def analisar_pessoa(pessoa_id, n_clusters=3):
     
     # Mostrar mapeamento de clusters
     print("\nAnalise detalhada dos clusters:")
-    for cluster_id, movimento in cluster_map.items():
+    nomes = tabela_movimento(len(cluster_map))
+    for cluster_id, codigo in cluster_map.items():
+        movimento = nomes[codigo]
         mask = labels == cluster_id
         count = mask.sum()
-        std_accel_media = features[mask, 0].mean()     # Feature 0: variação acelerômetro
-        mag_accel_media = features[mask, 1].mean()     # Feature 1: magnitude acelerômetro
-        std_gyro_media = features[mask, 2].mean()      # Feature 2: variação giroscópio
         percentage = (count / len(labels)) * 100
         print(f"\n  Cluster {cluster_id} -> {movimento}")
         print(f"     Janelas: {count} ({percentage:.1f}%)")
-        print(f"     Variacao acelerometro: {std_accel_media:.4f} (criterio principal)")
-        print(f"     Magnitude acelerometro: {mag_accel_media:.4f}")
-        print(f"     Variacao giroscopio: {std_gyro_media:.4f}")
+        for nome, valores in coluna.items():
+            print(f"     {DESCRICAO_ESTATISTICAS[nome]}: {valores[mask].mean():.4f}")
     
     return df_combined, features, labels, kmeans, timestamps, movement_labels
 
-def analisar_todas_pessoas(n_clusters=3):
+def varrer_k(pessoa_id, ks=K_VARREDURA, backend=None):
+    """
+    Inércia e métricas de qualidade para vários valores de k na mesma pessoa
+    
+    As features são calculadas uma vez; cada k custa só o K-means e as métricas
+    (silhueta amostrada, Davies-Bouldin e Calinski-Harabasz, todas de custo limitado).
+    
+    Returns:
+        DataFrame: uma linha por k
+    """
+    df_accel, df_gyro = carregar_dados_pessoa_downsampled(pessoa_id)
+    df_combined = sincronizar_dados(df_accel, df_gyro, tolerancia_sincronizacao(pessoa_id))
+    features, _ = calcular_features_janela(df_combined, window_size=WINDOW_SIZE)
+    
+    linhas = []
+    for k in ks:
+        kmeans, labels, features_normalized = aplicar_kmeans(features, k, backend)
+        linha = {'k': k, 'inercia': kmeans.inertia_}
+        linha.update(metricas_qualidade(features_normalized, labels))
+        linhas.append(linha)
+    return pd.DataFrame(linhas)
+
+def analisar_todas_pessoas(n_clusters=3, diretorio_resultados=DIR_RESULTADOS, execucao=None):
     """
     Análise de clusterização para todas as pessoas (11 a 38)
     
+    Os rótulos por janela e o resumo de cada pessoa são gravados em disco assim que
+    ela termina; em memória ficam só as contagens usadas na distribuição geral.
+    As janelas (limites, features, cluster e código) também vão para o armazém
+    colunar da execução (comum/armazem_resultados.py). Os CSVs da próxima pessoa
+    são lidos enquanto a atual é processada.
+    
     Args:
         n_clusters: Número de clusters
+        diretorio_resultados: Pasta onde os resultados por pessoa são gravados
+        execucao: Nome da execução no armazém (None cria um a partir da data/hora)
+    
+    Returns:
+        GravadorResultados: agregados da execução e caminhos dos arquivos gravados
     """
     # IDs das pessoas disponíveis (downsampled)
     pessoas = list(range(11, 39))
     
-    resultados = []
+    armazem = ArmazemResultados(execucao, features_ativas(), {
+        'n_clusters': n_clusters, 'window_size': WINDOW_SIZE, 'backend': BACKEND_KMEANS,
+        'n_init': N_INIT_KMEANS, 'algoritmo': ALGORITMO_KMEANS, 'dados': 'Downsampling_data (2x)',
+    })
+    gravador = GravadorResultados(diretorio_resultados, n_clusters, armazem)
     sucessos = 0
     erros = 0
     
@@ -313,20 +394,18 @@ def analisar_todas_pessoas(n_clusters=3):
     print("ANALISE DE TODAS AS PESSOAS (DOWNSAMPLED)")
     print("="*60)
     
-    for pessoa_id in pessoas:
+    # A próxima pessoa é lida enquanto a atual é processada
+    for pessoa_id, obter_dados in carregar_pessoas(pessoas, '2x', leitor=ler_sensor_downsampled):
         try:
             df_combined, features, labels, kmeans, timestamps, movimento = analisar_pessoa(
-                pessoa_id, n_clusters
+                pessoa_id, n_clusters, obter_dados()
             )
-            resultados.append({
-                'pessoa_id': pessoa_id,
-                'data': df_combined,
-                'features': features,
-                'labels': labels,
-                'kmeans': kmeans,
-                'timestamps': timestamps,
-                'movimento': movimento
-            })
+            std_accel = features[:, indice_feature(features_ativas(), 'std_accel')]
+            inicios, fins = limites_janelas(df_combined, WINDOW_SIZE)
+            gravador.gravar_pessoa(pessoa_id, timestamps, labels, movimento, std_accel,
+                                   features, inicios, fins)
+            # Liberar os dados da pessoa (só a próxima fica carregada)
+            del df_combined, features, labels, kmeans, timestamps, movimento
             sucessos += 1
         except Exception as e:
             print(f"\n[ERRO] Erro ao processar pessoa {pessoa_id}: {e}")
@@ -337,30 +416,16 @@ def analisar_todas_pessoas(n_clusters=3):
     print("\n" + "="*60)
     print("ESTATISTICAS FINAIS")
     print("="*60)
-    print(f"Total de pessoas processadas: {len(resultados)}/28")
+    print(f"Total de pessoas processadas: {gravador.n_pessoas}/{len(pessoas)}")
     print(f"Pessoas com sucesso: {sucessos}")
     print(f"Pessoas com erro: {erros}")
     
-    if resultados:
-        # Calcular distribuição geral
-        dist_geral = {
-            'muito baixo movimento (parado)': 0,
-            'baixo movimento': 0,
-            'alto movimento': 0
-        }
-        
-        total_janelas = 0
-        for r in resultados:
-            movimento = r['movimento']
-            unique, counts = np.unique(movimento, return_counts=True)
-            for mov, count in zip(unique, counts):
-                if mov in dist_geral:
-                    dist_geral[mov] += count
-                total_janelas += count
-        
-        # Normalizar distribuição
-        for k in dist_geral:
-            dist_geral[k] = dist_geral[k] / total_janelas if total_janelas > 0 else 0
+    if gravador.n_pessoas:
+        # Distribuição geral a partir das contagens acumuladas por código
+        fracoes = gravador.distribuicao()
+        dist_geral = {nome: 0 for nome in NOMES_MOVIMENTO}
+        if n_clusters == len(NOMES_MOVIMENTO):
+            dist_geral.update(zip(NOMES_MOVIMENTO, fracoes))
         
         print("\nDISTRIBUICAO GERAL DOS CLUSTERS:")
         print(f"   [PARADO] Muito baixo movimento (parado): {dist_geral['muito baixo movimento (parado)']:.1%}")
@@ -371,21 +436,19 @@ def analisar_todas_pessoas(n_clusters=3):
         print("   - Menor variacao = 'parado' (deteccao de sono/inatividade)")
         print("   - Maior variacao = 'alto movimento'")
         
-        # Mostrar exemplos de valores de std
-        exemplo = resultados[0]
-        features = exemplo['features']
-        labels = exemplo['labels']
+        # Mostrar exemplos de valores de std (primeira pessoa gravada)
+        pessoa_exemplo, std_medio = gravador.exemplo
+        nomes = tabela_movimento(n_clusters)
         
-        print(f"\nEXEMPLO - Pessoa {exemplo['pessoa_id']} (valores de std_accel):")
-        for i in range(3):
-            mask = labels == i
-            if mask.any():
-                movimento = exemplo['movimento']
-                label = movimento[mask][0]
-                std_medio = features[mask, 0].mean()
-                print(f"   Cluster {i} ({label}): std_accel medio = {std_medio:.3f}")
-    
-    return resultados
+        print(f"\nEXEMPLO - Pessoa {pessoa_exemplo} (valores de std_accel):")
+        for codigo, std_val in enumerate(std_medio):
+            if not np.isnan(std_val):
+                print(f"   Codigo {codigo} ({nomes[codigo]}): std_accel medio = {std_val:.3f}")
+        
+        print(f"\nResultados por pessoa salvos em: {gravador.diretorio}/")
+        print(f"Armazem da execucao: {armazem.diretorio}/")
+    
+    return gravador
 
 if __name__ == "__main__":
     print("\n" + "="*60)
@@ -393,10 +456,21 @@ if __name__ == "__main__":
     print("="*60)
     print(f"Numero de clusters: {N_CLUSTERS}")
     print(f"Metodo: Janelas temporais SEM sobreposicao")
-    print(f"Features: std_accel (principal), mag_accel, std_gyro, mag_gyro")
     print(f"Criterio: Variacao do acelerometro (detecta parado vs movimento)")
     print(f"Dados: Downsampled (50% dos pontos originais)")
     print(f"Tamanho da janela: 10 pontos (SEM overlap)")
+    if '--1d' in sys.argv:
+        BACKEND_KMEANS = '1d'
+    print(f"Backend K-means: {BACKEND_KMEANS}")
+    if '--freq' in sys.argv:
+        FEATURES_FREQUENCIA = True
+        print(f"Features espectrais: frequencia dominante, energia por faixa, entropia")
+    print(f"Features: {', '.join(features_ativas())} (std_accel e o criterio principal)")
+    
+    if '--varrer-k' in sys.argv:
+        print(f"\nVarredura de k para a pessoa {PESSOA_INICIAL}:")
+        print(varrer_k(PESSOA_INICIAL).to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+        sys.exit(0)
     
     # Opção: Processar todas as pessoas de uma vez
     print("\n" + "-"*60)
@@ -404,10 +478,10 @@ if __name__ == "__main__":
     print("-"*60)
     
     # Processar todas as pessoas (11 a 38)
-    resultados = analisar_todas_pessoas(n_clusters=N_CLUSTERS)
+    gravador = analisar_todas_pessoas(n_clusters=N_CLUSTERS)
     
     print("\n" + "="*60)
     print("ANALISE CONCLUIDA!")
     print("="*60)
-    print(f"Total de pessoas processadas: {len(resultados)}")
+    print(f"Total de pessoas processadas: {gravador.n_pessoas}")
     print(f"Graficos salvos em: outputs/ClusterK3_euclidiano_ComDownsampling_individual/")
@@ -2,13 +2,25 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from sklearn.cluster import KMeans
+from sklearn.decomposition import PCA
+from sklearn.metrics import adjusted_rand_score
 from sklearn.preprocessing import StandardScaler
 import os
+import sys
+import time
 from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from comum.dados import ler_par
 
 # Config
 SAMPLING_RATE = 0.5     # Taxa de amostragem em segundos (nao sabemos se é isso ainda)
 N_CLUSTERS = 3          # Número de clusters desejados
+PCA_VARIANCIA = None    # Ex.: 0.95 reduz as window_size × 6 dimensões antes do K-means (None = sem PCA)
+PCA_AMOSTRA = 20000     # Janelas usadas para ajustar o PCA (o resto só é projetado)
+PCA_MAX_COMPONENTES = 50
+COMPARAR_PCA = False    # Com PCA, roda também o K-means sem redução (dobra o custo; só para medir)
 
 PESSOA_INICIAL = 3      # Começar com a pessoa 3 (exemplo)
 
@@ -31,15 +43,20 @@ def carregar_dados_pessoa(pessoa_id):
     else:
         gyro_file = f'giroscopio/giroscopio_{pessoa_id}.txt'
     
-    # Carregar acelerômetro (CSV com cabeçalho)
-    df_accel = pd.read_csv(accel_file)
-    df_accel['timestamp'] = pd.to_datetime(df_accel['timestamp'])
-    
-    # Carregar giroscópio (TXT sem cabeçalho)
-    df_gyro = pd.read_csv(gyro_file, header=None, names=['timestamp', 'gx', 'gy', 'gz'])
-    df_gyro['timestamp'] = pd.to_datetime(df_gyro['timestamp'])
-    
-    return df_accel, df_gyro
+    # Os dois arquivos são lidos ao mesmo tempo (comum/dados.py)
+    return ler_par(accel_file, gyro_file, leitor=_ler_accel, leitor_gyro=_ler_gyro)
+
+def _ler_accel(arquivo):
+    # Acelerômetro: CSV com cabeçalho
+    df = pd.read_csv(arquivo)
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    return df
+
+def _ler_gyro(arquivo):
+    # Giroscópio: TXT sem cabeçalho
+    df = pd.read_csv(arquivo, header=None, names=['timestamp', 'gx', 'gy', 'gz'])
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    return df
 
 def sincronizar_dados(df_accel, df_gyro, sampling_rate=0.5):
     """
@@ -108,26 +125,77 @@ def criar_features_janela(df, window_size=2):
     
     return np.array(features_list), np.array(timestamps_list)
 
-def aplicar_kmeans(features, n_clusters=2):
+def reduzir_pca(features_normalized, variancia, n_amostra=PCA_AMOSTRA, max_componentes=PCA_MAX_COMPONENTES):
+    """
+    PCA randomizado ajustado em uma amostra das janelas, com o menor número de
+    componentes que explica a fração `variancia` da variância total.
+    
+    Returns:
+        tuple: (features projetadas, número de componentes, variância explicada)
+    """
+    rng = np.random.default_rng(42)
+    amostra = features_normalized
+    if len(amostra) > n_amostra:
+        amostra = amostra[rng.choice(len(amostra), n_amostra, replace=False)]
+    
+    n_max = min(max_componentes, *amostra.shape)
+    pca = PCA(n_components=n_max, svd_solver='randomized', random_state=42).fit(amostra)
+    # Fração sobre a variância total da amostra (não só das componentes calculadas)
+    acumulada = np.cumsum(pca.explained_variance_) / amostra.var(axis=0, ddof=1).sum()
+    n_componentes = min(int(np.searchsorted(acumulada, variancia)) + 1, n_max)
+    
+    reduzidas = (features_normalized - pca.mean_) @ pca.components_[:n_componentes].T
+    return reduzidas, n_componentes, float(acumulada[n_componentes - 1])
+
+def aplicar_kmeans(features, n_clusters=2, variancia_pca=None, comparar=False):
     """
     Aplica K-means clustering nas features
     
     Args:
         features: Array de features
         n_clusters: Número de clusters
+        variancia_pca: Fração da variância mantida pelo PCA entre o StandardScaler e o
+                       K-means; None usa PCA_VARIANCIA (None = sem redução)
+        comparar: Com PCA, roda também o K-means sem redução e mostra o tempo
+                  economizado e a concordância dos rótulos (ARI)
     
     Returns:
-        tuple: (modelo KMeans treinado, labels dos clusters, features normalizadas)
+        tuple: (modelo KMeans treinado, labels dos clusters, features usadas no K-means
+                (normalizadas e, com PCA, reduzidas))
     """
+    variancia_pca = variancia_pca or PCA_VARIANCIA
+    
     # Normalizar features
     scaler = StandardScaler()
     features_normalized = scaler.fit_transform(features)
     
-    # Aplicar K-means
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-    labels = kmeans.fit_predict(features_normalized)
+    if not variancia_pca:
+        # Aplicar K-means
+        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
+        labels = kmeans.fit_predict(features_normalized)
+        return kmeans, labels, features_normalized
     
-    return kmeans, labels, features_normalized
+    inicio = time.perf_counter()
+    reduzidas, n_componentes, explicada = reduzir_pca(features_normalized, variancia_pca)
+    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
+    labels = kmeans.fit_predict(reduzidas)
+    t_reduzido = time.perf_counter() - inicio
+    print(f"   ✓ PCA: {features_normalized.shape[1]} -> {n_componentes} dimensões "
+          f"({explicada:.1%} da variância)")
+    if explicada < variancia_pca:
+        print(f"   ⚠ Alvo de {variancia_pca:.0%} não atingido com PCA_MAX_COMPONENTES={PCA_MAX_COMPONENTES}")
+    
+    if comparar:
+        inicio = time.perf_counter()
+        labels_completo = KMeans(n_clusters=n_clusters, random_state=42, n_init=10).fit_predict(
+            features_normalized)
+        t_completo = time.perf_counter() - inicio
+        print(f"   ✓ Tempo PCA + K-means: {t_reduzido:.2f} s | sem PCA: {t_completo:.2f} s "
+              f"(economia de {t_completo - t_reduzido:.2f} s)")
+        print(f"   ✓ Concordância com o ajuste sem PCA (ARI): "
+              f"{adjusted_rand_score(labels_completo, labels):.3f}")
+    
+    return kmeans, labels, reduzidas
 
 
 def _mean_accel_magnitude_per_window(features, window_size):
@@ -229,7 +297,7 @@ def plotar_resultados(labels, pessoa_id, timestamps, cluster_name_map, movement_
 
     print(f"\n✓ Gráfico salvo como 'clustering_pessoa_{pessoa_id}.png'")
 
-def analisar_pessoa(pessoa_id, window_size=2, n_clusters=2):
+def analisar_pessoa(pessoa_id, window_size=2, n_clusters=2, comparar=None):
     """
     Análise completa de clusterização para uma pessoa
     
@@ -237,6 +305,7 @@ def analisar_pessoa(pessoa_id, window_size=2, n_clusters=2):
         pessoa_id: ID da pessoa
         window_size: Número de pontos por janela
         n_clusters: Número de clusters
+        comparar: Comparar com o K-means sem PCA (ver aplicar_kmeans); None usa COMPARAR_PCA
     """
     print(f"\n{'='*60}")
     print(f"ANÁLISE - PESSOA {pessoa_id}")
@@ -262,7 +331,8 @@ def analisar_pessoa(pessoa_id, window_size=2, n_clusters=2):
     
     # 4. Aplicar K-means
     print(f"\n[4/5] Aplicando K-means (k={n_clusters})...")
-    kmeans, labels, features_normalized = aplicar_kmeans(features, n_clusters)
+    comparar = COMPARAR_PCA if comparar is None else comparar
+    kmeans, labels, features_normalized = aplicar_kmeans(features, n_clusters, comparar=comparar)
     print(f"   ✓ Clustering concluído")
     print(f"   ✓ Inércia: {kmeans.inertia_:.2f}")
     
@@ -330,6 +400,11 @@ if __name__ == "__main__":
     print(f"Taxa de amostragem: {SAMPLING_RATE}s")
     print(f"Número de clusters: {N_CLUSTERS}")
     print(f"Tamanho da janela: 2 pontos (acelerômetro + giroscópio)")
+    if '--pca' in sys.argv:
+        PCA_VARIANCIA = 0.95
+    if '--comparar-pca' in sys.argv:
+        COMPARAR_PCA = True
+    print(f"PCA antes do K-means: {PCA_VARIANCIA or 'desativado'}")
     
     # Opção 1: Analisar apenas uma pessoa (recomendado para começar)
     print("\n" + "-"*60)
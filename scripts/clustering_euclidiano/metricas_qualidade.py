@@ -0,0 +1,144 @@
+"""
+Métricas de qualidade dos clusters com custo limitado, qualquer que seja o tamanho da gravação.
+
+- Silhueta: O(n²) na forma exata, então é estimada em N_REPLICAS amostras
+  estratificadas independentes (tamanho fixo). O intervalo de confiança vem da
+  dispersão entre as réplicas: inclui o efeito de cada silhueta ser calculada contra
+  a própria amostra, que o erro padrão de uma única amostra ignora.
+- Davies-Bouldin e Calinski-Harabasz: O(n·k) a partir dos centróides, percorrendo
+  as janelas em blocos (memória limitada ao tamanho do bloco).
+"""
+
+import numpy as np
+from scipy import stats
+from sklearn.metrics import silhouette_samples, silhouette_score
+
+N_AMOSTRA_SILHUETA = 1000   # Janelas por réplica da silhueta (custo ~ N_REPLICAS × N_AMOSTRA²)
+N_REPLICAS = 10             # Amostras independentes usadas na estimativa e no intervalo
+BLOCO = 1_000_000           # Linhas por bloco nas passadas O(n·k)
+
+
+def _centroides(X, labels, n_clusters):
+    """Contagem e centróide de cada cluster (bincount por coluna)."""
+    contagem = np.bincount(labels, minlength=n_clusters)
+    somas = np.stack([np.bincount(labels, weights=X[:, d], minlength=n_clusters)
+                      for d in range(X.shape[1])], axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return contagem, somas / contagem[:, None]
+
+
+def _distancias_ao_centroide(X, labels, centroides, bloco=BLOCO):
+    """Distância de cada janela ao centróide do próprio cluster, calculada em blocos."""
+    dist = np.empty(len(X))
+    for i in range(0, len(X), bloco):
+        diff = X[i:i + bloco] - centroides[labels[i:i + bloco]]
+        dist[i:i + bloco] = np.sqrt(np.einsum('ij,ij->i', diff, diff))
+    return dist
+
+
+def davies_bouldin(X, labels, n_clusters=None):
+    """Índice de Davies-Bouldin (menor = clusters mais compactos e separados)."""
+    X = np.asarray(X, dtype=np.float64)
+    labels = np.asarray(labels, dtype=np.int64)
+    n_clusters = n_clusters or int(labels.max()) + 1
+    contagem, centroides = _centroides(X, labels, n_clusters)
+    presentes = contagem > 0
+    if presentes.sum() < 2:
+        return np.nan
+
+    dist = _distancias_ao_centroide(X, labels, centroides)
+    espalhamento = np.bincount(labels, weights=dist, minlength=n_clusters)[presentes] / contagem[presentes]
+    c = centroides[presentes]
+    separacao = np.sqrt(((c[:, None, :] - c[None, :, :]) ** 2).sum(axis=2))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        razao = (espalhamento[:, None] + espalhamento[None, :]) / separacao
+    np.fill_diagonal(razao, -np.inf)
+    return float(np.nanmax(razao, axis=1).mean())
+
+
+def calinski_harabasz(X, labels, n_clusters=None):
+    """Índice de Calinski-Harabasz (maior = melhor separação entre clusters)."""
+    X = np.asarray(X, dtype=np.float64)
+    labels = np.asarray(labels, dtype=np.int64)
+    n_clusters = n_clusters or int(labels.max()) + 1
+    contagem, centroides = _centroides(X, labels, n_clusters)
+    presentes = contagem > 0
+    k, n = int(presentes.sum()), len(X)
+    if k < 2 or n <= k:
+        return np.nan
+
+    media = X.mean(axis=0)
+    entre = (contagem[presentes] * ((centroides[presentes] - media) ** 2).sum(axis=1)).sum()
+    dentro = (_distancias_ao_centroide(X, labels, centroides) ** 2).sum()
+    return float((entre / (k - 1)) / (dentro / (n - k)))
+
+
+def amostra_estratificada(labels, n_amostra, rng):
+    """
+    Índices de uma amostra estratificada por cluster (alocação proporcional, mínimo 2
+    por cluster para a silhueta ser definida).
+    """
+    clusters, contagem = np.unique(labels, return_counts=True)
+    alvo = np.maximum(np.round(n_amostra * contagem / len(labels)).astype(np.int64), 2)
+    alvo = np.minimum(alvo, contagem)
+    indices = [rng.choice(np.flatnonzero(labels == c), size=m, replace=False)
+               for c, m in zip(clusters, alvo)]
+    return np.concatenate(indices), clusters, contagem, alvo
+
+
+def _silhueta_estratificada(X, labels, n_amostra, rng):
+    """Silhueta média de uma amostra estratificada, com cada estrato ponderado pelo tamanho do cluster."""
+    indices, clusters, contagem, _ = amostra_estratificada(labels, n_amostra, rng)
+    valores = silhouette_samples(X[indices], labels[indices])
+    rotulos_amostra = labels[indices]
+    medias = np.array([valores[rotulos_amostra == c].mean() for c in clusters])
+    return float((contagem / contagem.sum() * medias).sum()), len(indices)
+
+
+def silhueta_amostrada(X, labels, n_amostra=N_AMOSTRA_SILHUETA, n_replicas=N_REPLICAS,
+                       confianca=0.95, random_state=42):
+    """
+    Silhueta média estimada em `n_replicas` amostras estratificadas independentes.
+
+    A estimativa é a média das réplicas e o intervalo usa t de Student sobre a
+    dispersão entre elas. Se `n_amostra` cobre todas as janelas, devolve a silhueta
+    exata (intervalo de largura zero).
+
+    Returns:
+        dict: silhueta (estimativa), ic_inf/ic_sup (intervalo de confiança), n_amostra
+              (janelas por réplica) e n_replicas
+    """
+    labels = np.asarray(labels)
+    if len(np.unique(labels)) < 2:
+        return {'silhueta': np.nan, 'ic_inf': np.nan, 'ic_sup': np.nan, 'n_amostra': 0,
+                'n_replicas': 0}
+
+    X = np.asarray(X)
+    if len(labels) <= n_amostra:
+        # A amostra seria a população inteira: valor exato, sem réplicas
+        exata = float(silhouette_score(X, labels))
+        return {'silhueta': exata, 'ic_inf': exata, 'ic_sup': exata, 'n_amostra': len(labels),
+                'n_replicas': 1}
+
+    rng = np.random.default_rng(random_state)
+    replicas = [_silhueta_estratificada(X, labels, n_amostra, rng) for _ in range(max(2, n_replicas))]
+    estimativas = np.array([r[0] for r in replicas])
+
+    estimativa = float(estimativas.mean())
+    erro_padrao = estimativas.std(ddof=1) / np.sqrt(len(estimativas))
+    t = stats.t.ppf(0.5 + confianca / 2, len(estimativas) - 1)
+    return {'silhueta': estimativa, 'ic_inf': float(estimativa - t * erro_padrao),
+            'ic_sup': float(estimativa + t * erro_padrao), 'n_amostra': replicas[0][1],
+            'n_replicas': len(estimativas)}
+
+
+def metricas_qualidade(X, labels, n_amostra=N_AMOSTRA_SILHUETA, random_state=42):
+    """
+    Silhueta amostrada (com IC), Davies-Bouldin e Calinski-Harabasz em um dicionário.
+
+    `X` deve ser a matriz em que o K-means foi ajustado (a que `aplicar_kmeans` devolve).
+    """
+    resultado = silhueta_amostrada(X, labels, n_amostra, random_state=random_state)
+    resultado['davies_bouldin'] = davies_bouldin(X, labels)
+    resultado['calinski_harabasz'] = calinski_harabasz(X, labels)
+    return resultado
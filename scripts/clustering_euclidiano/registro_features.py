@@ -0,0 +1,194 @@
+"""
+Registro de features por janela, declaradas por nome.
+
+Cada feature é uma função (janelas, sensor) registrada com `registrar`; a classe
+`JanelasSensores` guarda os intermediários compartilhados (eixos remodelados,
+magnitudes, diferenças, janelas ordenadas, espectro) e calcula cada um só uma vez,
+então qualquer conjunto de features custa uma passada sobre os dados.
+
+As features "dinâmicas" do acelerômetro passam os eixos pelo passa-alta de
+comum/filtros.py (sem a gravidade). O filtro é causal e guarda estado: quem processa
+os dados em pedaços (incremental.py) passa os mesmos `filtros` a cada chamada e obtém
+o mesmo resultado que numa passada só.
+
+Nomes disponíveis (sensor = accel ou gyro, eixo = x, y ou z):
+    std_<sensor>, mag_<sensor>            desvio e média da magnitude (as 4 features originais)
+    p10_<sensor>, p50_<sensor>, p90_<sensor>   percentis da magnitude
+    jerk_<sensor>                         média de |d magnitude / dt|
+    cruzamentos_<sensor>                  fração de cruzamentos pela média da janela
+    sma_<sensor>                          signal magnitude area (média de |x| + |y| + |z|)
+    std_accel_dinamico, mag_accel_dinamico   desvio e média da magnitude sem a gravidade
+    media_<sensor>_<eixo>, std_<sensor>_<eixo>
+    freq_dom_<sensor>, energia_b<i>_<sensor>, entropia_espectral_<sensor>   (features_frequencia.py)
+"""
+
+import numpy as np
+
+from comum.filtros import FiltroPassaAlta
+from comum.rotulos import DTYPE_SENSOR
+from features_frequencia import (
+    BANDAS_HZ, N_BANDAS, bandas_padrao, espectro_janelas, features_espectrais, taxa_amostragem
+)
+
+FEATURES_PADRAO = ('std_accel', 'mag_accel', 'std_gyro', 'mag_gyro')
+SENSORES = {'accel': ['x', 'y', 'z'], 'gyro': ['gx', 'gy', 'gz']}
+EIXOS = ('x', 'y', 'z')
+PERCENTIS = (10, 50, 90)
+
+REGISTRO = {}
+
+
+def registrar(nome, funcao, sensor):
+    """Registra `funcao(janelas, sensor)` sob `nome`."""
+    REGISTRO[nome] = (funcao, sensor)
+
+
+class JanelasSensores:
+    """
+    Janelas SEM sobreposição dos dois sensores e os intermediários compartilhados entre features.
+
+    Args:
+        df: DataFrame sincronizado (timestamp, x, y, z, gx, gy, gz)
+        window_size: Tamanho da janela (número de pontos)
+        bandas: Faixas (Hz) das features de energia espectral; None usa o padrão
+        filtros: dict sensor -> FiltroPassaAlta das features dinâmicas; os que faltarem são
+                 criados e acrescentados ao dict (o chamador fica com o estado ao final)
+    """
+
+    def __init__(self, df, window_size, bandas=None, filtros=None):
+        # Descartar a sobra do final e remodelar para (n_janelas, window_size, 3)
+        self.n_janelas = len(df) // window_size
+        self.window_size = window_size
+        self.n_pontos = self.n_janelas * window_size
+        self.df = df
+        self.bandas = bandas
+        self.filtros = {} if filtros is None else filtros
+        self._cache = {}
+
+    def _memo(self, chave, calcular):
+        if chave not in self._cache:
+            self._cache[chave] = calcular()
+        return self._cache[chave]
+
+    @property
+    def timestamps(self):
+        """Timestamp do ponto central de cada janela."""
+        return self.df['timestamp'].to_numpy()[self.window_size // 2:self.n_pontos:self.window_size]
+
+    @property
+    def fs(self):
+        return self._memo('fs', lambda: taxa_amostragem(self.df['timestamp']))
+
+    def eixos(self, sensor):
+        """Array (n_janelas, window_size, 3) do sensor."""
+        return self._memo(('eixos', sensor), lambda: self.df[SENSORES[sensor]].to_numpy(
+            dtype=DTYPE_SENSOR)[:self.n_pontos].reshape(self.n_janelas, self.window_size, 3))
+
+    def magnitude(self, sensor):
+        return self._memo(('magnitude', sensor),
+                          lambda: np.sqrt((self.eixos(sensor) ** 2).sum(axis=2)))
+
+    def magnitude_dinamica(self, sensor):
+        """Magnitude por janela depois do passa-alta (só as amostras das janelas completas)."""
+        def calcular():
+            filtro = self.filtros.setdefault(sensor, FiltroPassaAlta())
+            eixos = filtro.processar(self.eixos(sensor).reshape(self.n_pontos, 3))
+            return np.sqrt((eixos.reshape(self.n_janelas, self.window_size, 3) ** 2).sum(axis=2))
+        return self._memo(('magnitude_dinamica', sensor), calcular)
+
+    def diferencas(self, sensor):
+        return self._memo(('diferencas', sensor), lambda: np.diff(self.magnitude(sensor), axis=1))
+
+    def ordenadas(self, sensor):
+        return self._memo(('ordenadas', sensor), lambda: np.sort(self.magnitude(sensor), axis=1))
+
+    def espectrais(self, sensor):
+        """Frequência dominante, energia por faixa e entropia (colunas de features_espectrais)."""
+        def calcular():
+            bandas = self.bandas or BANDAS_HZ or bandas_padrao(self.fs)
+            if len(bandas) != N_BANDAS:
+                raise ValueError(f"São registradas {N_BANDAS} faixas de energia (recebidas {len(bandas)})")
+            frequencias, potencia = espectro_janelas(self.magnitude(sensor), self.fs)
+            return features_espectrais(frequencias, potencia, bandas, self.fs)
+        return self._memo(('espectrais', sensor), calcular)
+
+
+def _percentil(q):
+    def funcao(janelas, sensor):
+        # Interpolação linear nas janelas já ordenadas (mesmo resultado de np.percentile)
+        ordenadas = janelas.ordenadas(sensor)
+        posicao = q / 100 * (ordenadas.shape[1] - 1)
+        abaixo = int(np.floor(posicao))
+        acima = min(abaixo + 1, ordenadas.shape[1] - 1)
+        fracao = posicao - abaixo
+        return ordenadas[:, abaixo] * (1 - fracao) + ordenadas[:, acima] * fracao
+    return funcao
+
+
+def _cruzamentos(janelas, sensor):
+    magnitude = janelas.magnitude(sensor)
+    sinal = np.signbit(magnitude - magnitude.mean(axis=1, keepdims=True))
+    return (sinal[:, 1:] != sinal[:, :-1]).sum(axis=1) / max(janelas.window_size - 1, 1)
+
+
+def _eixo(estatistica, indice):
+    return lambda janelas, sensor: estatistica(janelas.eixos(sensor)[:, :, indice])
+
+
+def _coluna_espectral(indice):
+    return lambda janelas, sensor: janelas.espectrais(sensor)[:, indice]
+
+
+for _sensor in SENSORES:
+    registrar(f'std_{_sensor}', lambda j, s: j.magnitude(s).std(axis=1, ddof=1), _sensor)
+    registrar(f'mag_{_sensor}', lambda j, s: j.magnitude(s).mean(axis=1), _sensor)
+    for _q in PERCENTIS:
+        registrar(f'p{_q}_{_sensor}', _percentil(_q), _sensor)
+    registrar(f'jerk_{_sensor}', lambda j, s: np.abs(j.diferencas(s)).mean(axis=1) * j.fs, _sensor)
+    registrar(f'cruzamentos_{_sensor}', _cruzamentos, _sensor)
+    registrar(f'sma_{_sensor}', lambda j, s: np.abs(j.eixos(s)).sum(axis=2).mean(axis=1), _sensor)
+    for _i, _e in enumerate(EIXOS):
+        registrar(f'media_{_sensor}_{_e}', _eixo(lambda a: a.mean(axis=1), _i), _sensor)
+        registrar(f'std_{_sensor}_{_e}', _eixo(lambda a: a.std(axis=1, ddof=1), _i), _sensor)
+    registrar(f'freq_dom_{_sensor}', _coluna_espectral(0), _sensor)
+    for _b in range(N_BANDAS):
+        registrar(f'energia_b{_b}_{_sensor}', _coluna_espectral(1 + _b), _sensor)
+    registrar(f'entropia_espectral_{_sensor}', _coluna_espectral(1 + N_BANDAS), _sensor)
+
+registrar('std_accel_dinamico', lambda j, s: j.magnitude_dinamica(s).std(axis=1, ddof=1), 'accel')
+registrar('mag_accel_dinamico', lambda j, s: j.magnitude_dinamica(s).mean(axis=1), 'accel')
+
+
+def limites_janelas(df, window_size):
+    """Timestamps do primeiro e do último ponto de cada janela SEM sobreposição."""
+    n_pontos = (len(df) // window_size) * window_size
+    ts = df['timestamp'].to_numpy()
+    return ts[:n_pontos:window_size], ts[window_size - 1:n_pontos:window_size]
+
+
+def indice_feature(nomes, nome):
+    """Posição da feature `nome` na lista de colunas `nomes`."""
+    try:
+        return list(nomes).index(nome)
+    except ValueError:
+        raise ValueError(f"Feature '{nome}' não está entre as calculadas: {list(nomes)}") from None
+
+
+def calcular_features(df, nomes=FEATURES_PADRAO, window_size=10, bandas=None, filtros=None):
+    """
+    Calcula as features pedidas, por nome, em janelas SEM sobreposição.
+
+    `filtros` carrega o estado do passa-alta entre chamadas (ver JanelasSensores).
+
+    Returns:
+        tuple: (array float32 (n_janelas, len(nomes)), array datetime64 de timestamps)
+    """
+    desconhecidas = [n for n in nomes if n not in REGISTRO]
+    if desconhecidas:
+        raise ValueError(f"Features desconhecidas: {desconhecidas}")
+
+    janelas = JanelasSensores(df, window_size, bandas, filtros)
+    colunas = [REGISTRO[nome][0](janelas, REGISTRO[nome][1]) for nome in nomes]
+    if not colunas:
+        return np.zeros((janelas.n_janelas, 0), dtype=DTYPE_SENSOR), janelas.timestamps
+    return np.column_stack(colunas).astype(DTYPE_SENSOR), janelas.timestamps
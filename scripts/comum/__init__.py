@@ -0,0 +1,5 @@
+"""
+Módulos compartilhados entre os scripts de pré-processamento, separação e clustering.
+
+Os scripts em `scripts/<pasta>/` adicionam `scripts/` ao sys.path para importar daqui.
+"""
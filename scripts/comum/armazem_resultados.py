@@ -0,0 +1,193 @@
+"""
+Armazém colunar dos resultados por janela, uma pasta por execução do clustering.
+
+    outputs/resultados_clustering/execucoes/<execucao>/
+        metadados.json                  parâmetros da execução e nomes das features
+        pessoa_<id>/parte_0000.npz      colunas: inicio, meio, fim (datetime64[ns]),
+        pessoa_<id>/parte_0001.npz      cluster, movimento (int8) e uma por feature
+
+Particionado por pessoa e só com acréscimos: cada gravação cria uma nova parte, então
+execuções incrementais não reescrevem nada. O número da parte é reservado criando o
+temporário com open(..., 'xb'), então gravações simultâneas da mesma pessoa nunca
+disputam o mesmo nome. As partes são .npz sem compressão; a leitura carrega só as
+colunas pedidas, o que deixa consultas sobre a coorte inteira na casa dos
+milissegundos sem refazer o K-means.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DIR_EXECUCOES = Path('outputs/resultados_clustering/execucoes')
+COLUNAS_FIXAS = ('inicio', 'meio', 'fim', 'cluster', 'movimento')
+
+
+def novo_id_execucao():
+    return datetime.now().strftime('%Y%m%d_%H%M%S')
+
+
+def _criar_execucao(diretorio):
+    """
+    Pasta nova para uma execução sem nome: data/hora, com sufixo _2, _3... se outra
+    execução já criou a mesma no mesmo segundo (mkdir sem exist_ok é atômico).
+    """
+    diretorio.mkdir(parents=True, exist_ok=True)
+    base = nome = novo_id_execucao()
+    n = 1
+    while True:
+        try:
+            (diretorio / nome).mkdir()
+            return nome
+        except FileExistsError:
+            n += 1
+            nome = f'{base}_{n}'
+
+
+class ArmazemResultados:
+    """
+    Gravação das partes de uma execução.
+
+    Args:
+        execucao: Nome da execução (None cria uma nova, com nome a partir da data/hora);
+                  um nome existente acrescenta partes àquela execução
+        nomes_features: Nomes das colunas de features, na ordem do array gravado
+        metadados: Parâmetros da execução (n_clusters, backend, janela...)
+        diretorio: Pasta com todas as execuções
+    """
+
+    def __init__(self, execucao=None, nomes_features=(), metadados=None, diretorio=DIR_EXECUCOES):
+        self.execucao = execucao or _criar_execucao(Path(diretorio))
+        self.diretorio = Path(diretorio) / self.execucao
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        self.arquivo_metadados = self.diretorio / 'metadados.json'
+
+        if self.arquivo_metadados.exists():
+            self.metadados = ler_metadados(self.execucao, diretorio)
+        else:
+            self.metadados = {'execucao': self.execucao, 'criado_em': datetime.now().isoformat(),
+                              'features': list(nomes_features), **(metadados or {})}
+            # Temporário + os.replace: listar_execucoes nunca lê metadados pela metade
+            temporario = self.arquivo_metadados.with_suffix('.tmp')
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump(self.metadados, f, indent=1, default=str)
+            os.replace(temporario, self.arquivo_metadados)
+        self.nomes_features = self.metadados['features']
+
+    def anexar(self, pessoa_id, inicio, meio, fim, features, cluster, movimento):
+        """Grava uma nova parte com as janelas de uma pessoa."""
+        pasta = self.diretorio / f'pessoa_{pessoa_id}'
+        pasta.mkdir(exist_ok=True)
+
+        features = np.asarray(features)
+        if features.shape[1] != len(self.nomes_features):
+            raise ValueError(f"{features.shape[1]} colunas de features para "
+                             f"{len(self.nomes_features)} nomes nos metadados")
+        colunas = {
+            'inicio': np.asarray(inicio, dtype='datetime64[ns]'),
+            'meio': np.asarray(meio, dtype='datetime64[ns]'),
+            'fim': np.asarray(fim, dtype='datetime64[ns]'),
+            'cluster': np.asarray(cluster, dtype=np.int8),
+            'movimento': np.asarray(movimento, dtype=np.int8),
+        }
+        colunas.update({nome: features[:, i] for i, nome in enumerate(self.nomes_features)})
+
+        # Escrever em arquivo temporário e renomear: uma parte nunca fica pela metade
+        parte, f = _reservar_parte(pasta)
+        with f:
+            np.savez(f, **colunas)
+        os.replace(parte.with_suffix('.tmp'), parte)
+        return parte
+
+
+def _reservar_parte(pasta):
+    """
+    Próxima parte livre (maior índice existente + 1) e o temporário dela já aberto.
+
+    O temporário é criado com 'xb': se outra gravação reservou o mesmo índice, tenta o
+    seguinte. Um temporário que sumiu com a parte já no lugar também conta como ocupado.
+    """
+    indices = [int(p.name[len('parte_'):].split('.')[0]) for p in pasta.glob('parte_*.*')]
+    indice = max(indices, default=-1) + 1
+    while True:
+        parte = pasta / f'parte_{indice:04d}.npz'
+        try:
+            f = open(parte.with_suffix('.tmp'), 'xb')
+        except FileExistsError:
+            indice += 1
+            continue
+        if not parte.exists():
+            return parte, f
+        f.close()
+        os.remove(parte.with_suffix('.tmp'))
+        indice += 1
+
+
+def listar_execucoes(diretorio=DIR_EXECUCOES):
+    """
+    Execuções gravadas, da mais antiga para a mais recente.
+
+    A ordem vem de 'criado_em' nos metadados, não do nome: execuções com nome escolhido
+    (ex.: 'teste') não passam à frente das nomeadas por data/hora.
+    """
+    diretorio = Path(diretorio)
+    if not diretorio.exists():
+        return []
+    execucoes = []
+    for pasta in diretorio.iterdir():
+        arquivo = pasta / 'metadados.json'
+        if arquivo.exists():
+            with open(arquivo, encoding='utf-8') as f:
+                execucoes.append((json.load(f).get('criado_em', ''), pasta.name))
+    return [nome for _, nome in sorted(execucoes)]
+
+
+def ler_metadados(execucao=None, diretorio=DIR_EXECUCOES):
+    execucao = execucao or listar_execucoes(diretorio)[-1]
+    with open(Path(diretorio) / execucao / 'metadados.json', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def ler_resultados(execucao=None, pessoas=None, colunas=None, diretorio=DIR_EXECUCOES):
+    """
+    Janelas de uma execução como DataFrame (uma linha por janela, com pessoa_id).
+
+    Args:
+        execucao: Nome da execução; None usa a mais recente
+        pessoas: IDs a ler; None lê todas
+        colunas: Colunas a carregar (None = todas); as outras nem são lidas do disco.
+                 'pessoa_id' sempre vem (não é gravada nas partes)
+    """
+    execucoes = listar_execucoes(diretorio)
+    if not execucoes:
+        raise FileNotFoundError(f"Nenhuma execução em {diretorio}")
+    pasta = Path(diretorio) / (execucao or execucoes[-1])
+
+    if pessoas is None:
+        pastas = sorted(pasta.glob('pessoa_*'), key=lambda p: int(p.name.split('_')[1]))
+    else:
+        pastas = [pasta / f'pessoa_{pid}' for pid in pessoas]
+
+    if colunas is not None:
+        colunas = [nome for nome in colunas if nome != 'pessoa_id']
+
+    blocos = []
+    for pasta_pessoa in pastas:
+        pessoa_id = int(pasta_pessoa.name.split('_')[1])
+        for parte in sorted(pasta_pessoa.glob('parte_*.npz')):
+            with np.load(parte) as dados:
+                nomes = dados.files if colunas is None else colunas
+                faltando = [nome for nome in nomes if nome not in dados.files]
+                if faltando:
+                    raise ValueError(f"Colunas inexistentes: {faltando} (disponíveis: "
+                                     f"{['pessoa_id', *dados.files]})")
+                bloco = {nome: dados[nome] for nome in nomes}
+                n = len(dados['movimento'])     # int8: a coluna mais barata para contar janelas
+            blocos.append(pd.DataFrame({'pessoa_id': np.full(n, pessoa_id, dtype=np.int32), **bloco}))
+
+    if not blocos:
+        return pd.DataFrame(columns=['pessoa_id', *(COLUNAS_FIXAS if colunas is None else colunas)])
+    return pd.concat(blocos, ignore_index=True)
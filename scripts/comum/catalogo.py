@@ -0,0 +1,118 @@
+"""
+Catálogo dos arquivos de sensores (DATA/catalogo.json) com metadados por pessoa e sensor.
+
+Para cada CSV de cada dataset (raw/2x/10x) guarda: número de linhas, primeiro e
+último timestamp, intervalo mediano entre amostras, número de lacunas, tamanho,
+mtime e sha256. Com isso dá para escolher pessoas, pré-alocar arrays e planejar a
+leitura em blocos sem abrir os CSVs.
+
+A varredura roda em paralelo e é incremental: arquivos com o mesmo tamanho e
+mtime do catálogo não são relidos.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from comum.dados import DATASETS, arquivos_sensores
+
+ARQUIVO_CATALOGO = Path('DATA/catalogo.json')
+PESSOAS = range(11, 39)
+SENSORES = ('acelerometro', 'giroscopio')
+FATOR_LACUNA = 3          # Intervalo maior que FATOR_LACUNA x mediano conta como lacuna
+N_WORKERS = os.cpu_count()
+
+
+def _sha256(arquivo):
+    h = hashlib.sha256()
+    with open(arquivo, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def descrever_arquivo(arquivo):
+    """Metadados de um CSV de sensor (lê só a coluna timestamp)."""
+    arquivo = Path(arquivo)
+    info = arquivo.stat()
+    ts = pd.to_datetime(pd.read_csv(arquivo, usecols=['timestamp'])['timestamp'], format='ISO8601')
+    ts = ts.dt.tz_localize(None).to_numpy('datetime64[ns]')
+
+    intervalos = np.diff(np.sort(ts)) / np.timedelta64(1, 's')
+    mediano = float(np.median(intervalos)) if len(intervalos) else None
+    return {
+        'linhas': int(len(ts)),
+        'inicio': str(pd.Timestamp(ts.min())) if len(ts) else None,
+        'fim': str(pd.Timestamp(ts.max())) if len(ts) else None,
+        'intervalo_mediano_s': mediano,
+        'n_lacunas': int((intervalos > FATOR_LACUNA * mediano).sum()) if mediano else 0,
+        'tamanho_bytes': info.st_size,
+        'mtime_ns': info.st_mtime_ns,
+        'sha256': _sha256(arquivo),
+    }
+
+
+def carregar_catalogo(arquivo=ARQUIVO_CATALOGO):
+    """Catálogo salvo ({'arquivos': {caminho: metadados}}), vazio se não existir."""
+    arquivo = Path(arquivo)
+    if not arquivo.exists():
+        return {'arquivos': {}}
+    with open(arquivo, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def atualizar_catalogo(pessoas=PESSOAS, datasets=tuple(DATASETS), arquivo=ARQUIVO_CATALOGO,
+                       n_workers=N_WORKERS):
+    """
+    Atualiza o catálogo: relê só os arquivos novos ou modificados e grava o JSON.
+
+    Returns:
+        dict: catálogo completo
+    """
+    catalogo = carregar_catalogo(arquivo)
+    entradas = catalogo['arquivos']
+
+    alvos = {}
+    for dataset in datasets:
+        for pessoa_id in pessoas:
+            for sensor, caminho in zip(SENSORES, arquivos_sensores(pessoa_id, dataset)):
+                chave = caminho.as_posix()
+                if not caminho.exists():
+                    entradas.pop(chave, None)
+                    continue
+                info = caminho.stat()
+                atual = entradas.get(chave)
+                if atual and atual['tamanho_bytes'] == info.st_size and atual['mtime_ns'] == info.st_mtime_ns:
+                    continue
+                alvos[chave] = {'pessoa_id': pessoa_id, 'dataset': dataset, 'sensor': sensor}
+
+    if alvos:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            for chave, metadados in zip(alvos, executor.map(descrever_arquivo, alvos)):
+                entradas[chave] = {**alvos[chave], **metadados}
+
+    Path(arquivo).parent.mkdir(parents=True, exist_ok=True)
+    with open(arquivo, 'w', encoding='utf-8') as f:
+        json.dump(catalogo, f, indent=1, sort_keys=True)
+    catalogo['atualizados'] = sorted(alvos)
+    return catalogo
+
+
+def tabela_catalogo(catalogo=None):
+    """Catálogo como DataFrame (uma linha por arquivo)."""
+    catalogo = catalogo or carregar_catalogo()
+    tabela = pd.DataFrame.from_dict(catalogo['arquivos'], orient='index')
+    tabela.index.name = 'arquivo'
+    return tabela.reset_index().sort_values(['dataset', 'sensor', 'pessoa_id'], ignore_index=True)
+
+
+def info_sensor(pessoa_id, dataset='2x', sensor='acelerometro', catalogo=None):
+    """Metadados de um arquivo no catálogo (None se não estiver catalogado)."""
+    catalogo = catalogo or carregar_catalogo()
+    caminho = arquivos_sensores(pessoa_id, dataset)[SENSORES.index(sensor)]
+    return catalogo['arquivos'].get(caminho.as_posix())
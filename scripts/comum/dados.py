@@ -0,0 +1,128 @@
+"""
+Localização e leitura dos CSVs de sensores nas três resoluções disponíveis.
+
+    raw  - DATA/SemDownsampling_data   (todas as amostras)
+    2x   - DATA/Downsampling_data      (1 a cada 2)
+    10x  - DATA/SuperDownsample_Data   (1 a cada 10 do 2x)
+
+As leituras do acelerômetro e do giroscópio (e das próximas pessoas, em
+`carregar_pessoas`) são feitas ao mesmo tempo em threads: a maior parte do tempo de
+leitura é espera pelo disco (DATA fica em armazenamento de rede em produção) e o
+parser de CSV do pandas solta o GIL. N_LEITURAS limita quantos arquivos são lidos
+simultaneamente.
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from comum.rotulos import DTYPE_SENSOR
+
+N_LEITURAS = 4          # Arquivos lidos ao mesmo tempo (1 = leitura sequencial)
+
+# (acelerômetro, giroscópio) por dataset; {} é o ID da pessoa
+DATASETS = {
+    'raw': ('DATA/SemDownsampling_data/acelerometro/acelerometro_{}.csv',
+            'DATA/SemDownsampling_data/giroscopio/giroscopio_{}.csv'),
+    '2x': ('DATA/Downsampling_data/ds_acelerometro/ds_acelerometro_{}.csv',
+           'DATA/Downsampling_data/ds_giroscopio/ds_giroscopio_{}.csv'),
+    '10x': ('DATA/SuperDownsample_Data/ds_acelerometro_10x/ds_acelerometro_{}_10x.csv',
+            'DATA/SuperDownsample_Data/ds_giroscopio_10x/ds_giroscopio_{}_10x.csv'),
+}
+
+
+def arquivos_sensores(pessoa_id, dataset='2x'):
+    """Caminhos (acelerômetro, giroscópio) de uma pessoa no dataset escolhido."""
+    if dataset not in DATASETS:
+        raise ValueError(f"Dataset desconhecido: {dataset} (opções: {', '.join(DATASETS)})")
+    accel, gyro = DATASETS[dataset]
+    return Path(accel.format(pessoa_id)), Path(gyro.format(pessoa_id))
+
+
+def carregar_sensor(arquivo):
+    """Lê timestamp, x, y, z (eixos em float32), sem timezone e ordenado por tempo."""
+    tipos = {'x': DTYPE_SENSOR, 'y': DTYPE_SENSOR, 'z': DTYPE_SENSOR}
+    df = pd.read_csv(arquivo, usecols=['timestamp', 'x', 'y', 'z'], dtype=tipos)
+    df['timestamp'] = pd.to_datetime(df['timestamp']).dt.tz_localize(None)
+    return df.sort_values('timestamp', ignore_index=True)
+
+
+def carregar_sensores(pessoa_id, dataset='2x'):
+    """
+    Carrega acelerômetro e giroscópio de uma pessoa.
+
+    Returns:
+        tuple: (DataFrame acelerômetro, DataFrame giroscópio)
+    """
+    return ler_par(*arquivos_sensores(pessoa_id, dataset))
+
+
+def ler_em_paralelo(leituras, max_leituras=N_LEITURAS):
+    """
+    Executa leituras (funcao, arquivo) em threads, no máximo `max_leituras` ao mesmo tempo.
+
+    Returns:
+        list: resultados na ordem de `leituras` (o primeiro erro é relançado)
+    """
+    leituras = list(leituras)
+    if max_leituras <= 1 or len(leituras) <= 1:
+        return [funcao(arquivo) for funcao, arquivo in leituras]
+    with ThreadPoolExecutor(max_workers=min(max_leituras, len(leituras))) as executor:
+        futuros = [executor.submit(funcao, arquivo) for funcao, arquivo in leituras]
+        return [futuro.result() for futuro in futuros]
+
+
+def ler_par(accel_file, gyro_file, leitor=carregar_sensor, leitor_gyro=None, max_leituras=N_LEITURAS):
+    """
+    Lê acelerômetro e giroscópio ao mesmo tempo.
+
+    Args:
+        leitor: Função arquivo -> DataFrame
+        leitor_gyro: Leitor do giroscópio, quando o formato é outro (None = `leitor`)
+
+    Returns:
+        tuple: (DataFrame acelerômetro, DataFrame giroscópio)
+    """
+    df_accel, df_gyro = ler_em_paralelo(
+        [(leitor, accel_file), (leitor_gyro or leitor, gyro_file)], max_leituras)
+    return df_accel, df_gyro
+
+
+def carregar_pessoas(pessoas, dataset='2x', leitor=carregar_sensor, adiante=1,
+                     max_leituras=N_LEITURAS, arquivos=None):
+    """
+    Percorre as pessoas lendo as seguintes enquanto a atual é processada.
+
+    Até `adiante` pessoas além da atual ficam carregadas (ou em leitura) por vez, o
+    que limita a memória; os arquivos de todas elas dividem `max_leituras` threads.
+
+    Args:
+        pessoas: IDs, na ordem em que serão entregues
+        leitor: Função arquivo -> DataFrame
+        adiante: Pessoas lidas antecipadamente
+        arquivos: Função pessoa_id -> (accel_file, gyro_file) (None = `arquivos_sensores`)
+
+    Yields:
+        tuple: (pessoa_id, obter), onde obter() devolve (df_accel, df_gyro) ou
+        relança o erro de leitura daquela pessoa
+    """
+    arquivos = arquivos or (lambda pid: arquivos_sensores(pid, dataset))
+    pessoas = iter(pessoas)
+    with ThreadPoolExecutor(max_workers=max(1, max_leituras)) as executor:
+        pendentes = deque()
+
+        def enviar():
+            pessoa_id = next(pessoas, None)
+            if pessoa_id is not None:
+                accel_file, gyro_file = arquivos(pessoa_id)
+                pendentes.append((pessoa_id, executor.submit(leitor, accel_file),
+                                  executor.submit(leitor, gyro_file)))
+
+        for _ in range(1 + max(0, adiante)):
+            enviar()
+        while pendentes:
+            pessoa_id, accel, gyro = pendentes.popleft()
+            enviar()
+            yield pessoa_id, lambda accel=accel, gyro=gyro: (accel.result(), gyro.result())
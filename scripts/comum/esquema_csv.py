@@ -0,0 +1,116 @@
+"""
+Detecção das colunas time/x/y/z dos CSVs de sensores, com cache por diretório.
+
+Todos os arquivos de um mesmo diretório de dataset têm o mesmo cabeçalho, então
+o mapeamento é descoberto uma vez (lendo só o cabeçalho do primeiro arquivo) e
+reaproveitado. Cada arquivo seguinte só tem a primeira linha conferida antes de ser
+lido com usecols/dtype, sem carregar colunas que serão descartadas.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+COLUNAS_LIMPAS = ['time', 'x', 'y', 'z']
+
+_cache_esquemas = {}    # diretório -> (cabeçalho, {coluna limpa: coluna original})
+
+
+def find_time_column(cols):
+    candidates = [c for c in cols if 'time' in c.lower() or 'timestamp' in c.lower()]
+    if candidates:
+        return candidates[0]
+    # fallback: first column
+    return cols[0]
+
+
+def find_axis_column(cols, axis):
+    axis = axis.lower()
+    # exact match
+    for c in cols:
+        if c.lower() == axis:
+            return c
+    # endswith _x, acc_x, ax, etc.
+    for c in cols:
+        cl = c.lower()
+        if cl.endswith('_' + axis) or cl.startswith(axis + '_'):
+            return c
+    # contains axis as separate token
+    for c in cols:
+        cl = c.lower()
+        if (' ' + axis + ' ') in (' ' + cl + ' '):
+            return c
+    return None
+
+
+def ler_cabecalho(arquivo):
+    """Nomes das colunas, lendo apenas a primeira linha do arquivo."""
+    return tuple(pd.read_csv(arquivo, nrows=0).columns)
+
+
+def detectar_esquema(cols):
+    """
+    Mapeia as colunas de um cabeçalho para time, x, y, z.
+
+    Raises:
+        ValueError: se alguma das colunas x/y/z não for encontrada
+    """
+    cols = list(cols)
+    esquema = {'time': find_time_column(cols)}
+    for eixo in ('x', 'y', 'z'):
+        esquema[eixo] = find_axis_column(cols, eixo)
+    if not all(esquema.values()):
+        raise ValueError(f"Colunas x/y/z não encontradas. Colunas: {cols}")
+    return esquema
+
+
+def esquema_arquivo(arquivo):
+    """
+    Esquema de um arquivo usando o cache do seu diretório.
+
+    Se o cabeçalho do arquivo for diferente do que está em cache, o esquema é
+    detectado de novo só para ele (o cache do diretório não é trocado).
+    """
+    arquivo = Path(arquivo)
+    cabecalho = ler_cabecalho(arquivo)
+    em_cache = _cache_esquemas.get(arquivo.parent)
+    if em_cache is not None and em_cache[0] == cabecalho:
+        return em_cache[1]
+
+    esquema = detectar_esquema(cabecalho)
+    if em_cache is None:
+        _cache_esquemas[arquivo.parent] = (cabecalho, esquema)
+    return esquema
+
+
+def normalizar_limpo(df, esquema=None):
+    """
+    Converte um DataFrame de sensor para o formato limpo: colunas time, x, y, z
+    nessa ordem, com time convertido para datetime (se possível).
+    """
+    if esquema is None:
+        esquema = detectar_esquema(df.columns)
+    limpo = df[[esquema[c] for c in COLUNAS_LIMPAS]].copy()
+    limpo.columns = COLUNAS_LIMPAS
+    try:
+        limpo['time'] = pd.to_datetime(limpo['time'], format='ISO8601')
+    except (ValueError, TypeError):
+        pass
+    return limpo
+
+
+def ler_limpo(arquivo):
+    """Lê um CSV de sensor já projetado nas colunas time, x, y, z."""
+    esquema = esquema_arquivo(arquivo)
+    df = pd.read_csv(
+        arquivo,
+        usecols=list(esquema.values()),
+        dtype={esquema[eixo]: np.float64 for eixo in ('x', 'y', 'z')}
+    )
+    return normalizar_limpo(df, esquema)
+
+
+def escrever_limpo(df, arquivo):
+    """Grava o DataFrame limpo (time, x, y, z) em CSV."""
+    df[COLUNAS_LIMPAS].to_csv(arquivo, index=False)
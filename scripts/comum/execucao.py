@@ -0,0 +1,42 @@
+"""
+Política de execução: quantos processos rodam em paralelo e quantas threads
+(OpenMP/BLAS, usadas pelo K-means do scikit-learn e pelo numpy) cada um pode usar.
+
+Sem limite, cada processo do pool abre uma thread por núcleo e N processos
+disputam N núcleos com N² threads. A política divide os núcleos:
+    - muitas tarefas (pessoas >= núcleos): um processo por núcleo, 1 thread cada
+    - poucas tarefas: um processo por tarefa e os núcleos restantes viram threads
+      dentro de cada ajuste
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from threadpoolctl import threadpool_limits
+
+N_NUCLEOS = os.cpu_count() or 1
+VARIAVEIS_THREADS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+
+
+def politica_execucao(n_tarefas, n_nucleos=N_NUCLEOS):
+    """
+    Returns:
+        tuple: (número de processos, threads por processo)
+    """
+    n_processos = max(1, min(n_tarefas, n_nucleos))
+    return n_processos, max(1, n_nucleos // n_processos)
+
+
+def limitar_threads(n_threads):
+    """Limita as threads OpenMP/BLAS do processo atual (usado como initializer dos workers)."""
+    # Variáveis de ambiente para bibliotecas carregadas depois; threadpoolctl para as já carregadas
+    for variavel in VARIAVEIS_THREADS:
+        os.environ[variavel] = str(n_threads)
+    threadpool_limits(limits=n_threads)
+
+
+def executor_processos(n_tarefas, n_nucleos=N_NUCLEOS):
+    """ProcessPoolExecutor dimensionado por `politica_execucao`, com as threads já limitadas."""
+    n_processos, n_threads = politica_execucao(n_tarefas, n_nucleos)
+    return ProcessPoolExecutor(max_workers=n_processos, initializer=limitar_threads,
+                               initargs=(n_threads,))
@@ -0,0 +1,100 @@
+"""
+Remoção da gravidade (filtro passa-alta) nos três eixos de uma vez, bloco a bloco.
+
+O filtro guarda o próprio estado entre chamadas: processar um arquivo inteiro ou
+processá-lo em pedaços (leitura incremental, streaming) dá o mesmo resultado.
+
+Dois métodos, ambos causais:
+- 'iir':   Butterworth passa-alta (scipy.signal.lfilter com estado zi por eixo)
+- 'media': subtrai a média móvel das últimas `janela` amostras (somas acumuladas)
+
+No início o sinal é tratado como se estivesse parado no valor da primeira amostra,
+então a saída começa em ~0 (como o fillna(0) do rolling centralizado).
+"""
+
+import numpy as np
+from scipy import signal
+
+from comum.rotulos import DTYPE_SENSOR
+
+JANELA_GRAVIDADE = 200   # Amostras; período de corte do passa-alta
+
+
+class FiltroPassaAlta:
+    """
+    Passa-alta causal com estado, aplicado a blocos (n, 3) de x, y, z.
+
+    Args:
+        janela: Período de corte em amostras (componentes mais lentas que isso são removidas)
+        metodo: 'iir' ou 'media'
+        ordem: Ordem do Butterworth (só para 'iir')
+    """
+
+    def __init__(self, janela=JANELA_GRAVIDADE, metodo='iir', ordem=2):
+        if metodo not in ('iir', 'media'):
+            raise ValueError(f"Método de filtro desconhecido: {metodo}")
+        self.janela = int(janela)
+        self.metodo = metodo
+        if metodo == 'iir':
+            # Frequência de corte 1/janela ciclos por amostra, normalizada por Nyquist
+            self.b, self.a = signal.butter(ordem, 2.0 / self.janela, btype='highpass')
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Descarta o estado (o próximo bloco é tratado como início do sinal)."""
+        self.estado = None
+
+    def processar(self, bloco):
+        """
+        Filtra um bloco (n, 3) continuando do ponto onde o bloco anterior parou.
+
+        Returns:
+            array float32 (n, 3) sem a componente lenta (gravidade)
+        """
+        x = np.asarray(bloco, dtype=np.float64).reshape(len(bloco), -1)
+        if len(x) == 0:
+            return np.empty(x.shape, dtype=DTYPE_SENSOR)
+        if self.metodo == 'iir':
+            saida = self._processar_iir(x)
+        else:
+            saida = self._processar_media(x)
+        return saida.astype(DTYPE_SENSOR)
+
+    def _processar_iir(self, x):
+        if self.estado is None:
+            # Estado estacionário para entrada constante igual à primeira amostra
+            self.estado = signal.lfilter_zi(self.b, self.a)[:, None] * x[0]
+        saida, self.estado = signal.lfilter(self.b, self.a, x, axis=0, zi=self.estado)
+        return saida
+
+    def _processar_media(self, x):
+        # O estado são as últimas janela-1 amostras do bloco anterior
+        if self.estado is None:
+            self.estado = np.repeat(x[:1], self.janela - 1, axis=0)
+        estendido = np.concatenate((self.estado, x))
+        soma = np.concatenate((np.zeros((1, x.shape[1])), np.cumsum(estendido, axis=0)))
+        media = (soma[self.janela:] - soma[:-self.janela]) / self.janela
+        self.estado = estendido[len(estendido) - (self.janela - 1):]
+        return x - media
+
+
+def magnitude(xyz):
+    """Norma euclidiana por linha de um array (n, 3)."""
+    xyz = np.asarray(xyz)
+    return np.sqrt(np.einsum('ij,ij->i', xyz, xyz))
+
+
+def magnitude_sem_gravidade(xyz, janela=JANELA_GRAVIDADE, metodo='iir', filtro=None):
+    """
+    Magnitude do acelerômetro depois do passa-alta, em uma passada sobre o array.
+
+    Args:
+        xyz: Array (n, 3) com x, y, z
+        filtro: FiltroPassaAlta já em uso (para continuar um stream); se None, cria um novo
+
+    Returns:
+        array float32 (n,)
+    """
+    if filtro is None:
+        filtro = FiltroPassaAlta(janela, metodo)
+    return magnitude(filtro.processar(xyz))
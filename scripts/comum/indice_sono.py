@@ -0,0 +1,232 @@
+"""
+Índice dos períodos de sono em tempo absoluto, para várias pessoas de uma vez.
+
+Os periodos_sono<ID>.txt guardam só HH:MM. O índice expande cada arquivo uma única
+vez (mesma regra de `intervalos_diarios`: ancorado na data da primeira amostra e
+repetido em cada dia da gravação), funde os intervalos que se sobrepõem e guarda tudo
+em arrays ordenados por (pessoa, início):
+
+    pessoa_id (int32), inicio, fim (datetime64[ns])     limites inclusivos
+
+Como os intervalos de uma pessoa ficam disjuntos e ordenados, o estado de um instante
+sai de um searchsorted (O(log n) por amostra, sem laço por período nem por dia), e a
+duração de sono dentro de um intervalo qualquer sai da soma acumulada das durações.
+Milhões de amostras são rotuladas numa chamada.
+
+    indice = IndiceSono.de_arquivos()                       # toda a marcação manual
+    dormindo = indice.estado_em(df['timestamp'], 11)        # bool por amostra
+    segundos = indice.sobreposicao(inicios, fins, 11)       # sono dentro de cada janela
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from comum.catalogo import atualizar_catalogo, info_sensor
+from comum.periodos_sono import intervalos_diarios, ler_periodos_sono
+from comum.rotulos import TIPO_ESTADO
+
+DIR_MANUAL = Path('outputs/separacao_visual/Analise_objetiva')
+PESSOAS = range(11, 39)
+
+
+def arquivo_periodos(pessoa_id, diretorio=DIR_MANUAL):
+    """Caminho do periodos_sono<ID>.txt de uma pessoa."""
+    return Path(diretorio) / f"pessoa_{pessoa_id}" / "periodos_sono" / f"periodos_sono{pessoa_id}.txt"
+
+
+def extensao_catalogo(pessoa_id, dataset='2x'):
+    """(primeira, última amostra) do acelerômetro segundo o catálogo; atualiza o catálogo se faltar."""
+    info = info_sensor(pessoa_id, dataset)
+    if info is None:
+        # Varredura incremental do dataset inteiro: as próximas pessoas já saem do catálogo
+        info = info_sensor(pessoa_id, dataset, catalogo=atualizar_catalogo(datasets=(dataset,)))
+    if info is None or info['inicio'] is None:
+        raise FileNotFoundError(f"Pessoa {pessoa_id} sem dados no dataset {dataset}")
+    return pd.Timestamp(info['inicio']), pd.Timestamp(info['fim'])
+
+
+def _ns(timestamps):
+    return np.asarray(timestamps, dtype='datetime64[ns]').view(np.int64)
+
+
+def _fundir(inicios, fins):
+    """Ordena os intervalos [inicio, fim] e funde os que se sobrepõem ou se tocam."""
+    ordem = np.argsort(inicios, kind='stable')
+    inicios, fins = inicios[ordem], fins[ordem]
+    if len(inicios) == 0:
+        return inicios, fins
+    fim_acumulado = np.maximum.accumulate(fins)
+    novo = np.ones(len(inicios), dtype=bool)
+    novo[1:] = inicios[1:] > fim_acumulado[:-1]
+    ultimo = np.append(np.flatnonzero(novo)[1:] - 1, len(inicios) - 1)
+    return inicios[novo], fim_acumulado[ultimo]
+
+
+class IndiceSono:
+    """
+    Intervalos de sono absolutos de várias pessoas, com consultas vetorizadas.
+
+    Args:
+        pessoa_id: ID da pessoa de cada intervalo
+        inicios, fins: Limites (inclusivos) de cada intervalo; podem se sobrepor e vir fora de ordem
+    """
+
+    def __init__(self, pessoa_id, inicios, fins):
+        pessoa_id = np.asarray(pessoa_id, dtype=np.int32)
+        inicios, fins = _ns(inicios), _ns(fins)
+
+        blocos_inicio, blocos_fim, blocos_pessoa = [], [], []
+        self._trechos = {}          # pessoa -> (primeiro, último + 1) nos arrays
+        posicao = 0
+        for pid in np.unique(pessoa_id):
+            mascara = pessoa_id == pid
+            a, b = _fundir(inicios[mascara], fins[mascara])
+            self._trechos[int(pid)] = (posicao, posicao + len(a))
+            posicao += len(a)
+            blocos_inicio.append(a)
+            blocos_fim.append(b)
+            blocos_pessoa.append(np.full(len(a), pid, dtype=np.int32))
+
+        vazio = np.zeros(0, dtype=np.int64)
+        self._inicio = np.concatenate(blocos_inicio) if blocos_inicio else vazio
+        self._fim = np.concatenate(blocos_fim) if blocos_fim else vazio
+        self.pessoa_id = np.concatenate(blocos_pessoa) if blocos_pessoa else vazio.astype(np.int32)
+        # Sono acumulado antes de cada intervalo (zerado no começo de cada pessoa)
+        duracao = self._fim - self._inicio
+        self._acumulado = np.cumsum(duracao) - duracao
+        for a, b in self._trechos.values():
+            if b > a:
+                self._acumulado[a:b] -= self._acumulado[a]
+
+    @property
+    def inicio(self):
+        return self._inicio.view('datetime64[ns]')
+
+    @property
+    def fim(self):
+        return self._fim.view('datetime64[ns]')
+
+    def __len__(self):
+        return len(self._inicio)
+
+    def __contains__(self, pessoa_id):
+        return int(pessoa_id) in self._trechos
+
+    @property
+    def pessoas(self):
+        return list(self._trechos)
+
+    @classmethod
+    def de_periodos(cls, periodos):
+        """
+        Índice a partir de períodos HH:MM já lidos.
+
+        Args:
+            periodos: dict pessoa_id -> (lista [("HH:MM", "HH:MM"), ...], início dos dados, fim dos dados)
+        """
+        pessoas, inicios, fins = [], [], []
+        for pessoa_id, (lista, inicio_dados, fim_dados) in periodos.items():
+            a, b = intervalos_diarios(lista, inicio_dados, fim_dados)
+            pessoas.append(np.full(len(a), pessoa_id, dtype=np.int32))
+            inicios.append(a)
+            fins.append(b)
+        if not pessoas:
+            return cls([], np.zeros(0, 'datetime64[ns]'), np.zeros(0, 'datetime64[ns]'))
+        return cls(np.concatenate(pessoas), np.concatenate(inicios), np.concatenate(fins))
+
+    @classmethod
+    def de_arquivos(cls, pessoas=PESSOAS, diretorio=DIR_MANUAL, extensao=extensao_catalogo):
+        """
+        Índice a partir dos periodos_sono<ID>.txt de `diretorio` (pessoas sem arquivo ficam de fora).
+
+        Args:
+            extensao: Função pessoa_id -> (primeira, última amostra) que ancora os HH:MM;
+                      o padrão usa o catálogo dos CSVs, sem abrir os dados
+        """
+        periodos = {}
+        for pessoa_id in pessoas:
+            lista = ler_periodos_sono(arquivo_periodos(pessoa_id, diretorio))
+            if lista:
+                periodos[pessoa_id] = (lista, *extensao(pessoa_id))
+        return cls.de_periodos(periodos)
+
+    def _por_pessoa(self, funcao, pessoa_id, *colunas, vazio=-1, dtype=np.int64):
+        """Aplica `funcao(pessoa, *colunas)` a cada pessoa presente em `pessoa_id` (escalar ou array)."""
+        colunas = [_ns(c) for c in colunas]
+        if np.ndim(pessoa_id) == 0:
+            return funcao(int(pessoa_id), *colunas)
+        pessoa_id = np.asarray(pessoa_id)
+        saida = np.full(np.shape(colunas[0]), vazio, dtype=dtype)
+        for pid in self._trechos:
+            mascara = pessoa_id == pid
+            if mascara.any():
+                saida[mascara] = funcao(pid, *(c[mascara] for c in colunas))
+        return saida
+
+    def _intervalo(self, pessoa_id, ns):
+        a, b = self._trechos.get(pessoa_id, (0, 0))
+        if b == a:
+            return np.full(np.shape(ns), -1, dtype=np.int64)
+        i = np.searchsorted(self._inicio[a:b], ns, side='right') - 1
+        dentro = (i >= 0) & (ns <= self._fim[a + np.maximum(i, 0)])
+        return np.where(dentro, a + i, -1)
+
+    def intervalo_em(self, timestamps, pessoa_id):
+        """Índice do intervalo de sono que contém cada instante (-1 = acordado)."""
+        return self._por_pessoa(self._intervalo, pessoa_id, timestamps)
+
+    def estado_em(self, timestamps, pessoa_id):
+        """Máscara dormindo (True) por instante; `pessoa_id` é um ID ou um array alinhado a `timestamps`."""
+        return self.intervalo_em(timestamps, pessoa_id) >= 0
+
+    def rotular(self, timestamps, pessoa_id):
+        """Estado por instante como categórico ACORDADO/DORMINDO (TIPO_ESTADO)."""
+        codigos = self.estado_em(timestamps, pessoa_id).astype(np.int8)
+        return pd.Categorical.from_codes(np.atleast_1d(codigos), dtype=TIPO_ESTADO)
+
+    def _sono_ate(self, pessoa_id, ns):
+        """Sono acumulado (ns) da pessoa desde o primeiro intervalo até cada instante."""
+        a, b = self._trechos.get(pessoa_id, (0, 0))
+        if b == a:
+            return np.zeros(np.shape(ns), dtype=np.int64)
+        i = np.searchsorted(self._inicio[a:b], ns, side='right') - 1
+        j = a + np.maximum(i, 0)
+        parcial = np.clip(ns - self._inicio[j], 0, self._fim[j] - self._inicio[j])
+        return np.where(i >= 0, self._acumulado[j] + parcial, 0)
+
+    def _sobreposicao(self, pessoa_id, inicio, fim):
+        return self._sono_ate(pessoa_id, fim) - self._sono_ate(pessoa_id, inicio)
+
+    def sobreposicao(self, inicio, fim, pessoa_id):
+        """
+        Segundos de sono dentro de cada intervalo [inicio, fim] (escalares ou arrays).
+
+        Ex.: sobreposicao(inicio_janela, fim_janela, pid) / duração = fração da janela dormindo.
+        """
+        ns = self._por_pessoa(self._sobreposicao, pessoa_id, inicio, fim, vazio=0)
+        return ns / 1e9
+
+    def intervalos(self, pessoa_id, inicio=None, fim=None):
+        """
+        Intervalos de sono da pessoa que tocam [inicio, fim] (None = sem limite), sem recortar.
+
+        Returns:
+            tuple: (inícios, fins) como arrays datetime64[ns]
+        """
+        a, b = self._trechos.get(int(pessoa_id), (0, 0))
+        if inicio is not None:
+            a += np.searchsorted(self._fim[a:b], _ns(inicio), side='left')
+        if fim is not None:
+            b = a + np.searchsorted(self._inicio[a:b], _ns(fim), side='right')
+        return self.inicio[a:b], self.fim[a:b]
+
+    def tabela(self):
+        """Um intervalo por linha: pessoa_id, inicio, fim, duracao_s."""
+        return pd.DataFrame({
+            'pessoa_id': self.pessoa_id,
+            'inicio': self.inicio,
+            'fim': self.fim,
+            'duracao_s': (self._fim - self._inicio) / 1e9,
+        })
@@ -0,0 +1,87 @@
+"""
+Estatísticas em janelas móveis calculadas com somas acumuladas (custo O(n)).
+
+Equivalem a `Series.rolling(janela, center=True).std()` do pandas, sem o custo do
+rolling: as somas de x e x² são acumuladas uma vez e cada janela vira uma subtração.
+"""
+
+import numpy as np
+
+
+def desvios_moveis(valores, janelas, centralizado=True):
+    """
+    Desvio padrão amostral (ddof=1) para vários tamanhos de janela de uma só vez.
+
+    As somas acumuladas de x e x² são calculadas uma única vez e reaproveitadas por
+    todas as janelas, então cada tamanho extra custa só uma subtração vetorizada.
+
+    Args:
+        valores: Array 1-D (ex.: magnitude do acelerômetro)
+        janelas: Lista de tamanhos de janela (número de amostras)
+        centralizado: Se True, alinha como rolling(center=True); senão, janela terminando no ponto
+
+    Returns:
+        array float64 (len(janelas), n), com NaN nas bordas sem janela completa
+    """
+    x = np.asarray(valores, dtype=np.float64)
+    n = len(x)
+    saida = np.full((len(janelas), n), np.nan)
+    if n == 0:
+        return saida
+
+    # Subtrair a média reduz o cancelamento numérico em soma(x²) - soma(x)²/n
+    x = x - x.mean()
+    s1 = np.concatenate(([0.0], np.cumsum(x)))
+    s2 = np.concatenate(([0.0], np.cumsum(x * x)))
+
+    for linha, janela in enumerate(janelas):
+        if janela < 2 or n < janela:
+            continue
+        soma = s1[janela:] - s1[:-janela]
+        soma2 = s2[janela:] - s2[:-janela]
+        var = (soma2 - soma * soma / janela) / (janela - 1)
+        np.maximum(var, 0.0, out=var)
+
+        inicio = janela // 2 if centralizado else janela - 1
+        saida[linha, inicio:inicio + len(var)] = np.sqrt(var)
+    return saida
+
+
+def desvio_movel(valores, janela, centralizado=True):
+    """
+    Desvio padrão amostral (ddof=1) em janela móvel.
+
+    Args:
+        valores: Array 1-D (ex.: magnitude do acelerômetro)
+        janela: Número de amostras por janela
+        centralizado: Se True, alinha como rolling(center=True); senão, janela terminando no ponto
+
+    Returns:
+        array float64 do mesmo tamanho, com NaN nas bordas sem janela completa
+    """
+    return desvios_moveis(valores, [janela], centralizado)[0]
+
+
+def contar_acima(valores, limiares):
+    """
+    Quantos valores (ignorando NaN) ficam acima de cada limiar, para uma grade de limiares.
+
+    Ordena os valores uma vez e usa searchsorted: a varredura de limiares não
+    recalcula nada sobre os dados.
+
+    Args:
+        valores: Array 1-D ou 2-D (uma linha por tamanho de janela)
+        limiares: Grade de limiares
+
+    Returns:
+        tuple: (contagens acima de cada limiar com shape (..., len(limiares)), número de NaN por linha)
+    """
+    valores = np.atleast_2d(np.asarray(valores, dtype=np.float64))
+    limiares = np.asarray(limiares, dtype=np.float64)
+    # NaN vai para o fim da ordenação; contar só a parte válida de cada linha
+    ordenados = np.sort(valores, axis=1)
+    n_validos = (~np.isnan(ordenados)).sum(axis=1)
+    contagens = np.empty((len(valores), len(limiares)), dtype=np.int64)
+    for linha, (v, n) in enumerate(zip(ordenados, n_validos)):
+        contagens[linha] = n - np.searchsorted(v[:n], limiares, side='right')
+    return contagens, valores.shape[1] - n_validos
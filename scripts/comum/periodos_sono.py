@@ -0,0 +1,74 @@
+"""
+Leitura e escrita dos arquivos periodos_sono<ID>.txt e expansão dos períodos em
+intervalos diários (a marcação das amostras fica em comum/indice_sono.py).
+
+Formato do arquivo (gerado por separacao_interativa.py):
+
+    Períodos de sono - Pessoa 11
+    ==================================================
+    Período 1: 22:00 até 06:30
+"""
+
+import re
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+
+def escrever_periodos_sono(arquivo, pessoa_id, periodos_sono):
+    """Grava a lista de períodos [(inicio, fim), ...] (datetimes) no formato HH:MM."""
+    with open(arquivo, 'w', encoding='utf-8') as f:
+        f.write(f"Períodos de sono - Pessoa {pessoa_id}\n")
+        f.write("="*50 + "\n")
+        for i, (inicio, fim) in enumerate(periodos_sono, 1):
+            f.write(f"Período {i}: {inicio.strftime('%H:%M')} até {fim.strftime('%H:%M')}\n")
+
+
+def ler_periodos_sono(arquivo):
+    """Lê um periodos_sono<ID>.txt e retorna [("HH:MM", "HH:MM"), ...] (vazio se não existir)."""
+    periodos = []
+    try:
+        f = open(arquivo, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        return periodos
+
+    with f:
+        for linha in f:
+            texto = linha.strip()
+            if not texto or texto.startswith('=') or 'Períodos' in texto:
+                continue
+            # Extrair pares HH:MM usando regex
+            times = re.findall(r"(\d{1,2}:\d{2})", texto)
+            if len(times) >= 2:
+                periodos.append((times[0], times[1]))
+    return periodos
+
+
+def intervalos_diarios(periodos, inicio_dados, fim_dados):
+    """
+    Expande períodos HH:MM em intervalos absolutos, repetidos para cada dia da gravação.
+
+    Mesma regra de `separar_dados`: o período é ancorado na data da primeira amostra,
+    o fim menor ou igual ao início passa para o dia seguinte e o par é repetido em cada
+    dia coberto pelos dados.
+
+    Returns:
+        tuple: (inícios, fins) como arrays datetime64[ns]
+    """
+    data_min = pd.Timestamp(inicio_dados).floor('D')
+    n_days = (pd.Timestamp(fim_dados).floor('D') - data_min).days
+
+    inicios, fins = [], []
+    for inicio_str, fim_str in periodos:
+        inicio = pd.Timestamp(f"{data_min.date()} {inicio_str}")
+        fim = pd.Timestamp(f"{data_min.date()} {fim_str}")
+        if fim <= inicio:
+            fim += timedelta(days=1)
+        for offset in range(n_days + 1):
+            inicios.append(inicio + timedelta(days=offset))
+            fins.append(fim + timedelta(days=offset))
+
+    return (np.array(inicios, dtype='datetime64[ns]'),
+            np.array(fins, dtype='datetime64[ns]'))
+
@@ -0,0 +1,122 @@
+"""
+Pirâmide de resolução (mín/máx por bloco) para visualizar séries longas com zoom.
+
+Cada nível agrupa FATOR blocos do nível anterior e guarda, por bloco, o instante
+inicial e o mínimo/máximo de cada canal. Os níveis ficam em disco como .npy e são
+abertos com mmap: uma consulta só lê as linhas do intervalo visível, no nível mais
+fino que ainda cabe em `max_pontos` blocos. Desenhar o envelope mín/máx de cada
+bloco preserva picos que um downsample simples (iloc[::n]) perderia.
+
+Estrutura em disco:
+    <diretorio>/meta.json
+    <diretorio>/nivel_<k>_t.npy     int64 (ns), início de cada bloco
+    <diretorio>/nivel_<k>_min.npy   float32 (blocos, canais)
+    <diretorio>/nivel_<k>_max.npy   float32 (blocos, canais)
+O nível 0 são as próprias amostras (mín = máx = valor).
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from comum.rotulos import DTYPE_SENSOR
+
+FATOR = 4             # Blocos do nível anterior agrupados em cada bloco
+MIN_BLOCOS = 512      # Para de criar níveis quando o nível tem menos blocos que isso
+
+
+def _reduzir(t, minimos, maximos, fator):
+    """Agrupa `fator` blocos consecutivos (o último grupo pode ser incompleto)."""
+    inicios = np.arange(0, len(t), fator)
+    return (t[inicios],
+            np.minimum.reduceat(minimos, inicios, axis=0),
+            np.maximum.reduceat(maximos, inicios, axis=0))
+
+
+def construir_piramide(timestamps, valores, diretorio, canais=('x', 'y', 'z'),
+                       fator=FATOR, min_blocos=MIN_BLOCOS):
+    """
+    Constrói e grava a pirâmide de uma série.
+
+    Args:
+        timestamps: Instantes ordenados (datetime64 ou int64 em ns)
+        valores: Array (n, canais)
+        diretorio: Pasta de saída (criada se não existir)
+    """
+    diretorio = Path(diretorio)
+    diretorio.mkdir(parents=True, exist_ok=True)
+
+    t = np.asarray(timestamps, dtype='datetime64[ns]').view(np.int64)
+    v = np.asarray(valores, dtype=DTYPE_SENSOR).reshape(len(t), -1)
+    minimos = maximos = v
+
+    niveis = []
+    while True:
+        k = len(niveis)
+        np.save(diretorio / f"nivel_{k}_t.npy", t)
+        np.save(diretorio / f"nivel_{k}_min.npy", minimos)
+        np.save(diretorio / f"nivel_{k}_max.npy", maximos)
+        niveis.append(len(t))
+        if len(t) <= min_blocos:
+            break
+        t, minimos, maximos = _reduzir(t, minimos, maximos, fator)
+
+    with open(diretorio / "meta.json", 'w', encoding='utf-8') as f:
+        json.dump({'fator': fator, 'canais': list(canais), 'blocos_por_nivel': niveis}, f, indent=2)
+    return Piramide(diretorio)
+
+
+class Piramide:
+    """Pirâmide gravada em disco, aberta com mmap (só o intervalo consultado é lido)."""
+
+    def __init__(self, diretorio):
+        self.diretorio = Path(diretorio)
+        with open(self.diretorio / "meta.json", encoding='utf-8') as f:
+            meta = json.load(f)
+        self.fator = meta['fator']
+        self.canais = meta['canais']
+        self.blocos_por_nivel = meta['blocos_por_nivel']
+        self.niveis = [
+            tuple(np.load(self.diretorio / f"nivel_{k}_{nome}.npy", mmap_mode='r')
+                  for nome in ('t', 'min', 'max'))
+            for k in range(len(self.blocos_por_nivel))
+        ]
+
+    @property
+    def inicio(self):
+        return np.datetime64(int(self.niveis[0][0][0]), 'ns')
+
+    @property
+    def fim(self):
+        return np.datetime64(int(self.niveis[0][0][-1]), 'ns')
+
+    def consultar(self, inicio, fim, max_pontos=2000):
+        """
+        Envelope mín/máx do intervalo [inicio, fim] no nível mais fino com até max_pontos blocos.
+
+        Returns:
+            tuple: (t datetime64[ns], mínimos (blocos, canais), máximos (blocos, canais), nível)
+        """
+        a = np.datetime64(inicio, 'ns').view(np.int64)
+        b = np.datetime64(fim, 'ns').view(np.int64)
+        for nivel, (t, minimos, maximos) in enumerate(self.niveis):
+            # Um bloco antes e um depois para a linha não terminar antes da borda da tela
+            i = max(int(np.searchsorted(t, a, side='right')) - 1, 0)
+            j = min(int(np.searchsorted(t, b, side='right')) + 1, len(t))
+            if j - i <= max_pontos or nivel == len(self.niveis) - 1:
+                return (np.asarray(t[i:j]).view('datetime64[ns]'),
+                        np.asarray(minimos[i:j]), np.asarray(maximos[i:j]), nivel)
+
+
+def envelope(t, minimos, maximos):
+    """
+    Intercala mín e máx de cada bloco numa única linha (t0,min0),(t0,max0),(t1,min1)...
+
+    Uma linha por canal desenha o envelope inteiro, bem mais barato que fill_between.
+    """
+    tt = np.repeat(t, 2)
+    vv = np.empty((2 * len(t),) + minimos.shape[1:], dtype=minimos.dtype)
+    vv[0::2] = minimos
+    vv[1::2] = maximos
+    return tt, vv
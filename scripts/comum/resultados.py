@@ -0,0 +1,95 @@
+"""
+Gravação incremental dos resultados do clustering, pessoa a pessoa.
+
+Cada pessoa processada vira um CSV com os rótulos por janela e uma linha no
+resumo geral; em memória ficam apenas as contagens por código de movimento
+(o necessário para a distribuição geral), então o uso de memória não cresce
+com o número de pessoas. Com um `ArmazemResultados`, as janelas (limites,
+features, cluster e código) também vão para o armazém colunar da execução.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from comum.rotulos import chaves_movimento, contar_codigos
+
+
+def escrever_janelas(arquivo, timestamps, labels, movimento, anexar=False):
+    """
+    Escreve (ou acrescenta ao final de) um CSV de rótulos por janela.
+
+    Com anexar=True o cabeçalho só é escrito se o arquivo ainda não existir.
+    """
+    arquivo = Path(arquivo)
+    modo = 'a' if anexar else 'w'
+    cabecalho = not (anexar and arquivo.exists())
+    pd.DataFrame({
+        'timestamp': timestamps,
+        'cluster': labels,
+        'movimento': movimento
+    }).to_csv(arquivo, mode=modo, header=cabecalho, index=False)
+
+
+class GravadorResultados:
+    """Destino dos resultados por pessoa: grava em disco e acumula só agregados pequenos."""
+
+    def __init__(self, diretorio, n_clusters=3, armazem=None):
+        self.diretorio = Path(diretorio)
+        self.armazem = armazem
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        self.n_clusters = n_clusters
+        self.contagens = np.zeros(n_clusters, dtype=np.int64)
+        self.n_pessoas = 0
+        self.exemplo = None     # std_accel médio por código da primeira pessoa (para o relatório)
+
+        self.arquivo_resumo = self.diretorio / 'resumo.csv'
+        colunas = ['pessoa_id', 'n_janelas']
+        colunas += [f'n_{chave}' for chave in chaves_movimento(n_clusters)]
+        colunas += [f'std_accel_{chave}' for chave in chaves_movimento(n_clusters)]
+        pd.DataFrame(columns=colunas).to_csv(self.arquivo_resumo, index=False)
+
+    def arquivo_pessoa(self, pessoa_id):
+        return self.diretorio / f'janelas_pessoa_{pessoa_id}.csv'
+
+    def gravar_pessoa(self, pessoa_id, timestamps, labels, movimento, std_accel,
+                      features=None, inicios=None, fins=None):
+        """
+        Grava os rótulos por janela de uma pessoa e atualiza os agregados.
+
+        Args:
+            pessoa_id: ID da pessoa
+            timestamps: Timestamp central de cada janela
+            labels: Cluster (int8) de cada janela
+            movimento: Código de movimento (int8) de cada janela
+            std_accel: Variação do acelerômetro de cada janela (critério de ordenação)
+            features, inicios, fins: Features e limites de cada janela (só para o armazém)
+        """
+        escrever_janelas(self.arquivo_pessoa(pessoa_id), timestamps, labels, movimento)
+        if self.armazem is not None:
+            self.armazem.anexar(pessoa_id, inicios, timestamps, fins, features, labels, movimento)
+
+        contagem = contar_codigos(movimento, self.n_clusters)
+        soma_std = np.bincount(movimento, weights=std_accel, minlength=self.n_clusters)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std_medio = soma_std / contagem
+
+        linha = [pessoa_id, len(movimento)] + contagem.tolist() + std_medio.round(6).tolist()
+        pd.DataFrame([linha]).to_csv(self.arquivo_resumo, mode='a', header=False, index=False)
+
+        self.contagens += contagem
+        self.n_pessoas += 1
+        if self.exemplo is None:
+            self.exemplo = (pessoa_id, std_medio)
+
+    def distribuicao(self):
+        """Fração de janelas por código de movimento somando todas as pessoas gravadas."""
+        total = self.contagens.sum()
+        if total == 0:
+            return np.zeros(self.n_clusters)
+        return self.contagens / total
+
+    def ler_resumo(self):
+        """Lê o resumo por pessoa gravado até agora."""
+        return pd.read_csv(self.arquivo_resumo)
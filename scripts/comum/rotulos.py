@@ -0,0 +1,60 @@
+"""
+Tabela única de rótulos (movimento e estado de sono) com códigos inteiros compactos.
+
+Os rótulos circulam pelo pipeline como códigos int8; as strings só aparecem
+na hora de imprimir ou plotar, via tabela de consulta.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Códigos de movimento: ordenados por variação (std) do acelerômetro, do menor para o maior
+PARADO = 0
+BAIXO_MOVIMENTO = 1
+ALTO_MOVIMENTO = 2
+
+NOMES_MOVIMENTO = np.array([
+    'muito baixo movimento (parado)',   # 0: menor variação = parado/dormindo
+    'baixo movimento',                  # 1: variação média = movimento leve
+    'alto movimento'                    # 2: maior variação = movimento intenso
+])
+
+CORES_MOVIMENTO = np.array(['gray', 'blue', 'red'])
+
+# Nomes curtos para colunas de arquivos (sem espaços)
+CHAVES_MOVIMENTO = np.array(['parado', 'baixo', 'alto'])
+
+# Estado de sono (coluna 'estado' da separação dormindo/acordado)
+ESTADOS_SONO = ['ACORDADO', 'DORMINDO']
+TIPO_ESTADO = pd.CategoricalDtype(categories=ESTADOS_SONO)
+
+DTYPE_CODIGO = np.int8
+DTYPE_SENSOR = np.float32
+
+
+def tabela_movimento(n_clusters):
+    """
+    Retorna a tabela código -> nome para n clusters ordenados por variação.
+
+    Com 3 clusters usa os nomes padrão; caso contrário, rótulos genéricos 'movimento_i'.
+    """
+    if n_clusters == len(NOMES_MOVIMENTO):
+        return NOMES_MOVIMENTO
+    return np.array([f'movimento_{i}' for i in range(n_clusters)])
+
+
+def chaves_movimento(n_clusters):
+    """Versão curta de `tabela_movimento`, para nomes de colunas."""
+    if n_clusters == len(CHAVES_MOVIMENTO):
+        return CHAVES_MOVIMENTO
+    return tabela_movimento(n_clusters)
+
+
+def nomes_movimento(codigos, n_clusters=3):
+    """Converte um array de códigos int8 para os nomes de movimento (apenas para exibição)."""
+    return tabela_movimento(n_clusters)[np.asarray(codigos, dtype=np.intp)]
+
+
+def contar_codigos(codigos, n_clusters=3):
+    """Contagem por código de movimento (np.bincount com tamanho fixo)."""
+    return np.bincount(np.asarray(codigos, dtype=np.intp), minlength=n_clusters)
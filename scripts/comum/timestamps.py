@@ -0,0 +1,144 @@
+"""
+Verificação dos timestamps dos sensores e tolerância de sincronização por pessoa.
+
+Tudo é feito com diferenças vetorizadas sobre timestamps int64 (ns):
+    - duplicados (intervalo = 0), trechos fora de ordem (intervalo < 0)
+    - lacunas acima de um limiar e histograma dos intervalos
+    - defasagem entre acelerômetro e giroscópio (amostra mais próxima)
+
+O relatório gerado por separacao_manual/verificar_timestamps_coorte.py fica em
+RELATORIO_TIMESTAMPS; `tolerancia_sincronizacao` e `janela_sugerida` leem dele a
+tolerância e o tamanho de janela por pessoa (com os valores padrão quando a pessoa
+não foi verificada).
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RELATORIO_TIMESTAMPS = Path('outputs/verificacao_timestamps/relatorio_timestamps.json')
+TOLERANCIA_PADRAO_S = 0.1      # Valor fixo usado antes da verificação
+LIMIAR_LACUNA_S = 60.0         # Intervalo acima disso conta como lacuna
+BORDAS_HISTOGRAMA_S = [0, 0.001, 1, 5, 10, 15, 20, 30, 60, 300, 3600, np.inf]
+JANELA_ALVO_S = 180.0          # Duração alvo da janela (10 amostras do 2x ≈ 180 s)
+MIN_JANELAS = 50               # Limita a janela sugerida em gravações em rajadas (ex.: pessoas 15 e 35)
+LINHAS_BLOCO = 200_000
+
+NS = 1_000_000_000
+
+
+def ler_timestamps_ns(arquivo, linhas_bloco=LINHAS_BLOCO):
+    """Lê só a coluna timestamp, em blocos, como int64 (ns desde a época, sem timezone)."""
+    partes = []
+    for bloco in pd.read_csv(arquivo, usecols=['timestamp'], chunksize=linhas_bloco):
+        ts = pd.to_datetime(bloco['timestamp'], format='ISO8601').dt.tz_localize(None)
+        partes.append(ts.to_numpy('datetime64[ns]').view(np.int64))
+    return np.concatenate(partes) if partes else np.zeros(0, dtype=np.int64)
+
+
+def estatisticas_intervalos(ts, limiar_lacuna_s=LIMIAR_LACUNA_S):
+    """Contagens e histograma dos intervalos entre amostras consecutivas (na ordem do arquivo)."""
+    dt = np.diff(ts)
+    fora_de_ordem = dt < 0
+    # Trecho fora de ordem = sequência contígua de intervalos negativos
+    inicios_trechos = np.flatnonzero(np.diff(np.concatenate(([0], fora_de_ordem.view(np.int8)))) == 1)
+    positivos = dt[dt > 0] / NS
+    contagem, _ = np.histogram(dt[dt >= 0] / NS, bins=BORDAS_HISTOGRAMA_S)
+
+    return {
+        'linhas': int(len(ts)),
+        'inicio': str(pd.Timestamp(ts.min())) if len(ts) else None,
+        'fim': str(pd.Timestamp(ts.max())) if len(ts) else None,
+        'intervalo_mediano_s': float(np.median(positivos)) if len(positivos) else None,
+        'duplicados': int((dt == 0).sum()),
+        'fora_de_ordem': int(fora_de_ordem.sum()),
+        'trechos_fora_de_ordem': int(len(inicios_trechos)),
+        'lacunas': int((dt > limiar_lacuna_s * NS).sum()),
+        'maior_lacuna_s': float(dt.max() / NS) if len(dt) else None,
+        'histograma_intervalos': {
+            f"{a}-{b}s": int(c) for a, b, c in zip(BORDAS_HISTOGRAMA_S[:-1], BORDAS_HISTOGRAMA_S[1:], contagem)
+        },
+    }
+
+
+def defasagem_sensores(ts_accel, ts_gyro):
+    """
+    Diferença (s) entre cada amostra do acelerômetro e a amostra mais próxima do giroscópio.
+
+    Returns:
+        array float64 com a defasagem (giroscópio - acelerômetro) por amostra do acelerômetro
+    """
+    a = np.sort(ts_accel)
+    g = np.sort(ts_gyro)
+    if not len(a) or not len(g):
+        return np.zeros(0)
+    direita = np.clip(np.searchsorted(g, a), 0, len(g) - 1)
+    esquerda = np.clip(direita - 1, 0, len(g) - 1)
+    d_dir = g[direita] - a
+    d_esq = g[esquerda] - a
+    return np.where(np.abs(d_esq) < np.abs(d_dir), d_esq, d_dir) / NS
+
+
+def verificar_pessoa_dataset(arquivo_accel, arquivo_gyro, limiar_lacuna_s=LIMIAR_LACUNA_S):
+    """Relatório de um par acelerômetro/giroscópio, com tolerância e janela sugeridas."""
+    ts_accel = ler_timestamps_ns(arquivo_accel)
+    ts_gyro = ler_timestamps_ns(arquivo_gyro)
+    relatorio = {
+        'acelerometro': estatisticas_intervalos(ts_accel, limiar_lacuna_s),
+        'giroscopio': estatisticas_intervalos(ts_gyro, limiar_lacuna_s),
+    }
+
+    defasagem = np.abs(defasagem_sensores(ts_accel, ts_gyro))
+    mediano = relatorio['acelerometro']['intervalo_mediano_s']
+    if len(defasagem) and mediano:
+        p99 = float(np.percentile(defasagem, 99))
+        # Cobrir a defasagem típica com folga, sem chegar a meio intervalo (outra amostra)
+        tolerancia = min(max(1.5 * p99, 0.001), 0.5 * mediano)
+        dentro_padrao = float((defasagem <= TOLERANCIA_PADRAO_S).mean())
+        if (defasagem <= tolerancia).mean() < dentro_padrao:
+            # Nunca descartar amostras que a tolerância padrão mantinha (ex.: pessoas 15 e 35)
+            tolerancia = TOLERANCIA_PADRAO_S
+        relatorio['defasagem'] = {
+            'inicio_s': float((ts_gyro.min() - ts_accel.min()) / NS),
+            'mediana_abs_s': float(np.median(defasagem)),
+            'p99_abs_s': p99,
+            'max_abs_s': float(defasagem.max()),
+            'fracao_dentro_tolerancia_padrao': dentro_padrao,
+            'fracao_dentro_tolerancia_sugerida': float((defasagem <= tolerancia).mean()),
+        }
+        relatorio['tolerancia_sugerida_s'] = tolerancia
+        janela = min(int(round(JANELA_ALVO_S / mediano)), len(ts_accel) // MIN_JANELAS)
+        relatorio['janela_sugerida_amostras'] = max(2, janela)
+    return relatorio
+
+
+def carregar_relatorio(arquivo=RELATORIO_TIMESTAMPS):
+    arquivo = Path(arquivo)
+    if not arquivo.exists():
+        return None
+    with open(arquivo, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def tolerancia_sincronizacao(pessoa_id, dataset='2x', relatorio=None):
+    """Tolerância (s) para o merge_asof dos sensores: a sugerida no relatório ou a padrão."""
+    relatorio = relatorio or carregar_relatorio()
+    try:
+        entrada = relatorio['pessoas'][str(pessoa_id)][dataset]
+        # Relatórios sem a fração coberta são anteriores à regra que nunca perde amostras
+        if 'fracao_dentro_tolerancia_sugerida' not in entrada['defasagem']:
+            return TOLERANCIA_PADRAO_S
+        return entrada['tolerancia_sugerida_s']
+    except (KeyError, TypeError):
+        return TOLERANCIA_PADRAO_S
+
+
+def janela_sugerida(pessoa_id, dataset='2x', padrao=10, relatorio=None):
+    """Tamanho de janela (amostras) que cobre JANELA_ALVO_S para a pessoa, ou `padrao`."""
+    relatorio = relatorio or carregar_relatorio()
+    try:
+        return relatorio['pessoas'][str(pessoa_id)][dataset]['janela_sugerida_amostras']
+    except (KeyError, TypeError):
+        return padrao
@@ -4,11 +4,16 @@ com tempo e valores de acelerômetro (x, y, z)
 """
 
 import pandas as pd
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from comum.esquema_csv import escrever_limpo, normalizar_limpo
+
 # Configurações
 DATA_DIR = Path("DATA/Downsampling_data")
 OUTPUT_DIR = Path("DATA/SuperDownsample_Data")
+CLEAN_DIR = OUTPUT_DIR / "clean"   # time,x,y,z (antes gerado relendo os 10x em export_all_clean.py)
 
 def fazer_downsample(df, fator=10):
     """
@@ -30,7 +35,7 @@ def processar_acelerometro(pessoa_id):
     Processa dados do acelerômetro de uma pessoa:
     1. Carrega os dados originais
     2. Faz downsample 10x
-    3. Salva os dados reduzidos
+    3. Salva os dados reduzidos e a versão limpa (time,x,y,z) em clean/
     4. Retorna DataFrame para visualização
     
     Args:
@@ -59,6 +64,11 @@ def processar_acelerometro(pessoa_id):
     df_downsampled.to_csv(output_file, index=False)
     print(f"  Salvo em: {output_file}")
     
+    # Salvar versão limpa direto daqui, sem reler o arquivo 10x
+    CLEAN_DIR.mkdir(parents=True, exist_ok=True)
+    clean_file = CLEAN_DIR / f"acelerometro_{pessoa_id}.csv"
+    escrever_limpo(normalizar_limpo(df_downsampled), clean_file)
+    
     return df_downsampled
 
 def processar_giroscopio(pessoa_id):
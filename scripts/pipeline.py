@@ -0,0 +1,377 @@
+"""
+Executor incremental do pipeline (estilo make): refaz só o que ficou desatualizado.
+
+Cada tarefa é um par (estágio, pessoa). O manifesto outputs/pipeline_manifest.json
+guarda, por tarefa, o hash dos arquivos de entrada, os parâmetros e o hash do código
+do estágio (o script e os módulos locais que ele importa, como scripts/comum/*), além
+dos arquivos gerados. Uma tarefa é refeita quando:
+    - alguma saída não existe
+    - algum hash de entrada, parâmetro ou do código do estágio mudou
+Alterar o CSV bruto de uma pessoa refaz apenas a cadeia daquela pessoa; com --simular,
+as tarefas que dependem de uma tarefa desatualizada também são listadas.
+
+Tarefas independentes (outras pessoas, estágios sem dependência entre si) rodam em
+paralelo; cada tarefa só começa depois que as tarefas das quais depende terminaram.
+
+Estágios (por pessoa):
+    downsample_2x   DATA/SemDownsampling_data  -> DATA/Downsampling_data
+    downsample_10x  DATA/Downsampling_data     -> DATA/SuperDownsample_Data (10x + clean/)
+    excel           clean/                     -> excel_csv/
+    clustering      DATA/Downsampling_data     -> outputs/pipeline/clustering/janelas_pessoa_<id>.csv
+
+Cada saída tem um só escritor: o clustering do pipeline não grava em
+outputs/resultados_clustering (de kmeans_clustering_euclidean.py) nem nos checkpoints
+de incremental.py, então o hash registrado no manifesto não é sobrescrito por fora.
+
+Uso:
+    python scripts/pipeline.py                  # todas as pessoas e estágios
+    python scripts/pipeline.py 11 12 --estagios downsample_2x downsample_10x
+    python scripts/pipeline.py --simular        # só mostra o que seria refeito
+    python scripts/pipeline.py 13 --forcar
+"""
+
+import argparse
+import ast
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+SCRIPTS = RAIZ / "scripts"
+sys.path.insert(0, str(SCRIPTS))
+from comum.dados import arquivos_sensores
+from comum.execucao import N_NUCLEOS, limitar_threads
+from comum.timestamps import RELATORIO_TIMESTAMPS
+
+MANIFESTO = RAIZ / "outputs" / "pipeline_manifest.json"
+DIR_CLUSTERING = RAIZ / "outputs" / "pipeline" / "clustering"
+PESSOAS = list(range(11, 39))
+N_WORKERS = N_NUCLEOS
+
+SUPER_DIR = RAIZ / "DATA" / "SuperDownsample_Data"
+
+
+def _sensores(pid, dataset):
+    return [RAIZ / arquivo for arquivo in arquivos_sensores(pid, dataset)]
+
+
+def _saidas_2x(pid):
+    return _sensores(pid, '2x')
+
+
+def _saidas_10x(pid):
+    return _sensores(pid, '10x') + [SUPER_DIR / "clean" / f"acelerometro_{pid}.csv"]
+
+
+def _saida_excel(pid):
+    return [SUPER_DIR / "excel_csv" / f"acelerometro_{pid}_excel.csv"]
+
+
+def _saida_clustering(pid):
+    return [DIR_CLUSTERING / f"janelas_pessoa_{pid}.csv"]
+
+
+# Script, parâmetros (constantes do script) e dependências de cada estágio.
+# 'opcionais' são entradas que podem não existir (entram no hash, ausência não impede a tarefa)
+ESTAGIOS = {
+    'downsample_2x': {
+        'script': SCRIPTS / "preprocessing" / "downsampling_script.py",
+        'parametros': ['DOWNSAMPLE_RATE'],
+        'depende': [],
+        'entradas': lambda pid: _sensores(pid, 'raw'),
+        'saidas': _saidas_2x,
+    },
+    'downsample_10x': {
+        'script': SCRIPTS / "downsample_visualizacao" / "downsample_e_visualizar.py",
+        'parametros': [],
+        'depende': ['downsample_2x'],
+        'entradas': _saidas_2x,
+        'saidas': _saidas_10x,
+    },
+    'excel': {
+        'script': SUPER_DIR / "export_for_excel.py",
+        'parametros': ['CHUNK_LINHAS'],
+        'depende': ['downsample_10x'],
+        'entradas': lambda pid: _saidas_10x(pid)[-1:],
+        'saidas': _saida_excel,
+    },
+    'clustering': {
+        'script': SCRIPTS / "clustering_euclidiano" / "kmeans_clustering_euclidean.py",
+        'parametros': ['N_CLUSTERS', 'BACKEND_KMEANS'],
+        'depende': ['downsample_2x'],
+        'entradas': _saidas_2x,
+        'opcionais': lambda pid: [RAIZ / RELATORIO_TIMESTAMPS],   # tolerância de sincronização
+        'saidas': _saida_clustering,
+    },
+}
+
+_modulos = {}
+_codigo = {}
+
+
+def carregar_modulo(estagio):
+    """Importa o script do estágio pelo caminho (uma vez por processo)."""
+    if estagio not in _modulos:
+        script = ESTAGIOS[estagio]['script']
+        sys.path.insert(0, str(script.parent))
+        spec = importlib.util.spec_from_file_location(f"estagio_{estagio}", script)
+        modulo = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(modulo)
+        _modulos[estagio] = modulo
+    return _modulos[estagio]
+
+
+def arquivos_codigo(estagio):
+    """Script do estágio e os módulos locais que ele importa, direta ou indiretamente."""
+    if estagio not in _codigo:
+        script = ESTAGIOS[estagio]['script']
+        vistos, fila = set(), [script]
+        while fila:
+            arquivo = fila.pop()
+            if arquivo in vistos:
+                continue
+            vistos.add(arquivo)
+            nomes = []
+            for no in ast.walk(ast.parse(arquivo.read_text(encoding='utf-8'))):
+                if isinstance(no, ast.Import):
+                    nomes += [a.name for a in no.names]
+                elif isinstance(no, ast.ImportFrom) and no.module and not no.level:
+                    nomes += [no.module] + [f"{no.module}.{a.name}" for a in no.names]
+            # Mesmas pastas do sys.path dos scripts: a do arquivo, a do script e scripts/
+            for nome in nomes:
+                for pasta in (arquivo.parent, script.parent, SCRIPTS):
+                    candidato = pasta.joinpath(*nome.split('.')).with_suffix('.py')
+                    if candidato.exists():
+                        fila.append(candidato)
+                        break
+        _codigo[estagio] = sorted(vistos)
+    return _codigo[estagio]
+
+
+# Execução de cada estágio para uma pessoa (roda nos processos do pool)
+
+def _executar_downsample_2x(modulo, pid):
+    for (entrada, saida), tipo in zip(zip(_sensores(pid, 'raw'), _saidas_2x(pid)),
+                                      ('acelerometro', 'giroscopio')):
+        _, _, ok = modulo.fazer_downsampling(entrada, saida, tipo)
+        if not ok:
+            raise RuntimeError(f"falha ao reduzir {entrada}")
+
+
+def _executar_downsample_10x(modulo, pid):
+    modulo.processar_acelerometro(pid)
+    modulo.processar_giroscopio(pid)
+
+
+def _executar_excel(modulo, pid):
+    modulo.convert_file(_saidas_10x(pid)[-1], _saida_excel(pid)[0])
+
+
+def _executar_clustering(modulo, pid):
+    from comum.resultados import escrever_janelas
+    _, _, labels, _, timestamps, movimento = modulo.analisar_pessoa(pid, modulo.N_CLUSTERS)
+    escrever_janelas(_saida_clustering(pid)[0], timestamps, labels, movimento)
+
+
+EXECUTORES = {
+    'downsample_2x': _executar_downsample_2x,
+    'downsample_10x': _executar_downsample_10x,
+    'excel': _executar_excel,
+    'clustering': _executar_clustering,
+}
+
+
+def executar_tarefa(estagio, pid):
+    """Roda um estágio para uma pessoa, a partir da raiz do repositório."""
+    os.chdir(RAIZ)
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    for saida in ESTAGIOS[estagio]['saidas'](pid):
+        saida.parent.mkdir(parents=True, exist_ok=True)
+    EXECUTORES[estagio](carregar_modulo(estagio), pid)
+    return estagio, pid
+
+
+# Manifesto
+
+class Hashes:
+    """sha256 de arquivos, reaproveitado enquanto tamanho e mtime não mudarem."""
+
+    def __init__(self, cache=None):
+        self.cache = cache or {}
+
+    def __call__(self, arquivo):
+        arquivo = Path(arquivo)
+        if not arquivo.exists():
+            return None
+        info = arquivo.stat()
+        chave = str(arquivo.relative_to(RAIZ))
+        anterior = self.cache.get(chave)
+        if anterior and anterior['tamanho'] == info.st_size and anterior['mtime_ns'] == info.st_mtime_ns:
+            return anterior['sha256']
+        h = hashlib.sha256()
+        with open(arquivo, 'rb') as f:
+            for bloco in iter(lambda: f.read(1 << 20), b''):
+                h.update(bloco)
+        self.cache[chave] = {'tamanho': info.st_size, 'mtime_ns': info.st_mtime_ns,
+                             'sha256': h.hexdigest()}
+        return h.hexdigest()
+
+
+def carregar_manifesto():
+    if MANIFESTO.exists():
+        with open(MANIFESTO, encoding='utf-8') as f:
+            return json.load(f)
+    return {'tarefas': {}, 'hashes': {}}
+
+
+def salvar_manifesto(manifesto):
+    MANIFESTO.parent.mkdir(parents=True, exist_ok=True)
+    temporario = MANIFESTO.with_suffix('.tmp')
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, indent=1, sort_keys=True)
+    os.replace(temporario, MANIFESTO)
+
+
+def assinatura(estagio, pid, hashes):
+    """O que determina as saídas da tarefa: entradas, parâmetros e código do estágio."""
+    definicao = ESTAGIOS[estagio]
+    parametros = {}
+    if definicao['parametros']:
+        modulo = carregar_modulo(estagio)
+        parametros = {nome: getattr(modulo, nome) for nome in definicao['parametros']}
+    entradas = definicao['entradas'](pid) + definicao.get('opcionais', lambda _: [])(pid)
+    return {
+        'entradas': {str(Path(a).relative_to(RAIZ)): hashes(a) for a in entradas},
+        'parametros': parametros,
+        'codigo': {str(a.relative_to(RAIZ)): hashes(a) for a in arquivos_codigo(estagio)},
+    }
+
+
+def desatualizada(estagio, pid, manifesto, hashes):
+    """Motivo para refazer a tarefa, ou None se estiver em dia."""
+    atual = assinatura(estagio, pid, hashes)
+    if any(hashes(a) is None for a in ESTAGIOS[estagio]['entradas'](pid)):
+        return 'entrada ausente'
+    registro = manifesto['tarefas'].get(f"{estagio}/{pid}")
+    if registro is None:
+        return 'nunca executada'
+    if not all(Path(s).exists() for s in ESTAGIOS[estagio]['saidas'](pid)):
+        return 'saída ausente'
+    for campo in ('entradas', 'parametros', 'codigo'):
+        if registro[campo] != atual[campo]:
+            return f'{campo} alterado'
+    return None
+
+
+def ordenar_estagios(estagios):
+    """Estágios pedidos mais os que eles dependem, em ordem topológica."""
+    ordem = []
+
+    def visitar(nome):
+        if nome in ordem:
+            return
+        for dep in ESTAGIOS[nome]['depende']:
+            visitar(dep)
+        ordem.append(nome)
+
+    for nome in estagios:
+        visitar(nome)
+    return ordem
+
+
+def executar(pessoas, estagios, forcar=False, simular=False, n_workers=N_WORKERS):
+    manifesto = carregar_manifesto()
+    hashes = Hashes(manifesto.get('hashes'))
+    estagios = ordenar_estagios(estagios)
+
+    pendentes = {(e, p) for e in estagios for p in pessoas}
+    feitas, falhas, refeitas = set(), set(), []
+    simuladas = set()   # Tarefas que seriam refeitas: as que dependem delas também seriam
+
+    def prontas():
+        # Pronta = todas as dependências terminaram (com sucesso ou não)
+        return sorted(
+            (t for t in pendentes
+             if all((dep, t[1]) in feitas | falhas for dep in ESTAGIOS[t[0]]['depende'])),
+            key=lambda t: (estagios.index(t[0]), t[1]))
+
+    # Núcleos divididos entre os workers: o K-means de cada tarefa não abre uma thread por núcleo
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=limitar_threads,
+                             initargs=(max(1, N_NUCLEOS // n_workers),)) as executor:
+        rodando = {}
+        while pendentes or rodando:
+            for tarefa in prontas():
+                pendentes.discard(tarefa)
+                estagio, pid = tarefa
+                if any((dep, pid) in falhas for dep in ESTAGIOS[estagio]['depende']):
+                    falhas.add(tarefa)
+                    print(f"  [PULADO] {estagio}/{pid}: dependência falhou")
+                    continue
+                motivo = 'forçado' if forcar else desatualizada(estagio, pid, manifesto, hashes)
+                if motivo is None and any((dep, pid) in simuladas for dep in ESTAGIOS[estagio]['depende']):
+                    motivo = 'dependência seria refeita'
+                if motivo is None:
+                    feitas.add(tarefa)
+                    continue
+                if motivo == 'entrada ausente' or simular:
+                    print(f"  [{'SIMULADO' if simular else 'PULADO'}] {estagio}/{pid}: {motivo}")
+                    (feitas if simular else falhas).add(tarefa)
+                    if simular and motivo != 'entrada ausente':
+                        simuladas.add(tarefa)
+                    continue
+                print(f"  [RODANDO] {estagio}/{pid} ({motivo})")
+                rodando[executor.submit(executar_tarefa, estagio, pid)] = (tarefa, assinatura(estagio, pid, hashes))
+
+            if not rodando:
+                continue
+            concluidos, _ = wait(rodando, return_when=FIRST_COMPLETED)
+            for futuro in concluidos:
+                (estagio, pid), registro = rodando.pop(futuro)
+                try:
+                    futuro.result()
+                except Exception as e:
+                    falhas.add((estagio, pid))
+                    print(f"  [ERRO] {estagio}/{pid}: {e}")
+                    continue
+                registro['saidas'] = {str(Path(s).relative_to(RAIZ)): hashes(s)
+                                      for s in ESTAGIOS[estagio]['saidas'](pid)}
+                manifesto['tarefas'][f"{estagio}/{pid}"] = registro
+                manifesto['hashes'] = hashes.cache
+                salvar_manifesto(manifesto)
+                feitas.add((estagio, pid))
+                refeitas.append((estagio, pid))
+                print(f"  [OK] {estagio}/{pid}")
+
+    manifesto['hashes'] = hashes.cache
+    if not simular:
+        salvar_manifesto(manifesto)
+    return refeitas, falhas
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Executa só as etapas desatualizadas do pipeline')
+    parser.add_argument('pessoas', type=int, nargs='*', help='IDs das pessoas (padrão: 11 a 38)')
+    parser.add_argument('--estagios', nargs='+', choices=list(ESTAGIOS), default=list(ESTAGIOS))
+    parser.add_argument('--forcar', action='store_true', help='Refaz tudo, mesmo o que está em dia')
+    parser.add_argument('--simular', action='store_true', help='Só lista o que seria refeito')
+    parser.add_argument('--workers', type=int, default=N_WORKERS)
+    args = parser.parse_args()
+
+    pessoas = args.pessoas or PESSOAS
+    print("="*60)
+    print("PIPELINE INCREMENTAL")
+    print("="*60)
+    print(f"Estágios: {', '.join(ordenar_estagios(args.estagios))} | Pessoas: {len(pessoas)}")
+
+    refeitas, falhas = executar(pessoas, args.estagios, args.forcar, args.simular, args.workers)
+
+    print(f"\nTarefas refeitas: {len(refeitas)} | Falhas/puladas: {len(falhas)}")
+    print(f"Manifesto: {MANIFESTO}")
+
+
+if __name__ == "__main__":
+    main()
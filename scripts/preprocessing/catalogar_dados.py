@@ -0,0 +1,42 @@
+"""
+Cria/atualiza o catálogo DATA/catalogo.json (linhas, intervalo de tempo, taxa de
+amostragem, lacunas, tamanho e hash de cada CSV de sensor).
+
+Só os arquivos novos ou modificados desde a última execução são relidos.
+
+Uso:
+    python scripts/preprocessing/catalogar_dados.py            # pessoas 11 a 38, raw/2x/10x
+    python scripts/preprocessing/catalogar_dados.py 11 12
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from comum.catalogo import ARQUIVO_CATALOGO, PESSOAS, atualizar_catalogo, tabela_catalogo
+
+
+def main():
+    pessoas = [int(a) for a in sys.argv[1:]] or list(PESSOAS)
+
+    print("="*60)
+    print("CATALOGO DOS DADOS DE SENSORES")
+    print("="*60)
+
+    catalogo = atualizar_catalogo(pessoas)
+    tabela = tabela_catalogo(catalogo)
+
+    print(f"\nArquivos relidos: {len(catalogo['atualizados'])} | Catalogados: {len(tabela)}")
+    resumo = tabela.groupby(['dataset', 'sensor']).agg(
+        pessoas=('pessoa_id', 'nunique'),
+        linhas=('linhas', 'sum'),
+        intervalo_mediano_s=('intervalo_mediano_s', 'median'),
+        lacunas=('n_lacunas', 'sum'),
+        mb=('tamanho_bytes', lambda b: b.sum() / 1e6),
+    )
+    print("\n" + resumo.to_string(float_format=lambda v: f"{v:.2f}"))
+    print(f"\n[OK] Catálogo salvo em: {ARQUIVO_CATALOGO}")
+
+
+if __name__ == "__main__":
+    main()
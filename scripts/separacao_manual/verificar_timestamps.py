@@ -1,5 +1,11 @@
+import sys
+from pathlib import Path
+
 import pandas as pd
-import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from comum.catalogo import atualizar_catalogo, info_sensor
+from comum.filtros import JANELA_GRAVIDADE, magnitude, magnitude_sem_gravidade
 
 # Carregar dados da pessoa 13
 df_a = pd.read_csv('DATA/Downsampling_data/ds_acelerometro/ds_acelerometro_13.csv')
@@ -8,21 +14,28 @@ df_g = pd.read_csv('DATA/Downsampling_data/ds_giroscopio/ds_giroscopio_13.csv')
 df_a['timestamp'] = pd.to_datetime(df_a['timestamp'])
 df_g['timestamp'] = pd.to_datetime(df_g['timestamp'])
 
+# Início, fim, total e taxa de amostragem vêm do catálogo (só relê se o arquivo mudou)
+catalogo = atualizar_catalogo(pessoas=[13], datasets=['2x'])
+info_a = info_sensor(13, '2x', 'acelerometro', catalogo)
+info_g = info_sensor(13, '2x', 'giroscopio', catalogo)
+
 print('='*60)
 print('PESSOA 13 - COMPARAÇÃO ACELEROMETRO vs GIROSCOPIO')
 print('='*60)
 
 print('\nACELEROMETRO:')
-print(f'  Inicio: {df_a["timestamp"].min()}')
-print(f'  Fim: {df_a["timestamp"].max()}')
-print(f'  Total: {len(df_a)} pontos')
+print(f'  Inicio: {info_a["inicio"]}')
+print(f'  Fim: {info_a["fim"]}')
+print(f'  Total: {info_a["linhas"]} pontos')
+print(f'  Intervalo mediano: {info_a["intervalo_mediano_s"]:.2f} s | Lacunas: {info_a["n_lacunas"]}')
 print(f'  Primeiras amostras:')
 print(df_a[['timestamp', 'x', 'y', 'z']].head(3))
 
 print('\nGIROSCOPIO:')
-print(f'  Inicio: {df_g["timestamp"].min()}')
-print(f'  Fim: {df_g["timestamp"].max()}')
-print(f'  Total: {len(df_g)} pontos')
+print(f'  Inicio: {info_g["inicio"]}')
+print(f'  Fim: {info_g["fim"]}')
+print(f'  Total: {info_g["linhas"]} pontos')
+print(f'  Intervalo mediano: {info_g["intervalo_mediano_s"]:.2f} s | Lacunas: {info_g["n_lacunas"]}')
 print(f'  Primeiras amostras:')
 print(df_g[['timestamp', 'x', 'y', 'z']].head(3))
 
@@ -31,19 +44,14 @@ print('ANALISE DE MAGNITUDE')
 print('='*60)
 
 # Calcular magnitude do acelerômetro (com gravidade)
-mag_a_bruto = np.sqrt(df_a['x']**2 + df_a['y']**2 + df_a['z']**2)
+xyz_a = df_a[['x', 'y', 'z']].to_numpy()
+mag_a_bruto = pd.Series(magnitude(xyz_a))
 
-# Calcular magnitude do acelerômetro SEM gravidade
-df_a['x_limpo'] = df_a['x'] - df_a['x'].rolling(window=200, center=True).mean()
-df_a['y_limpo'] = df_a['y'] - df_a['y'].rolling(window=200, center=True).mean()
-df_a['z_limpo'] = df_a['z'] - df_a['z'].rolling(window=200, center=True).mean()
-df_a['x_limpo'] = df_a['x_limpo'].fillna(0)
-df_a['y_limpo'] = df_a['y_limpo'].fillna(0)
-df_a['z_limpo'] = df_a['z_limpo'].fillna(0)
-mag_a_limpo = np.sqrt(df_a['x_limpo']**2 + df_a['y_limpo']**2 + df_a['z_limpo']**2)
+# Calcular magnitude do acelerômetro SEM gravidade (passa-alta nos três eixos, uma passada)
+mag_a_limpo = pd.Series(magnitude_sem_gravidade(xyz_a, janela=JANELA_GRAVIDADE))
 
 # Calcular magnitude do giroscópio
-mag_g = np.sqrt(df_g['x']**2 + df_g['y']**2 + df_g['z']**2)
+mag_g = pd.Series(magnitude(df_g[['x', 'y', 'z']].to_numpy()))
 
 print(f'\nACELEROMETRO (com gravidade):')
 print(f'  Média: {mag_a_bruto.mean():.3f}')
@@ -60,8 +68,9 @@ print(f'  Desvio padrão: {mag_g.std():.3f}')
 print('\n' + '='*60)
 print('CONCLUSAO')
 print('='*60)
-if df_a["timestamp"].min() == df_g["timestamp"].min():
+inicio_a, inicio_g = pd.Timestamp(info_a['inicio']), pd.Timestamp(info_g['inicio'])
+if inicio_a == inicio_g:
     print('✓ Timestamps coincidem - CORRETO')
 else:
     print('✗ Timestamps NÃO coincidem - PROBLEMA!')
-    print(f'  Diferença: {abs((df_a["timestamp"].min() - df_g["timestamp"].min()).total_seconds())} segundos')
+    print(f'  Diferença: {abs((inicio_a - inicio_g).total_seconds())} segundos')
@@ -0,0 +1,109 @@
+"""
+Verificação dos timestamps de todas as pessoas (substitui a checagem só da pessoa 13).
+
+Para cada pessoa e dataset: defasagem entre acelerômetro e giroscópio, duplicados,
+trechos fora de ordem, lacunas acima do limiar e histograma dos intervalos entre
+amostras. Gera um relatório JSON com a tolerância de sincronização e o tamanho de
+janela sugeridos por pessoa (lidos por `comum.timestamps.tolerancia_sincronizacao`).
+
+Rodar só algumas pessoas/datasets atualiza apenas essas entradas do relatório existente;
+as demais são mantidas. Se o limiar de lacuna mudou, o relatório é refeito do zero.
+
+Uso:
+    python scripts/separacao_manual/verificar_timestamps_coorte.py
+    python scripts/separacao_manual/verificar_timestamps_coorte.py 11 13 --datasets 2x --limiar-lacuna 120
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from comum.dados import DATASETS, arquivos_sensores
+from comum.timestamps import (
+    LIMIAR_LACUNA_S, RELATORIO_TIMESTAMPS, carregar_relatorio, verificar_pessoa_dataset
+)
+
+N_WORKERS = os.cpu_count()
+
+
+def verificar(pessoa_id, dataset, limiar_lacuna_s):
+    arquivo_accel, arquivo_gyro = arquivos_sensores(pessoa_id, dataset)
+    return pessoa_id, dataset, verificar_pessoa_dataset(arquivo_accel, arquivo_gyro, limiar_lacuna_s)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verificação dos timestamps de toda a coorte')
+    parser.add_argument('pessoas', type=int, nargs='*', help='IDs das pessoas (padrão: 11 a 38)')
+    parser.add_argument('--datasets', nargs='+', default=['raw', '2x'], choices=list(DATASETS))
+    parser.add_argument('--limiar-lacuna', type=float, default=LIMIAR_LACUNA_S,
+                        help='Intervalo (s) acima do qual conta como lacuna')
+    args = parser.parse_args()
+
+    pessoas = args.pessoas or list(range(11, 39))
+
+    print('='*60)
+    print('VERIFICACAO DE TIMESTAMPS - TODAS AS PESSOAS')
+    print('='*60)
+
+    # Entradas de outras pessoas/datasets continuam valendo se o limiar é o mesmo;
+    # com outro limiar, as que já estavam no relatório são verificadas de novo
+    tarefas = [(pid, ds) for pid in pessoas for ds in args.datasets]
+    relatorio = carregar_relatorio()
+    if relatorio is not None and relatorio.get('limiar_lacuna_s') != args.limiar_lacuna:
+        anteriores = [(int(pid), ds) for pid, datasets in relatorio['pessoas'].items()
+                      for ds in datasets if (int(pid), ds) not in tarefas]
+        print(f"[AVISO] Limiar de lacuna mudou ({relatorio.get('limiar_lacuna_s')} -> "
+              f"{args.limiar_lacuna} s): relatório refeito, {len(anteriores)} entradas anteriores "
+              f"verificadas de novo")
+        tarefas += anteriores
+        relatorio = None
+    if relatorio is None:
+        relatorio = {'limiar_lacuna_s': args.limiar_lacuna, 'pessoas': {}}
+    linhas = []
+    with ProcessPoolExecutor(max_workers=N_WORKERS) as executor:
+        futuros = {executor.submit(verificar, pid, ds, args.limiar_lacuna): (pid, ds)
+                   for pid, ds in tarefas}
+        for futuro, (pessoa_id, dataset) in futuros.items():
+            try:
+                _, _, resultado = futuro.result()
+            except Exception as e:
+                print(f'[ERRO] Pessoa {pessoa_id} ({dataset}): {e}')
+                continue
+            relatorio['pessoas'].setdefault(str(pessoa_id), {})[dataset] = resultado
+            defasagem = resultado.get('defasagem', {})
+            linhas.append({
+                'pessoa': pessoa_id, 'dataset': dataset,
+                'defasagem_inicio_s': defasagem.get('inicio_s'),
+                'defasagem_p99_s': defasagem.get('p99_abs_s'),
+                'dup': resultado['acelerometro']['duplicados'] + resultado['giroscopio']['duplicados'],
+                'fora_ordem': (resultado['acelerometro']['trechos_fora_de_ordem']
+                               + resultado['giroscopio']['trechos_fora_de_ordem']),
+                'lacunas_accel': resultado['acelerometro']['lacunas'],
+                'lacunas_gyro': resultado['giroscopio']['lacunas'],
+                'tolerancia_s': resultado.get('tolerancia_sugerida_s'),
+                'frac_tolerancia': defasagem.get('fracao_dentro_tolerancia_sugerida'),
+                'janela': resultado.get('janela_sugerida_amostras'),
+            })
+
+    RELATORIO_TIMESTAMPS.parent.mkdir(parents=True, exist_ok=True)
+    temporario = RELATORIO_TIMESTAMPS.with_suffix('.tmp')
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, indent=1)
+    os.replace(temporario, RELATORIO_TIMESTAMPS)
+
+    if linhas:
+        tabela = pd.DataFrame(linhas).sort_values(['dataset', 'pessoa'])
+        print('\n' + tabela.to_string(index=False, float_format=lambda v: f'{v:.4f}'))
+        problemas = tabela[(tabela['dup'] > 0) | (tabela['fora_ordem'] > 0)]
+        print(f'\nPessoas/datasets com duplicados ou fora de ordem: {len(problemas)}')
+    print(f'\n[OK] Relatório: {RELATORIO_TIMESTAMPS}')
+
+
+if __name__ == '__main__':
+    main()
@@ -5,8 +5,12 @@ Mostra apenas os 3 eixos (X, Y, Z) em um gráfico simples
 
 import pandas as pd
 import matplotlib.pyplot as plt
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from comum.dados import ler_par
+
 # Configurações
 DATA_DIR = Path("DATA/Downsampling_data")
 
@@ -23,11 +27,8 @@ def carregar_dados_pessoa(pessoa_id):
     accel_file = DATA_DIR / "ds_acelerometro" / f"ds_acelerometro_{pessoa_id}.csv"
     gyro_file = DATA_DIR / "ds_giroscopio" / f"ds_giroscopio_{pessoa_id}.csv"
     
-    # Carregar dados
-    df_accel = pd.read_csv(accel_file)
-    df_gyro = pd.read_csv(gyro_file)
-    
-    return df_accel, df_gyro
+    # Carregar dados (os dois arquivos ao mesmo tempo)
+    return ler_par(accel_file, gyro_file, leitor=pd.read_csv)
 
 def plotar_dados_acelerometro(df, pessoa_id):
     """
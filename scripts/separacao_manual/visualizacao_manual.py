@@ -7,11 +7,19 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from comum.dados import ler_par
+from comum.janelas_moveis import contar_acima, desvios_moveis
+from comum.timestamps import TOLERANCIA_PADRAO_S, tolerancia_sincronizacao
+
 # Configurações
 PESSOA_ID = 11  # ID da pessoa a analisar
 DATA_DIR = Path("DATA/Downsampling_data")
+JANELA_VARIACAO = 50  # ~50 amostras por janela
+ESTADOS_MOVIMENTO = ['parado', 'movimento']  # códigos 0 e 1 da coluna 'estado'
 
 def carregar_dados_pessoa(pessoa_id):
     """
@@ -26,22 +34,23 @@ def carregar_dados_pessoa(pessoa_id):
     accel_file = DATA_DIR / "ds_acelerometro" / f"ds_acelerometro_{pessoa_id}.csv"
     gyro_file = DATA_DIR / "ds_giroscopio" / f"ds_giroscopio_{pessoa_id}.csv"
     
-    # Carregar dados
-    df_accel = pd.read_csv(accel_file)
-    df_accel['timestamp'] = pd.to_datetime(df_accel['timestamp'])
-    
-    df_gyro = pd.read_csv(gyro_file)
-    df_gyro['timestamp'] = pd.to_datetime(df_gyro['timestamp'])
-    
-    return df_accel, df_gyro
+    # Carregar dados (os dois arquivos ao mesmo tempo)
+    return ler_par(accel_file, gyro_file, leitor=_ler_sensor)
+
+def _ler_sensor(arquivo):
+    df = pd.read_csv(arquivo)
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    return df
 
-def sincronizar_dados(df_accel, df_gyro):
+def sincronizar_dados(df_accel, df_gyro, tolerancia=TOLERANCIA_PADRAO_S):
     """
     Sincroniza dados de acelerômetro e giroscópio baseado em timestamps
     
     Args:
         df_accel: DataFrame com dados do acelerômetro
         df_gyro: DataFrame com dados do giroscópio
+        tolerancia: Diferença máxima (s) entre amostras combinadas
+                    (por pessoa: comum.timestamps.tolerancia_sincronizacao)
     
     Returns:
         DataFrame: Dados sincronizados
@@ -59,7 +68,7 @@ def sincronizar_dados(df_accel, df_gyro):
         df_gyro, 
         on='timestamp', 
         direction='nearest',
-        tolerance=pd.Timedelta(seconds=0.1)
+        tolerance=pd.Timedelta(seconds=tolerancia)
     )
     
     # Remover linhas com valores NaN
@@ -153,7 +162,24 @@ def plotar_dados_giroscopio(df, pessoa_id):
     
     plt.close()
 
-def separar_manual_movimento(df, threshold_variacao=1.0):
+def classificar_movimento(variacao, threshold_variacao, estado_borda='parado'):
+    """
+    Classifica cada ponto em parado (0) / movimento (1) a partir da variação.
+    
+    As bordas sem janela completa (variação NaN) recebem explicitamente `estado_borda`.
+    
+    Returns:
+        Categorical com categorias ESTADOS_MOVIMENTO
+    """
+    codigos = np.select(
+        [np.isnan(variacao), variacao > threshold_variacao],
+        [ESTADOS_MOVIMENTO.index(estado_borda), 1],
+        default=0
+    ).astype(np.int8)
+    return pd.Categorical.from_codes(codigos, categories=ESTADOS_MOVIMENTO)
+
+def separar_manual_movimento(df, threshold_variacao=1.0, window_size=JANELA_VARIACAO,
+                             estado_borda='parado'):
     """
     Separa automaticamente períodos de movimento vs parado baseado em variação
     (pode ser ajustado manualmente depois)
@@ -161,6 +187,8 @@ def separar_manual_movimento(df, threshold_variacao=1.0):
     Args:
         df: DataFrame com dados sincronizados
         threshold_variacao: Limiar de variação para considerar movimento
+        window_size: Número de amostras da janela móvel (centralizada)
+        estado_borda: Estado atribuído às bordas sem janela completa
     
     Returns:
         DataFrame: Dados com coluna 'estado' (parado ou movimento)
@@ -168,21 +196,17 @@ def separar_manual_movimento(df, threshold_variacao=1.0):
     # Calcular magnitude
     magnitude = calcular_magnitude(df)
     
-    # Calcular variação em janelas móveis
-    window_size = 50 # ~50 amostras por janela
-    variacao = magnitude.rolling(window=window_size, center=True).std()
+    # Calcular variação em janelas móveis (somas acumuladas, O(n))
+    variacao = desvios_moveis(magnitude.to_numpy(), [window_size])[0]
     
     # Classificar baseado no threshold
     df['magnitude'] = magnitude
     df['variacao'] = variacao
-    df['estado'] = df['variacao'].apply(
-        lambda x: 'movimento' if x > threshold_variacao else 'parado'
-    )
+    df['estado'] = classificar_movimento(variacao, threshold_variacao, estado_borda)
     
     # Estatísticas
     total_pontos = len(df)
-    parado = (df['estado'] == 'parado').sum()
-    movimento = (df['estado'] == 'movimento').sum()
+    parado, movimento = np.bincount(df['estado'].cat.codes, minlength=2)
     
     print("\n" + "="*60)
     print("ESTATISTICAS DA SEPARACAO")
@@ -195,6 +219,42 @@ def separar_manual_movimento(df, threshold_variacao=1.0):
     
     return df
 
+def varrer_limiares(pessoas, janelas=(25, 50, 100), limiares=np.arange(0.25, 3.01, 0.25),
+                    estado_borda='parado'):
+    """
+    Fração de pontos em movimento para cada pessoa, tamanho de janela e limiar.
+    
+    Para cada pessoa a variação é calculada uma única vez para todas as janelas;
+    a grade de limiares é avaliada sobre os valores ordenados, sem recalcular nada.
+    
+    Args:
+        pessoas: IDs das pessoas
+        janelas: Tamanhos de janela (amostras)
+        limiares: Grade de limiares de variação
+        estado_borda: Estado das bordas sem janela completa
+    
+    Returns:
+        DataFrame: colunas pessoa_id, janela, limiar, fracao_movimento
+    """
+    linhas = []
+    for pessoa_id in pessoas:
+        try:
+            df_accel, df_gyro = carregar_dados_pessoa(pessoa_id)
+        except Exception as e:
+            print(f"   [ERRO] Falha ao carregar pessoa {pessoa_id}: {e}")
+            continue
+        df = sincronizar_dados(df_accel, df_gyro, tolerancia_sincronizacao(pessoa_id))
+        variacoes = desvios_moveis(calcular_magnitude(df).to_numpy(), janelas)
+        acima, n_borda = contar_acima(variacoes, limiares)
+        if estado_borda == 'movimento':
+            acima = acima + n_borda[:, None]
+        fracoes = acima / len(df)
+        for janela, fracoes_janela in zip(janelas, fracoes):
+            for limiar, fracao in zip(limiares, fracoes_janela):
+                linhas.append((pessoa_id, janela, limiar, fracao))
+    
+    return pd.DataFrame(linhas, columns=['pessoa_id', 'janela', 'limiar', 'fracao_movimento'])
+
 def plotar_separacao(df, pessoa_id):
     """
     Plota os dados com a separação parado/movimento destacada
@@ -269,7 +329,7 @@ def analisar_pessoa(pessoa_id):
         
         # 2. Sincronizar dados
         print("\n[2/3] Sincronizando dados...")
-        df_combined = sincronizar_dados(df_accel, df_gyro)
+        df_combined = sincronizar_dados(df_accel, df_gyro, tolerancia_sincronizacao(pessoa_id))
         print(f"   [OK] Dados sincronizados: {len(df_combined)} pontos")
         
         # 3. Plotar dados brutos do acelerômetro
@@ -282,10 +342,33 @@ def analisar_pessoa(pessoa_id):
         print(f"\n[ERRO] Falha ao processar pessoa {pessoa_id}: {e}")
         return False
 
+def main_varredura():
+    """
+    Varre a grade de limiares/janelas para todas as pessoas e salva um CSV
+    """
+    print("="*60)
+    print("VARREDURA DE LIMIARES - PARADO vs MOVIMENTO")
+    print("="*60)
+    
+    varredura = varrer_limiares(range(11, 39))
+    output_dir = Path("outputs") / "separacao_manual"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_path = output_dir / "varredura_limiares.csv"
+    varredura.to_csv(output_path, index=False, float_format='%.4f')
+    
+    resumo = varredura.pivot_table(index='limiar', columns='janela', values='fracao_movimento')
+    print("\nFracao media de movimento (linhas: limiar, colunas: janela):")
+    print(resumo.to_string(float_format=lambda v: f"{v:.1%}"))
+    print(f"\n[OK] Varredura salva em: {output_path}")
+
 def main():
     """
     Função principal - processa todas as pessoas de 11 a 38
     """
+    if '--varrer' in sys.argv:
+        main_varredura()
+        return
+    
     print("="*60)
     print("VISUALIZACAO DE DADOS - ACELEROMETRO E GIROSCOPIO")
     print("="*60)
@@ -0,0 +1,212 @@
+"""
+Detecção automática dos períodos de sono (substitui a digitação HH:MM de separacao_interativa.py)
+
+Critério: desvio padrão móvel da magnitude do acelerômetro (somas acumuladas, O(n)).
+- Entra em sono quando a variação fica abaixo de LIMIAR_ENTRADA
+- Sai do sono quando a variação passa de LIMIAR_SAIDA (histerese: evita alternar a cada amostra)
+- Interrupções curtas (< MAX_INTERRUPCAO_MIN) são absorvidas e períodos curtos
+  (< MIN_SONO_MIN) são descartados
+
+Os períodos são gravados no mesmo formato periodos_sono<ID>.txt e comparados com
+a marcação manual de Analise_objetiva/. A comparação usa o arquivo gravado, expandido
+como as outras ferramentas o leem (IndiceSono: HH:MM repetido em cada dia da gravação),
+e não a máscara da detecção, que tem datas e pode diferir dessa expansão.
+
+Uso:
+    python scripts/separacao_visual/deteccao_sono.py            # pessoas 11 a 38
+    python scripts/separacao_visual/deteccao_sono.py 11 13
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from comum.janelas_moveis import desvio_movel
+from comum.indice_sono import IndiceSono, arquivo_periodos
+from comum.periodos_sono import escrever_periodos_sono, ler_periodos_sono
+
+# Configurações
+DATA_DIR = Path("DATA/SemDownsampling_data")
+OUTPUT_BASE = Path("outputs/separacao_visual")
+DIR_MANUAL = OUTPUT_BASE / "Analise_objetiva"       # períodos marcados à mão
+DIR_AUTOMATICO = OUTPUT_BASE / "Analise_automatica"  # períodos detectados
+
+JANELA_MIN = 5             # Janela do desvio móvel (minutos)
+LIMIAR_ENTRADA = 0.15      # Variação (m/s²) abaixo da qual começa o sono
+LIMIAR_SAIDA = 0.40        # Variação (m/s²) acima da qual termina o sono
+MIN_SONO_MIN = 30          # Duração mínima de um período de sono (minutos)
+MAX_INTERRUPCAO_MIN = 10   # Despertares mais curtos que isso são absorvidos (minutos)
+N_WORKERS = os.cpu_count()
+
+
+def carregar_acelerometro(pessoa_id):
+    """Carrega apenas o acelerômetro (timestamp e eixos) ordenado por tempo."""
+    accel_file = DATA_DIR / "acelerometro" / f"acelerometro_{pessoa_id}.csv"
+    df = pd.read_csv(accel_file, usecols=['timestamp', 'x', 'y', 'z'])
+    df['timestamp'] = pd.to_datetime(df['timestamp']).dt.tz_localize(None)
+    return df.sort_values('timestamp', ignore_index=True)
+
+
+def histerese(valores, limiar_entrada, limiar_saida):
+    """
+    Estado com histerese, vetorizado: True abaixo de limiar_entrada, False acima de
+    limiar_saida e, entre os dois (ou em NaN), repete o último estado definido.
+    Começa acordado.
+    """
+    n = len(valores)
+    with np.errstate(invalid='ignore'):
+        abaixo = valores < limiar_entrada
+        acima = valores > limiar_saida
+    definido = abaixo | acima
+
+    # Índice da última amostra com estado definido até cada posição
+    ultimo = np.maximum.accumulate(np.where(definido, np.arange(n), -1))
+    return np.where(ultimo >= 0, abaixo[np.maximum(ultimo, 0)], False)
+
+
+def trechos(estado):
+    """Início (inclusivo) e fim (exclusivo) de cada sequência de True."""
+    borda = np.diff(np.concatenate(([0], estado.astype(np.int8), [0])))
+    return np.flatnonzero(borda == 1), np.flatnonzero(borda == -1)
+
+
+def detectar_periodos_sono(df_accel, janela_min=JANELA_MIN, limiar_entrada=LIMIAR_ENTRADA,
+                           limiar_saida=LIMIAR_SAIDA, min_sono_min=MIN_SONO_MIN,
+                           max_interrupcao_min=MAX_INTERRUPCAO_MIN):
+    """
+    Detecta períodos de sono no acelerômetro.
+
+    Args:
+        df_accel: DataFrame com timestamp, x, y, z (ordenado por tempo)
+
+    Returns:
+        tuple: (lista de (inicio, fim) em pd.Timestamp, máscara booleana por amostra)
+    """
+    ts = df_accel['timestamp'].to_numpy('datetime64[ns]')
+    if len(ts) < 2:
+        return [], np.zeros(len(ts), dtype=bool)
+
+    # Converter a janela de minutos para amostras usando o intervalo típico entre amostras
+    dt = np.median(np.diff(ts)) / np.timedelta64(1, 's')
+    janela = max(2, int(round(janela_min * 60 / dt)))
+
+    magnitude = np.sqrt(df_accel['x'] ** 2 + df_accel['y'] ** 2 + df_accel['z'] ** 2).to_numpy()
+    variacao = desvio_movel(magnitude, janela)
+    dormindo = histerese(variacao, limiar_entrada, limiar_saida)
+
+    inicios, fins = trechos(dormindo)
+    if len(inicios):
+        # Juntar períodos separados por despertares curtos
+        pausa = (ts[inicios[1:]] - ts[fins[:-1] - 1]) / np.timedelta64(1, 'm')
+        novo = pausa >= max_interrupcao_min
+        inicios = inicios[np.concatenate(([True], novo))]
+        fins = fins[np.concatenate((novo, [True]))]
+
+        # Descartar períodos curtos
+        duracao = (ts[fins - 1] - ts[inicios]) / np.timedelta64(1, 'm')
+        longo = duracao >= min_sono_min
+        inicios, fins = inicios[longo], fins[longo]
+
+    mascara = np.zeros(len(ts), dtype=bool)
+    for a, b in zip(inicios, fins):
+        mascara[a:b] = True
+
+    periodos = [(pd.Timestamp(ts[a]), pd.Timestamp(ts[b - 1])) for a, b in zip(inicios, fins)]
+    return periodos, mascara
+
+
+def concordancia(automatico, manual):
+    """Acordo por amostra entre duas máscaras dormindo (True) / acordado (False)."""
+    n = len(manual)
+    vp = int((automatico & manual).sum())
+    vn = int((~automatico & ~manual).sum())
+    acordo = (vp + vn) / n if n else np.nan
+
+    # Kappa de Cohen: acordo corrigido pelo acaso
+    p_auto, p_manual = automatico.mean(), manual.mean()
+    esperado = p_auto * p_manual + (1 - p_auto) * (1 - p_manual)
+    kappa = (acordo - esperado) / (1 - esperado) if esperado < 1 else np.nan
+
+    return {
+        'acordo': acordo,
+        'kappa': kappa,
+        'sensibilidade_sono': vp / manual.sum() if manual.any() else np.nan,
+        'especificidade_sono': vn / (~manual).sum() if (~manual).any() else np.nan,
+    }
+
+
+def processar_pessoa(pessoa_id):
+    """Detecta, grava e compara os períodos de sono de uma pessoa."""
+    df_accel = carregar_acelerometro(pessoa_id)
+    periodos, dormindo = detectar_periodos_sono(df_accel)
+
+    arquivo = arquivo_periodos(pessoa_id, DIR_AUTOMATICO)
+    arquivo.parent.mkdir(parents=True, exist_ok=True)
+    escrever_periodos_sono(arquivo, pessoa_id, periodos)
+
+    # Rótulos que as outras ferramentas vão usar: o arquivo HH:MM relido e expandido por dia
+    ts = df_accel['timestamp']
+    extensao = (ts.iloc[0], ts.iloc[-1])
+    salvo = IndiceSono.de_periodos({pessoa_id: (ler_periodos_sono(arquivo), *extensao)})
+    automatico = salvo.estado_em(ts, pessoa_id)
+
+    resultado = {
+        'pessoa_id': pessoa_id,
+        'amostras': len(df_accel),
+        'periodos_automaticos': len(periodos),
+        'fracao_sono_detectada': dormindo.mean(),     # máscara da detecção, antes do HH:MM
+        'fracao_sono_automatica': automatico.mean(),  # arquivo gravado
+    }
+
+    periodos_manuais = ler_periodos_sono(arquivo_periodos(pessoa_id, DIR_MANUAL))
+    resultado['periodos_manuais'] = len(periodos_manuais)
+    if periodos_manuais:
+        indice = IndiceSono.de_periodos({pessoa_id: (periodos_manuais, *extensao)})
+        manual = indice.estado_em(ts, pessoa_id)
+        resultado['fracao_sono_manual'] = manual.mean()
+        resultado.update(concordancia(automatico, manual))
+
+    return resultado
+
+
+def main():
+    pessoas = [int(a) for a in sys.argv[1:]] or list(range(11, 39))
+
+    print("="*80)
+    print("DETECÇÃO AUTOMÁTICA DE PERÍODOS DE SONO")
+    print("="*80)
+    print(f"Janela: {JANELA_MIN} min | Limiares: entra < {LIMIAR_ENTRADA}, sai > {LIMIAR_SAIDA}")
+    print(f"Sono mínimo: {MIN_SONO_MIN} min | Interrupção máxima: {MAX_INTERRUPCAO_MIN} min")
+
+    resultados = []
+    with ProcessPoolExecutor(max_workers=N_WORKERS) as executor:
+        futuros = {executor.submit(processar_pessoa, pid): pid for pid in pessoas}
+        for futuro, pessoa_id in futuros.items():
+            try:
+                resultados.append(futuro.result())
+            except Exception as e:
+                print(f"[ERRO] Falha ao processar pessoa {pessoa_id}: {e}")
+
+    if not resultados:
+        return
+
+    relatorio = pd.DataFrame(resultados)
+    DIR_AUTOMATICO.mkdir(parents=True, exist_ok=True)
+    relatorio_path = DIR_AUTOMATICO / "concordancia_manual.csv"
+    relatorio.to_csv(relatorio_path, index=False, float_format='%.4f')
+
+    print("\n" + relatorio.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    if 'acordo' in relatorio:
+        print(f"\nAcordo médio com a marcação manual: {relatorio['acordo'].mean():.1%}")
+        print(f"Kappa médio: {relatorio['kappa'].mean():.3f}")
+    print(f"\n[OK] Períodos salvos em: {DIR_AUTOMATICO}/pessoa_<ID>/periodos_sono/")
+    print(f"[OK] Relatório: {relatorio_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Marcação interativa dos períodos de sono com zoom (substitui a digitação HH:MM).
+
+O acelerômetro é desenhado a partir de uma pirâmide mín/máx (comum/piramide.py):
+a cada zoom ou pan só o intervalo visível é lido, no nível de detalhe que cabe na
+tela, então a gravação inteira em resolução máxima continua fluida.
+
+Controles:
+    arrastar com o botão esquerdo   marca um período de sono
+    u                               desfaz a última marcação
+    s                               salva em periodos_sono<ID>.txt
+    zoom/pan                        pela barra de ferramentas do matplotlib
+
+Uso:
+    python scripts/separacao_visual/marcacao_zoom.py 11
+    python scripts/separacao_visual/separacao_interativa.py --zoom
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+from matplotlib.widgets import SpanSelector
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from comum.periodos_sono import escrever_periodos_sono
+from comum.piramide import Piramide, construir_piramide, envelope
+
+DATA_DIR = Path("DATA/SemDownsampling_data")
+OUTPUT_BASE = Path("outputs/separacao_visual")
+DIR_PIRAMIDES = OUTPUT_BASE / "piramides"
+
+MAX_PONTOS = 2000    # Blocos mín/máx desenhados por canal (~ largura da tela em pixels)
+CORES = {'x': 'orange', 'y': 'blue', 'z': 'green'}
+
+
+def piramide_pessoa(pessoa_id, df_accel=None):
+    """
+    Abre a pirâmide do acelerômetro da pessoa, construindo-a se não existir ou se o
+    CSV de origem for mais recente.
+    """
+    diretorio = DIR_PIRAMIDES / f"pessoa_{pessoa_id}"
+    origem = DATA_DIR / "acelerometro" / f"acelerometro_{pessoa_id}.csv"
+    meta = diretorio / "meta.json"
+    if meta.exists() and (not origem.exists() or meta.stat().st_mtime >= origem.stat().st_mtime):
+        return Piramide(diretorio)
+
+    if df_accel is None:
+        df_accel = pd.read_csv(origem, usecols=['timestamp', 'x', 'y', 'z'])
+        df_accel['timestamp'] = pd.to_datetime(df_accel['timestamp']).dt.tz_localize(None)
+        df_accel = df_accel.sort_values('timestamp', ignore_index=True)
+    print(f"  Construindo pirâmide de zoom em {diretorio}...")
+    return construir_piramide(df_accel['timestamp'], df_accel[['x', 'y', 'z']].to_numpy(), diretorio)
+
+
+class MarcadorSono:
+    """Janela matplotlib com o envelope do acelerômetro e seleção de períodos de sono."""
+
+    def __init__(self, piramide, pessoa_id, periodos=()):
+        self.piramide = piramide
+        self.pessoa_id = pessoa_id
+        self.periodos = list(periodos)
+        self.faixas = []
+        self.fundo = None
+
+        self.fig, self.ax = plt.subplots(figsize=(16, 6))
+        self.canvas = self.fig.canvas
+        self.linhas = [
+            self.ax.plot([], [], color=CORES.get(canal, None), linewidth=0.5,
+                         alpha=0.8, label=canal.upper(), animated=True)[0]
+            for canal in piramide.canais
+        ]
+
+        inicio, fim = piramide.inicio, piramide.fim
+        _, minimos, maximos, _ = piramide.consultar(inicio, fim, MAX_PONTOS)
+        margem = 0.05 * float(maximos.max() - minimos.min())
+        self.ax.set_xlim(mdates.date2num(pd.Timestamp(inicio)), mdates.date2num(pd.Timestamp(fim)))
+        self.ax.set_ylim(float(minimos.min()) - margem, float(maximos.max()) + margem)
+
+        self.ax.set_title(f'Acelerômetro - Pessoa {pessoa_id} '
+                          '(arraste para marcar sono | u: desfazer | s: salvar)',
+                          fontsize=13, fontweight='bold')
+        self.ax.set_ylabel('Aceleração', fontsize=12)
+        self.ax.legend(handles=self.linhas, loc='upper left')
+        self.ax.grid(True, alpha=0.3)
+        self.ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
+        self.ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+
+        for inicio_p, fim_p in self.periodos:
+            self._desenhar_faixa(inicio_p, fim_p)
+        self._atualizar_dados()
+
+        self.ax.callbacks.connect('xlim_changed', lambda ax: self._atualizar_dados())
+        self.canvas.mpl_connect('draw_event', self._ao_desenhar)
+        self.canvas.mpl_connect('key_press_event', self._ao_teclar)
+        self.seletor = SpanSelector(self.ax, self._ao_selecionar, 'horizontal', useblit=True,
+                                    props=dict(alpha=0.3, facecolor='gray'),
+                                    interactive=False, drag_from_anywhere=False)
+
+    def _atualizar_dados(self):
+        """Lê da pirâmide só o intervalo visível e troca os dados das linhas."""
+        x0, x1 = self.ax.get_xlim()
+        inicio = np.datetime64(mdates.num2date(x0).replace(tzinfo=None), 'ns')
+        fim = np.datetime64(mdates.num2date(x1).replace(tzinfo=None), 'ns')
+        t, minimos, maximos, _ = self.piramide.consultar(inicio, fim, MAX_PONTOS)
+        tt, vv = envelope(t, minimos, maximos)
+        xs = mdates.date2num(tt)
+        for c, linha in enumerate(self.linhas):
+            linha.set_data(xs, vv[:, c])
+
+    def _ao_desenhar(self, evento):
+        # Fundo (eixos, grade, faixas) guardado a cada redesenho completo;
+        # as linhas animadas são desenhadas por cima e copiadas com blit
+        self.fundo = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._blit()
+
+    def _blit(self):
+        if self.fundo is None:
+            return
+        self.canvas.restore_region(self.fundo)
+        for linha in self.linhas:
+            self.ax.draw_artist(linha)
+        self.canvas.blit(self.ax.bbox)
+
+    def _desenhar_faixa(self, inicio, fim):
+        self.faixas.append(self.ax.axvspan(inicio, fim, color='gray', alpha=0.3, zorder=0))
+
+    def _ao_selecionar(self, x0, x1):
+        if x1 <= x0:
+            return
+        inicio = pd.Timestamp(mdates.num2date(x0).replace(tzinfo=None)).floor('min')
+        fim = pd.Timestamp(mdates.num2date(x1).replace(tzinfo=None)).ceil('min')
+        self.periodos.append((inicio, fim))
+        self._desenhar_faixa(inicio, fim)
+        print(f"  [OK] Período marcado: {inicio.strftime('%H:%M')} até {fim.strftime('%H:%M')}")
+        self.canvas.draw_idle()
+
+    def _ao_teclar(self, evento):
+        if evento.key == 'u' and self.periodos:
+            inicio, fim = self.periodos.pop()
+            self.faixas.pop().remove()
+            print(f"  [DESFEITO] {inicio.strftime('%H:%M')} até {fim.strftime('%H:%M')}")
+            self.canvas.draw_idle()
+        elif evento.key == 's':
+            self.salvar()
+
+    def periodos_ordenados(self):
+        """Períodos marcados em ordem, com sobreposições unidas."""
+        unidos = []
+        for inicio, fim in sorted(self.periodos):
+            if unidos and inicio <= unidos[-1][1]:
+                unidos[-1] = (unidos[-1][0], max(unidos[-1][1], fim))
+            else:
+                unidos.append((inicio, fim))
+        return unidos
+
+    def salvar(self):
+        """Grava os períodos marcados no periodos_sono<ID>.txt da pessoa."""
+        periodos_dir = OUTPUT_BASE / f"pessoa_{self.pessoa_id}" / "periodos_sono"
+        periodos_dir.mkdir(parents=True, exist_ok=True)
+        arquivo = periodos_dir / f"periodos_sono{self.pessoa_id}.txt"
+        escrever_periodos_sono(arquivo, self.pessoa_id, self.periodos_ordenados())
+        print(f"  [OK] {len(self.periodos_ordenados())} período(s) salvos em: {arquivo}")
+        return arquivo
+
+
+def marcar_periodos_interativo(pessoa_id, df_accel=None):
+    """
+    Abre a janela de marcação e retorna os períodos marcados ao fechá-la.
+
+    Returns:
+        list: [(inicio, fim), ...] como pd.Timestamp, ordenados e sem sobreposição
+    """
+    marcador = MarcadorSono(piramide_pessoa(pessoa_id, df_accel), pessoa_id)
+    plt.show()
+    return marcador.periodos_ordenados()
+
+
+def main():
+    pessoas = [int(a) for a in sys.argv[1:]] or [int(input("ID da pessoa (11-38): ").strip())]
+    for pessoa_id in pessoas:
+        print(f"\nPessoa {pessoa_id}: feche a janela para terminar (s salva a qualquer momento)")
+        marcador = MarcadorSono(piramide_pessoa(pessoa_id), pessoa_id)
+        plt.show()
+        if marcador.periodos:
+            marcador.salvar()
+        else:
+            print("  [AVISO] Nenhum período marcado.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Visão geral da coorte em uma única figura (substitui abrir um PNG por pessoa).
+
+Um painel por pessoa, em grade, com:
+    - envelope mín/máx do acelerômetro (pirâmide em cache, comum/piramide.py)
+    - períodos de sono manuais (Analise_objetiva) como faixas de fundo
+    - linha do tempo dos códigos de movimento da última execução do clustering
+      (armazém em outputs/resultados_clustering/execucoes), como uma faixa colorida
+
+Cada painel desenha no máximo PONTOS_PAINEL blocos por canal, qualquer que seja a
+duração da gravação, e cada elemento é uma única coleção do matplotlib; a figura
+inteira sai em poucos segundos. As pirâmides que faltam são construídas em paralelo.
+
+Uso:
+    python scripts/separacao_visual/mosaico_coorte.py
+    python scripts/separacao_visual/mosaico_coorte.py 11 12 13 --colunas 3
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from comum.armazem_resultados import ler_resultados
+from comum.indice_sono import IndiceSono
+from comum.piramide import envelope
+from comum.rotulos import CORES_MOVIMENTO
+from marcacao_zoom import CORES, OUTPUT_BASE, piramide_pessoa
+
+DIR_MANUAL = OUTPUT_BASE / "Analise_objetiva"
+ARQUIVO_MOSAICO = OUTPUT_BASE / "mosaico_coorte.png"
+PONTOS_PAINEL = 400      # Blocos mín/máx por canal em cada painel
+COLUNAS = 4
+N_WORKERS = os.cpu_count()
+
+
+def _construir(pessoa_id):
+    piramide_pessoa(pessoa_id)
+    return pessoa_id
+
+
+def _faixas(inicios, fins):
+    """(início, largura) em números de data do matplotlib, para broken_barh."""
+    a = mdates.date2num(inicios)
+    return np.column_stack([a, mdates.date2num(fins) - a])
+
+
+def trechos_movimento(meio, movimento):
+    """
+    Agrupa janelas consecutivas com o mesmo código em trechos (início, fim, código).
+
+    Cada janela cobre meio passo (intervalo mediano entre centros) para cada lado; um
+    trecho também termina onde há uma lacuna maior que 1,5 passo entre janelas.
+    """
+    t = np.asarray(meio, dtype='datetime64[ns]').view(np.int64)
+    movimento = np.asarray(movimento)
+    if len(t) == 0:
+        return np.zeros(0, 'datetime64[ns]'), np.zeros(0, 'datetime64[ns]'), movimento
+    passo = int(np.median(np.diff(t))) if len(t) > 1 else 0
+    corte = np.flatnonzero((np.diff(movimento) != 0) | (np.diff(t) > 1.5 * passo)) + 1
+    inicios = np.concatenate([[0], corte])
+    fins = np.concatenate([corte, [len(t)]]) - 1
+    return ((t[inicios] - passo // 2).view('datetime64[ns]'),
+            (t[fins] + passo // 2).view('datetime64[ns]'),
+            movimento[inicios])
+
+
+def desenhar_painel(ax, pessoa_id, piramide, janelas=None, indice=None):
+    """Envelope do acelerômetro, sono manual (IndiceSono) e faixa de códigos de movimento de uma pessoa."""
+    tt, vv = envelope(*piramide.consultar(piramide.inicio, piramide.fim, PONTOS_PAINEL)[:3])
+    x = mdates.date2num(tt)
+    for c, canal in enumerate(piramide.canais):
+        ax.plot(x, vv[:, c], color=CORES.get(canal), linewidth=0.3, alpha=0.8)
+
+    faixa_x = ax.get_xaxis_transform()      # x em datas, y em fração do eixo
+    if indice is not None and pessoa_id in indice:
+        inicios, fins = indice.intervalos(pessoa_id, piramide.inicio, piramide.fim)
+        ax.broken_barh(_faixas(inicios, fins), (0.1, 0.9), transform=faixa_x,
+                       facecolor='lightblue', alpha=0.4, zorder=0)
+
+    if janelas is not None and len(janelas):
+        inicios, fins, codigos = trechos_movimento(janelas['meio'].to_numpy(),
+                                                   janelas['movimento'].to_numpy())
+        faixas = _faixas(inicios, fins)
+        for codigo, cor in enumerate(CORES_MOVIMENTO):
+            ax.broken_barh(faixas[codigos == codigo], (0, 0.08), transform=faixa_x,
+                           facecolor=cor, zorder=3)
+
+    ax.set_xlim(mdates.date2num(piramide.inicio), mdates.date2num(piramide.fim))
+    ax.set_title(f"Pessoa {pessoa_id}", fontsize=8)
+    localizador = mdates.AutoDateLocator(minticks=2, maxticks=6)
+    ax.xaxis.set_major_locator(localizador)
+    ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(localizador))
+    ax.tick_params(labelsize=6)
+    ax.xaxis.get_offset_text().set_fontsize(6)
+
+
+def gerar_mosaico(pessoas, colunas=COLUNAS, arquivo=ARQUIVO_MOSAICO):
+    """Constrói as pirâmides que faltam e grava o mosaico da coorte."""
+    prontas = []
+    with ProcessPoolExecutor(max_workers=N_WORKERS) as executor:
+        futuros = {executor.submit(_construir, pid): pid for pid in pessoas}
+        for futuro, pessoa_id in futuros.items():
+            try:
+                prontas.append(futuro.result())
+            except Exception as e:
+                print(f"[AVISO] Pessoa {pessoa_id} sem pirâmide: {e}")
+
+    try:
+        janelas = ler_resultados(colunas=['meio', 'movimento'])
+        janelas = {pid: grupo for pid, grupo in janelas.groupby('pessoa_id')}
+    except FileNotFoundError:
+        print("[AVISO] Nenhuma execução do clustering no armazém; mosaico sem códigos de movimento")
+        janelas = {}
+
+    # Sono manual de todas as pessoas num índice só, ancorado no início/fim de cada pirâmide
+    piramides = {pid: piramide_pessoa(pid) for pid in prontas}
+    indice = IndiceSono.de_arquivos(prontas, DIR_MANUAL,
+                                    extensao=lambda pid: (piramides[pid].inicio, piramides[pid].fim))
+
+    linhas = int(np.ceil(len(prontas) / colunas))
+    fig, eixos = plt.subplots(linhas, colunas, figsize=(4 * colunas, 1.8 * linhas), squeeze=False)
+    for ax, pessoa_id in zip(eixos.flat, prontas):
+        desenhar_painel(ax, pessoa_id, piramides[pessoa_id], janelas.get(pessoa_id), indice)
+    for ax in eixos.flat[len(prontas):]:
+        ax.set_visible(False)
+
+    fig.suptitle("Coorte: acelerometro (x/y/z), sono manual (azul) e codigos de movimento (faixa inferior)",
+                 fontsize=10)
+    fig.tight_layout()
+    Path(arquivo).parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(arquivo, dpi=100)
+    plt.close(fig)
+    return arquivo
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mosaico da coorte (uma figura, um painel por pessoa)')
+    parser.add_argument('pessoas', type=int, nargs='*', help='IDs das pessoas (padrão: 11 a 38)')
+    parser.add_argument('--colunas', type=int, default=COLUNAS)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    arquivo = gerar_mosaico(args.pessoas or list(range(11, 39)), args.colunas)
+    print(f"[OK] Mosaico salvo em: {arquivo} ({time.perf_counter() - inicio:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,19 @@ Script para separação interativa de períodos DORMINDO vs ACORDADO
 Permite visualizar os dados e marcar manualmente os períodos de sono
 """
 
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from pathlib import Path
 from datetime import datetime, timedelta
 import importlib.util
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from comum.dados import ler_par
+from comum.indice_sono import IndiceSono
+from comum.periodos_sono import escrever_periodos_sono
 
 # Configurações
 DATA_DIR = Path("DATA/SemDownsampling_data")
@@ -19,22 +26,17 @@ def carregar_dados_pessoa(pessoa_id):
     accel_file = DATA_DIR / "acelerometro" / f"acelerometro_{pessoa_id}.csv"
     gyro_file = DATA_DIR / "giroscopio" / f"giroscopio_{pessoa_id}.csv"
     
-    df_accel = pd.read_csv(accel_file)
+    return ler_par(accel_file, gyro_file, leitor=_ler_sensor)
+
+def _ler_sensor(arquivo):
+    df = pd.read_csv(arquivo)
     # Normalizar timestamp -> remover timezone e garantir ordenação
-    df_accel['timestamp'] = pd.to_datetime(df_accel['timestamp'])
-    df_accel['timestamp'] = df_accel['timestamp'].apply(
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    df['timestamp'] = df['timestamp'].apply(
         lambda x: x.replace(tzinfo=None) if getattr(x, 'tzinfo', None) is not None else x
     )
-    df_accel.sort_values('timestamp', inplace=True)
-    
-    df_gyro = pd.read_csv(gyro_file)
-    df_gyro['timestamp'] = pd.to_datetime(df_gyro['timestamp'])
-    df_gyro['timestamp'] = df_gyro['timestamp'].apply(
-        lambda x: x.replace(tzinfo=None) if getattr(x, 'tzinfo', None) is not None else x
-    )
-    df_gyro.sort_values('timestamp', inplace=True)
-    
-    return df_accel, df_gyro
+    df.sort_values('timestamp', inplace=True)
+    return df
 
 def plotar_dados_para_analise(df_accel, df_gyro, pessoa_id):
     """Plota dados para análise visual - X, Y, Z separados por cor"""
@@ -173,40 +175,35 @@ def obter_periodos_sono(df_accel):
 
 def separar_dados(df_accel, df_gyro, periodos_sono):
     """Separa dados em DORMINDO e ACORDADO"""
-    # Inicializar coluna de estado
-    df_accel['estado'] = 'ACORDADO'
-    df_gyro['estado'] = 'ACORDADO'
-    
     # Marcar períodos de sono. Se o dataset cobre múltiplos dias, repetir os períodos
     # definidos (apenas horas) para cada dia presente nos dados.
     data_min = df_accel['timestamp'].dt.floor('D').min()
     data_max = df_accel['timestamp'].dt.floor('D').max()
     n_days = (data_max - data_min).days
 
-    for i, (inicio, fim) in enumerate(periodos_sono, start=1):
-        # Se o período especificado tem data (apenas foi criado com a data inicial),
-        # iremos replicá-lo por cada dia do dataset para marcar todas as noites.
-        total_acc = 0
-        total_gyro = 0
-        for offset in range(n_days + 1):
-            inicio_shift = inicio + timedelta(days=offset)
-            fim_shift = fim + timedelta(days=offset)
+    # (período, dia): todos os intervalos de uma vez; o índice funde e consulta por searchsorted
+    dias = np.arange(n_days + 1) * np.timedelta64(1, 'D')
+    inicios = np.array([pd.Timestamp(inicio) for inicio, _ in periodos_sono], dtype='datetime64[ns]')[:, None] + dias
+    fins = np.array([pd.Timestamp(fim) for _, fim in periodos_sono], dtype='datetime64[ns]')[:, None] + dias
+    indice = IndiceSono(np.zeros(inicios.size), inicios.ravel(), fins.ravel())   # uma só "pessoa" (0)
 
-            mask_accel = (df_accel['timestamp'] >= inicio_shift) & (df_accel['timestamp'] <= fim_shift)
-            n_acc = int(mask_accel.sum())
-            df_accel.loc[mask_accel, 'estado'] = 'DORMINDO'
+    # Coluna de estado categórica: 1 byte por amostra em vez de uma string
+    df_accel['estado'] = indice.rotular(df_accel['timestamp'], 0)
+    df_gyro['estado'] = indice.rotular(df_gyro['timestamp'], 0)
 
-            mask_gyro = (df_gyro['timestamp'] >= inicio_shift) & (df_gyro['timestamp'] <= fim_shift)
-            n_gyro = int(mask_gyro.sum())
-            df_gyro.loc[mask_gyro, 'estado'] = 'DORMINDO'
+    # Amostras por (período, dia) via searchsorted (timestamps ordenados na leitura)
+    def contar(df):
+        ts = df['timestamp'].to_numpy()
+        return np.searchsorted(ts, fins, side='right') - np.searchsorted(ts, inicios, side='left')
 
+    contagem_acc, contagem_gyro = contar(df_accel), contar(df_gyro)
+    for i in range(len(periodos_sono)):
+        for offset in range(n_days + 1):
+            n_acc, n_gyro = contagem_acc[i, offset], contagem_gyro[i, offset]
             if n_acc or n_gyro:
-                print(f"  [DEBUG] Período {i} (dia +{offset}): {inicio_shift.strftime('%Y-%m-%d %H:%M')} até {fim_shift.strftime('%Y-%m-%d %H:%M')} -> acelerômetro: {n_acc} amostras, giroscópio: {n_gyro} amostras")
-
-            total_acc += n_acc
-            total_gyro += n_gyro
-
-        print(f"  [DEBUG] Período {i} resumo: total_acelerometro={total_acc}, total_giroscopio={total_gyro}")
+                inicio_shift, fim_shift = pd.Timestamp(inicios[i, offset]), pd.Timestamp(fins[i, offset])
+                print(f"  [DEBUG] Período {i + 1} (dia +{offset}): {inicio_shift.strftime('%Y-%m-%d %H:%M')} até {fim_shift.strftime('%Y-%m-%d %H:%M')} -> acelerômetro: {n_acc} amostras, giroscópio: {n_gyro} amostras")
+        print(f"  [DEBUG] Período {i + 1} resumo: total_acelerometro={contagem_acc[i].sum()}, total_giroscopio={contagem_gyro[i].sum()}")
     
     # Criar DataFrames separados
     accel_dormindo = df_accel[df_accel['estado'] == 'DORMINDO'].copy()
@@ -246,11 +243,7 @@ def salvar_dados_separados(pessoa_id, accel_dormindo, accel_acordado, gyro_dormi
     gyro_dormindo.to_csv(dormindo_dir / f"giroscopio{pessoa_id}_dormindo.csv", index=False)
     
     # Salvar períodos de sono (arquivo com ID)
-    with open(periodos_dir / f"periodos_sono{pessoa_id}.txt", 'w', encoding='utf-8') as f:
-        f.write(f"Períodos de sono - Pessoa {pessoa_id}\n")
-        f.write("="*50 + "\n")
-        for i, (inicio, fim) in enumerate(periodos_sono, 1):
-            f.write(f"Período {i}: {inicio.strftime('%H:%M')} até {fim.strftime('%H:%M')}\n")
+    escrever_periodos_sono(periodos_dir / f"periodos_sono{pessoa_id}.txt", pessoa_id, periodos_sono)
     
     print("\n" + "="*80)
     print("ARQUIVOS SALVOS:")
@@ -291,8 +284,12 @@ def gerar_visualizacao_final(df_accel, df_gyro, periodos_sono, pessoa_id):
     except Exception as e:
         print(f"Erro ao gerar visualização final: {e}")
 
-def processar_pessoa(pessoa_id):
-    """Processa uma pessoa completa"""
+def processar_pessoa(pessoa_id, automatico=False, zoom=False):
+    """Processa uma pessoa completa
+
+    Com automatico=True os períodos de sono vêm de `deteccao_sono.py` em vez da digitação.
+    Com zoom=True são marcados arrastando o mouse na janela de `marcacao_zoom.py`.
+    """
     print("\n" + "="*80)
     print(f"PESSOA {pessoa_id}")
     print("="*80)
@@ -303,13 +300,24 @@ def processar_pessoa(pessoa_id):
     print(f"  [OK] Acelerômetro: {len(df_accel)} amostras")
     print(f"  [OK] Giroscópio: {len(df_gyro)} amostras")
     
-    # 2. Plotar para análise
-    print("\n[2/4] Gerando gráfico para análise visual...")
-    plotar_dados_para_analise(df_accel, df_gyro, pessoa_id)
+    # 2. Plotar para análise (no modo zoom a própria janela de marcação faz esse papel)
+    if not zoom:
+        print("\n[2/4] Gerando gráfico para análise visual...")
+        plotar_dados_para_analise(df_accel, df_gyro, pessoa_id)
     
     # 3. Obter períodos de sono
     print("\n[3/4] Marcação de períodos de sono...")
-    periodos_sono = obter_periodos_sono(df_accel)
+    if automatico:
+        from deteccao_sono import detectar_periodos_sono
+        periodos_sono, _ = detectar_periodos_sono(df_accel.reset_index(drop=True))
+        for inicio, fim in periodos_sono:
+            print(f"  [AUTO] Período detectado: {inicio.strftime('%H:%M')} até {fim.strftime('%H:%M')}")
+    elif zoom:
+        from marcacao_zoom import marcar_periodos_interativo
+        print("  Arraste sobre o gráfico para marcar cada período e feche a janela ao terminar.")
+        periodos_sono = marcar_periodos_interativo(pessoa_id, df_accel.reset_index(drop=True))
+    else:
+        periodos_sono = obter_periodos_sono(df_accel)
     
     if not periodos_sono:
         print("\n[AVISO] Nenhum período de sono foi marcado. Abortando...")
@@ -337,6 +345,12 @@ def main():
     print("="*80)
     print("\nEste script permite separar manualmente os períodos de sono.")
     print("Você verá um gráfico e depois poderá marcar os horários de sono.")
+    automatico = '--auto' in sys.argv
+    if automatico:
+        print("Modo --auto: os períodos serão detectados automaticamente (deteccao_sono.py).")
+    zoom = '--zoom' in sys.argv
+    if zoom:
+        print("Modo --zoom: os períodos serão marcados com o mouse (marcacao_zoom.py).")
     
     while True:
         print("\n" + "-"*80)
@@ -352,7 +366,7 @@ def main():
                 print("[ERRO] ID deve estar entre 11 e 38")
                 continue
             
-            processar_pessoa(pessoa_id)
+            processar_pessoa(pessoa_id, automatico, zoom)
             
         except ValueError:
             print("[ERRO] ID inválido. Digite um número entre 11 e 38")
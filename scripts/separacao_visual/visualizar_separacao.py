@@ -6,14 +6,17 @@ em cinza por trás e linhas pontilhadas vermelhas marcando início/fim.
 """
 
 from pathlib import Path
-from datetime import datetime, timedelta
 import sys
-import re
 
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from comum.dados import ler_par
+from comum.indice_sono import IndiceSono, arquivo_periodos
+from comum.periodos_sono import ler_periodos_sono
+
 DATA_DIR = Path("DATA/SemDownsampling_data")
 OUTPUT_BASE = Path("outputs/separacao_visual")
 
@@ -23,72 +26,18 @@ def carregar_dados_pessoa(pessoa_id: int):
     accel_path = DATA_DIR / "acelerometro" / f"acelerometro_{pessoa_id}.csv"
     gyro_path = DATA_DIR / "giroscopio" / f"giroscopio_{pessoa_id}.csv"
     
-    df_accel = pd.read_csv(accel_path)
-    df_gyro = pd.read_csv(gyro_path)
-    
-    df_accel['timestamp'] = pd.to_datetime(df_accel['timestamp'])
-    df_gyro['timestamp'] = pd.to_datetime(df_gyro['timestamp'])
-    
-    return df_accel, df_gyro
+    return ler_par(accel_path, gyro_path, leitor=_ler_sensor)
+
+
+def _ler_sensor(arquivo):
+    df = pd.read_csv(arquivo)
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    return df
 
 
 def carregar_periodos_sono(pessoa_id: int):
     """Carrega períodos de sono do arquivo periodos_sono.txt."""
-    pessoa_dir = OUTPUT_BASE / f"pessoa_{pessoa_id}"
-    file = pessoa_dir / "periodos_sono" / f"periodos_sono{pessoa_id}.txt"
-    if not file.exists():
-        return []
-    
-    periodos = []
-    with file.open('r', encoding='utf-8') as f:
-        for linha in f:
-            texto = linha.strip()
-            if not texto or texto.startswith('=') or 'Períodos' in texto:
-                continue
-            # Extrair pares HH:MM usando regex
-            times = re.findall(r"(\d{1,2}:\d{2})", texto)
-            if len(times) >= 2:
-                periodos.append((times[0], times[1]))
-    return periodos
-
-
-def converter_periodos_para_timestamps(periodos, data_referencia_inicio):
-    """
-    Converte strings HH:MM para timestamps pandas, ajustando o dia
-    caso o horário seja do dia seguinte em relação ao início da gravação.
-    """
-    periodos_dt = []
-    
-    # Extrai apenas a data do primeiro registro (ex: 2023-10-25)
-    base_date = data_referencia_inicio.date()
-
-    for inicio_str, fim_str in periodos:
-        try:
-            hi, mi = map(int, inicio_str.split(':'))
-            hf, mf = map(int, fim_str.split(':'))
-        except Exception:
-            continue
-        
-        # Cria o timestamp inicial assumindo ser no mesmo dia
-        inicio_dt = datetime.combine(base_date, datetime.min.time()).replace(hour=hi, minute=mi)
-        
-        # LÓGICA DE CORREÇÃO:
-        # Se o horário criado (ex: 03:00) for ANTERIOR ao início dos dados (ex: 19:00),
-        # significa que esse 03:00 pertence ao dia seguinte.
-        if inicio_dt < data_referencia_inicio:
-            inicio_dt += timedelta(days=1)
-            
-        # Cria o timestamp final baseado no mesmo dia do inicio corrigido
-        fim_dt = datetime.combine(inicio_dt.date(), datetime.min.time()).replace(hour=hf, minute=mf)
-        
-        # Se o fim for menor ou igual ao início (ex: dormiu 23:00 e acordou 07:00),
-        # soma um dia no final
-        if fim_dt <= inicio_dt:
-            fim_dt += timedelta(days=1)
-        
-        periodos_dt.append((pd.Timestamp(inicio_dt), pd.Timestamp(fim_dt)))
-        
-    return periodos_dt
+    return ler_periodos_sono(arquivo_periodos(pessoa_id, OUTPUT_BASE))
 
 
 def plotar_visualizacao(df_accel, periodos, pessoa_id):
@@ -96,13 +45,12 @@ def plotar_visualizacao(df_accel, periodos, pessoa_id):
     Cria gráfico com dados do acelerômetro (X/Y/Z), períodos de sono
     sombreados em cinza e linhas pontilhadas vermelhas nos limites.
     """
-    # PEGA O TIMESTAMP COMPLETO DO INÍCIO (Data + Hora)
-    data_inicio_completa = df_accel['timestamp'].iloc[0].to_pydatetime()
-    
-    # Passa o timestamp completo para a função de conversão corrigida
-    periodos_dt = converter_periodos_para_timestamps(periodos, data_inicio_completa)
-    
-    # --- DAQUI PARA BAIXO O CÓDIGO PERMANECE IGUAL, PODE COPIAR TUDO ---
+    # Períodos HH:MM em tempo absoluto (mesma regra da separação e da avaliação:
+    # repetidos em cada dia da gravação), só os que aparecem no intervalo dos dados
+    inicio_dados, fim_dados = df_accel['timestamp'].min(), df_accel['timestamp'].max()
+    indice = IndiceSono.de_periodos({pessoa_id: (periodos, inicio_dados, fim_dados)})
+    periodos_dt = [(pd.Timestamp(inicio), pd.Timestamp(fim))
+                   for inicio, fim in zip(*indice.intervalos(pessoa_id, inicio_dados, fim_dados))]
     
     # Criar figura
     fig, ax = plt.subplots(figsize=(14, 6))